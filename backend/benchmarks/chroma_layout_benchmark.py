@@ -0,0 +1,207 @@
+"""
+Per-user vs sharded Chroma layouts (CHROMA_LAYOUT): memory, open files,
+disk and query latency for the same corpus.
+
+Each layout is built in a throwaway directory by one process, then served
+by a fresh process that queries a sample of users twice: the first pass
+loads each collection's index (cold), the second hits loaded indexes
+(warm). Queries go through EmbeddingService.collection_name / tenant_where,
+the same way the retrievers do. Collection lookup is timed separately,
+once as the get_or_create call the app used to make on every request and
+once through chroma_bus's handle cache.
+
+Usage:
+    python -m backend.benchmarks.chroma_layout_benchmark
+    python -m backend.benchmarks.chroma_layout_benchmark --users 2000 --chunks-per-user 40 --shards 16
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    # Peak, not current, where /proc is unavailable (kB on Linux, bytes on macOS).
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def open_files() -> Optional[int]:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def disk_mb(path: str) -> float:
+    total = sum(file.stat().st_size for file in Path(path).rglob("*") if file.is_file())
+    return round(total / (1024 * 1024), 1)
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+    }
+
+
+def user_vectors(user: int, args: argparse.Namespace) -> np.ndarray:
+    rng = np.random.default_rng(args.seed + user)
+    vectors = rng.standard_normal((args.chunks_per_user, args.dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build_layout(layout: str, path: str, args: argparse.Namespace) -> Dict[str, Any]:
+    import chromadb
+
+    from backend.config import settings
+    from backend.services.ingestion.embedding_service import EmbeddingService
+
+    settings.CHROMA_SHARD_COUNT = args.shards
+    client = chromadb.PersistentClient(path=path)
+    collections: Dict[str, Any] = {}
+
+    started = time.perf_counter()
+    for user in range(args.users):
+        user_id = f"user_{user}"
+        name = EmbeddingService.collection_name(user_id, layout)
+        if name not in collections:
+            collections[name] = client.get_or_create_collection(name=name, metadata={"hnsw:space": "cosine"})
+
+        collections[name].add(
+            ids=[f"doc_{user}_chunk_{idx}" for idx in range(args.chunks_per_user)],
+            embeddings=user_vectors(user, args).tolist(),
+            metadatas=[
+                {"user_id": user_id, "document_id": f"doc_{user}", "chunk_index": idx}
+                for idx in range(args.chunks_per_user)
+            ],
+        )
+
+    return {
+        "collections": len(collections),
+        "build_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def serve_layout(layout: str, path: str, args: argparse.Namespace) -> Dict[str, Any]:
+    baseline_rss = rss_mb()
+    baseline_files = open_files()
+
+    import chromadb
+
+    from backend.clients.chroma_client import chroma_bus
+    from backend.config import settings
+    from backend.services.ingestion.embedding_service import EmbeddingService
+
+    settings.CHROMA_SHARD_COUNT = args.shards
+    client = chromadb.PersistentClient(path=path)
+    chroma_bus.client = client
+    imported_rss = rss_mb()
+
+    rng = np.random.default_rng(args.seed)
+    sample = rng.choice(args.users, size=min(args.queries, args.users), replace=False)
+
+    lookup_uncached: List[float] = []
+    lookup_cached: List[float] = []
+    passes: Dict[str, List[float]] = {"cold": [], "warm": []}
+    leaked = 0
+
+    for pass_name in ("cold", "warm"):
+        for user in sample:
+            user_id = f"user_{int(user)}"
+            name = EmbeddingService.collection_name(user_id, layout)
+
+            started = time.perf_counter()
+            client.get_or_create_collection(name=name, metadata={"hnsw:space": "cosine"})
+            lookup_uncached.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            collection = chroma_bus.get_collection(name, metadata={"hnsw:space": "cosine"})
+            if pass_name == "warm":
+                lookup_cached.append((time.perf_counter() - started) * 1000)
+
+            query = user_vectors(int(user), args)[0] + rng.normal(0, 0.05, args.dim).astype(np.float32)
+
+            started = time.perf_counter()
+            response = collection.query(
+                query_embeddings=[query.tolist()],
+                n_results=args.top_k,
+                where=EmbeddingService.tenant_where(user_id, layout=layout),
+                include=["metadatas", "distances"],
+            )
+            passes[pass_name].append((time.perf_counter() - started) * 1000)
+
+            metadatas = (response.get("metadatas") or [[]])[0]
+            leaked += sum(1 for metadata in metadatas if metadata.get("user_id") != user_id)
+
+    return {
+        "rss_mb": {
+            "before_import": baseline_rss,
+            "after_open": imported_rss,
+            "after_queries": rss_mb(),
+        },
+        "open_files": {
+            "before_import": baseline_files,
+            "after_queries": open_files(),
+        },
+        "query_cold": percentiles(passes["cold"]),
+        "query_warm": percentiles(passes["warm"]),
+        "lookup_get_or_create": percentiles(lookup_uncached),
+        "lookup_cached_handle": percentiles(lookup_cached),
+        "cross_tenant_results": leaked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-user vs sharded Chroma layouts.")
+    parser.add_argument("--layouts", nargs="+", default=["per_user", "sharded"], choices=["per_user", "sharded"])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--chunks-per-user", type=int, default=40)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200, help="Users sampled for querying")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    report: List[Dict[str, Any]] = []
+    # Fresh processes per phase: RSS and open files then reflect one layout
+    # only, and serving starts from indexes on disk like a restarted app.
+    context = multiprocessing.get_context("spawn")
+
+    for layout in args.layouts:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                built = pool.submit(build_layout, layout, tmp_dir, args).result()
+
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                served = pool.submit(serve_layout, layout, tmp_dir, args).result()
+
+            report.append({
+                "layout": layout,
+                "users": args.users,
+                "vectors": args.users * args.chunks_per_user,
+                **built,
+                "disk_mb": disk_mb(tmp_dir),
+                **served,
+            })
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
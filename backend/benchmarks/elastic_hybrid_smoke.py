@@ -0,0 +1,194 @@
+"""
+Smoke test for the elastic_hybrid retrieval engine against a real cluster.
+
+Creates a throwaway index with a dense_vector `embedding` field, indexes the
+rerank fixture chunks, then runs every fixture query through
+ElasticHybridRetriever (one kNN + BM25 request fused by Elasticsearch) and
+prints the top hits with per-query latency.
+
+Start a local single-node cluster first (8.14+ for the rrf retriever):
+    docker run --rm -p 9200:9200 -e discovery.type=single-node \\
+        -e xpack.security.enabled=false -e xpack.license.self_generated.type=trial \\
+        docker.elastic.co/elasticsearch/elasticsearch:8.15.0
+
+Usage:
+    python -m backend.benchmarks.elastic_hybrid_smoke --fake-embeddings
+    python -m backend.benchmarks.elastic_hybrid_smoke --index hybrid_smoke --keep
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import List, Dict, Any
+
+import numpy as np
+
+from backend.clients.elastic_search_client import elastic_bus
+from backend.services.elastic_routing import ElasticRouting
+from backend.services.hybrid_retriever import ElasticHybridRetriever
+
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "rerank_fixtures.json"
+SMOKE_USER_ID = "hybrid_smoke_user"
+
+
+def fake_embed(dims: int):
+    """
+    Deterministic bag-of-hashed-tokens vectors, so the smoke test runs
+    without downloading the embedding model.
+    """
+    def embed(texts: List[str]) -> List[List[float]]:
+        vectors = np.zeros((len(texts), dims), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                digest = hashlib.md5(token.strip(".,?!").encode("utf-8")).digest()
+                vectors[row, int.from_bytes(digest[:4], "little") % dims] += 1.0
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).tolist()
+
+    return embed
+
+
+def build_mapping(dims: int) -> Dict[str, Any]:
+    return {
+        "mappings": {
+            "properties": {
+                "id": {"type": "keyword"},
+                "user_id": {"type": "keyword"},
+                "document_id": {"type": "keyword"},
+                "source": {"type": "keyword"},
+                "page": {"type": "integer"},
+                "chunk_index": {"type": "integer"},
+                "start_index": {"type": "integer"},
+                "content": {"type": "text"},
+                "summary": {"type": "text"},
+                "keywords": {"type": "text"},
+                "search_terms": {"type": "text"},
+                "embedding": {
+                    "type": "dense_vector",
+                    "dims": dims,
+                    "index": True,
+                    "similarity": "cosine",
+                },
+            }
+        }
+    }
+
+
+def load_chunks() -> List[Dict[str, Any]]:
+    fixtures = json.loads(FIXTURES_PATH.read_text(encoding="utf-8"))
+    chunks: Dict[str, Dict[str, Any]] = {}
+
+    for case in fixtures:
+        for candidate in case["candidates"]:
+            chunks.setdefault(candidate["chunk_id"], candidate)
+
+    return list(chunks.values())
+
+
+async def index_chunks(client, index_name: str, chunks: List[Dict[str, Any]], embed_fn) -> None:
+    vectors = embed_fn([chunk["content"] for chunk in chunks])
+    operations: List[Dict[str, Any]] = []
+
+    for idx, (chunk, vector) in enumerate(zip(chunks, vectors)):
+        operations.append({"index": {**ElasticRouting.bulk_meta(SMOKE_USER_ID, index_name), "_id": chunk["chunk_id"]}})
+        operations.append({
+            "id": chunk["chunk_id"],
+            "user_id": SMOKE_USER_ID,
+            "document_id": chunk["source"].rsplit(".", 1)[0],
+            "source": chunk["source"].lower(),
+            "page": chunk.get("page"),
+            "chunk_index": idx,
+            "content": chunk["content"],
+            "summary": chunk.get("summary", ""),
+            "keywords": [],
+            "search_terms": [],
+            "embedding": vector,
+        })
+
+    response = await client.bulk(operations=operations, refresh="wait_for")
+    if response.get("errors"):
+        raise RuntimeError("Bulk indexing of smoke chunks reported errors.")
+
+
+async def run(args) -> None:
+    fixtures = json.loads(FIXTURES_PATH.read_text(encoding="utf-8"))
+    embed_fn = fake_embed(args.dims) if args.fake_embeddings else None
+
+    await elastic_bus.connect()
+    client = elastic_bus.get_client()
+
+    retriever = ElasticHybridRetriever(embed_fn=embed_fn)
+    retriever.index_name = args.index
+
+    try:
+        if await client.indices.exists(index=args.index):
+            await client.indices.delete(index=args.index)
+
+        await client.indices.create(index=args.index, body=build_mapping(args.dims))
+        await index_chunks(client, args.index, load_chunks(), retriever.embed_fn)
+
+        report: List[Dict[str, Any]] = []
+
+        for case in fixtures:
+            started = time.perf_counter()
+            hits = await retriever.search(
+                query=case["query"],
+                user_id=SMOKE_USER_ID,
+                top_k=args.top_k,
+            )
+            latency_ms = (time.perf_counter() - started) * 1000
+
+            report.append({
+                "query": case["query"],
+                "latency_ms": round(latency_ms, 2),
+                "hits": [
+                    {"chunk_id": hit["chunk_id"], "fused_score": hit["fused_score"]}
+                    for hit in hits
+                ],
+            })
+
+        batched_started = time.perf_counter()
+        batched = await retriever.search_many(
+            queries=[{"query": case["query"]} for case in fixtures],
+            user_id=SMOKE_USER_ID,
+            top_k=args.top_k,
+        )
+
+        print(json.dumps({
+            "index": args.index,
+            "queries": report,
+            "search_many": {
+                "latency_ms": round((time.perf_counter() - batched_started) * 1000, 2),
+                "matches_single_search": [
+                    [hit["chunk_id"] for hit in hits] == [hit["chunk_id"] for hit in row["hits"]]
+                    for hits, row in zip(batched, report)
+                ],
+            },
+        }, indent=2))
+
+    finally:
+        if not args.keep:
+            await client.indices.delete(index=args.index, ignore_unavailable=True)
+        await elastic_bus.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Smoke test native hybrid search in Elasticsearch.")
+    parser.add_argument("--index", default="coeus_hybrid_smoke")
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--fake-embeddings", action="store_true", help="Use hashed token vectors instead of the model")
+    parser.add_argument("--keep", action="store_true", help="Keep the smoke index afterwards")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
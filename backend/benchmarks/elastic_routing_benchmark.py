@@ -0,0 +1,186 @@
+"""
+Keyword search latency with and without user_id routing as the number of
+tenants in one index grows.
+
+For each tenant count, indexes the same synthetic chunks twice into
+throwaway multi-shard indexes: once without routing (every search fans
+out to all shards and filters on user_id) and once with routing=user_id
+(ELASTIC_ROUTING_ENABLED). Then it times KeywordRetriever's query for a
+sample of tenants against both and reports client latency, the server
+`took` and how many shards each search touched.
+
+Start a local single-node cluster first:
+    docker run --rm -p 9200:9200 -e discovery.type=single-node \\
+        -e xpack.security.enabled=false docker.elastic.co/elasticsearch/elasticsearch:8.15.0
+
+Usage:
+    python -m backend.benchmarks.elastic_routing_benchmark
+    python -m backend.benchmarks.elastic_routing_benchmark --tenants 10 100 1000 5000 --shards 8
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Dict, Any
+
+import numpy as np
+
+from backend.benchmarks.elastic_hybrid_smoke import build_mapping
+from backend.clients.elastic_search_client import elastic_bus
+from backend.config import settings
+from backend.services.keyword_retriever import KeywordRetriever
+
+
+VOCABULARY = [
+    "invoice", "contract", "renewal", "liability", "warranty", "payment", "shipment", "audit",
+    "policy", "premium", "claim", "deductible", "tenant", "lease", "deposit", "inspection",
+    "revenue", "forecast", "budget", "variance", "ledger", "accrual", "depreciation", "asset",
+    "patient", "dosage", "diagnosis", "referral", "protocol", "consent", "trial", "adverse",
+    "module", "release", "deployment", "latency", "incident", "rollback", "cluster", "replica",
+]
+
+
+def make_chunk(rng: np.random.Generator, tenant: int, idx: int) -> Dict[str, Any]:
+    words = [str(word) for word in rng.choice(VOCABULARY, size=60)]
+    return {
+        "id": f"t{tenant}_doc_chunk_{idx}",
+        "user_id": f"tenant_{tenant}",
+        "document_id": f"t{tenant}_doc",
+        "source": f"t{tenant}_doc.pdf",
+        "page": idx // 4 + 1,
+        "chunk_index": idx,
+        "content": " ".join(words),
+        "summary": " ".join(words[:10]),
+        "keywords": list(words[:5]),
+        "search_terms": list(words[5:8]),
+    }
+
+
+async def build_index(client, index_name: str, tenants: int, args, routed: bool) -> None:
+    mapping = build_mapping(settings.ELASTIC_EMBEDDING_DIMS)
+    mapping["mappings"]["properties"].pop("embedding")
+    mapping["settings"] = {"number_of_shards": args.shards, "number_of_replicas": 0}
+
+    if await client.indices.exists(index=index_name):
+        await client.indices.delete(index=index_name)
+    await client.indices.create(index=index_name, body=mapping)
+
+    # Same seed for both variants: identical corpora.
+    rng = np.random.default_rng(args.seed)
+    operations: List[Dict[str, Any]] = []
+
+    for tenant in range(tenants):
+        for idx in range(args.chunks_per_tenant):
+            chunk = make_chunk(rng, tenant, idx)
+            meta: Dict[str, Any] = {"_index": index_name, "_id": chunk["id"]}
+            if routed:
+                meta["routing"] = chunk["user_id"]
+
+            operations.append({"index": meta})
+            operations.append(chunk)
+
+            if len(operations) >= 2 * args.bulk_size:
+                await client.bulk(operations=operations)
+                operations = []
+
+    if operations:
+        await client.bulk(operations=operations)
+    await client.indices.refresh(index=index_name)
+
+
+async def time_searches(
+    client,
+    index_name: str,
+    sample: List[int],
+    queries: List[str],
+    args,
+    routed: bool,
+) -> Dict[str, Any]:
+    settings.ELASTIC_ROUTING_ENABLED = routed
+    retriever = KeywordRetriever()
+    retriever.index_name = index_name
+
+    latencies: List[float] = []
+    took: List[float] = []
+    shards: List[int] = []
+
+    for tenant, query in zip(sample, queries):
+        user_id = f"tenant_{tenant}"
+        body = retriever._build_search_body(query=query, user_id=user_id, top_k=args.top_k)
+
+        started = time.perf_counter()
+        response = await client.search(body=body, **retriever._target(user_id))
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        took.append(response.get("took", 0))
+        shards.append(response.get("_shards", {}).get("total", 0))
+
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "took_mean_ms": round(float(np.mean(took)), 3),
+        "shards_per_search": round(float(np.mean(shards)), 2),
+    }
+
+
+async def run(args) -> None:
+    settings.ELASTIC_SEARCH_URL = args.elastic_url
+    settings.ELASTIC_SEARCH_API_KEY = ""
+    settings.ELASTIC_TENANT_GROUPS = 0
+
+    await elastic_bus.connect()
+    client = elastic_bus.get_client()
+    report: List[Dict[str, Any]] = []
+    created: List[str] = []
+
+    try:
+        for tenants in args.tenants:
+            rng = np.random.default_rng(args.seed + tenants)
+            sample = rng.integers(0, tenants, size=args.queries).tolist()
+            queries = [" ".join(str(word) for word in rng.choice(VOCABULARY, size=3)) for _ in range(args.queries)]
+
+            row: Dict[str, Any] = {
+                "tenants": tenants,
+                "documents": tenants * args.chunks_per_tenant,
+                "shards": args.shards,
+            }
+
+            for variant, routed in (("unrouted", False), ("routed", True)):
+                index_name = f"{args.index_prefix}_{tenants}_{variant}"
+                created.append(index_name)
+
+                await build_index(client, index_name, tenants, args, routed)
+                # Warm caches so both variants are timed in the same state.
+                await time_searches(client, index_name, sample[:5], queries[:5], args, routed)
+                row[variant] = await time_searches(client, index_name, sample, queries, args, routed)
+
+            report.append(row)
+
+    finally:
+        if not args.keep:
+            for index_name in created:
+                await client.indices.delete(index=index_name, ignore_unavailable=True)
+        await elastic_bus.close()
+
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark routed vs unrouted keyword search by tenant count.")
+    parser.add_argument("--elastic-url", default="http://localhost:9200")
+    parser.add_argument("--index-prefix", default="coeus_routing_bench")
+    parser.add_argument("--tenants", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--chunks-per-tenant", type=int, default=50)
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--bulk-size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark indexes afterwards")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
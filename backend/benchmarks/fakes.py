@@ -0,0 +1,580 @@
+"""
+In-process fakes for the external providers, used by the load test.
+
+Each fake mimics the narrow slice of the client API the services call
+(supabase-py query builders and storage, instructor's
+chat.completions.create, Gemini's ainvoke/astream, Cohere's rerank and the
+Elasticsearch calls the retrievers, hydration and bulk helpers make) and
+sleeps for a configurable latency before answering. A FaultProfile can also
+fail or stall a fraction of calls, so deadline and degradation paths get
+exercised under load.
+
+install_fakes() swaps the fakes into the bus singletons before the app's
+lifespan runs; the buses skip connecting when a client is already set.
+"""
+import asyncio
+import json
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+from chromadb.api.types import EmbeddingFunction, Documents, Embeddings
+from elastic_transport import SerializerCollection
+
+from backend.benchmarks.elastic_hybrid_smoke import fake_embed
+
+
+class FakeProviderError(RuntimeError):
+    """Injected provider failure."""
+
+
+@dataclass
+class FaultProfile:
+    """
+    Latency and failure injection for one fake provider.
+
+    latency_ms / jitter_ms: gaussian call latency, clipped at zero.
+    error_rate: fraction of calls raising FakeProviderError after the sleep.
+    stall_rate: fraction of calls sleeping stall_ms instead (hung upstream).
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_ms: float = 60000.0
+
+    async def apply(self, provider: str) -> None:
+        if self.stall_rate and random.random() < self.stall_rate:
+            await asyncio.sleep(self.stall_ms / 1000)
+
+        delay_ms = max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) if self.jitter_ms else self.latency_ms
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if self.error_rate and random.random() < self.error_rate:
+            raise FakeProviderError(f"Injected {provider} failure")
+
+
+def tokenize(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+
+# -----------------------------
+# Supabase
+# -----------------------------
+
+class FakeResponse:
+    def __init__(self, data: Any) -> None:
+        self.data = data
+
+
+class FakeQuery:
+    """
+    Chainable stand-in for supabase-py's query builder, over plain dict rows.
+    """
+
+    def __init__(self, db: "FakeSupabase", table: str) -> None:
+        self.db = db
+        self.table = table
+        self.filters: List[tuple] = []
+        self.columns: Optional[List[str]] = None
+        self.order_by: Optional[tuple] = None
+        self.row_limit: Optional[int] = None
+        self.action = "select"
+        self.payload: Any = None
+
+    def select(self, columns: str = "*", **_: Any) -> "FakeQuery":
+        if columns.strip() != "*":
+            self.columns = [column.strip() for column in columns.split(",")]
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        self.filters.append((column, value))
+        return self
+
+    def in_(self, column: str, values: List[Any]) -> "FakeQuery":
+        self.filters.append((column, set(values)))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "FakeQuery":
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, count: int) -> "FakeQuery":
+        self.row_limit = count
+        return self
+
+    def insert(self, rows: Any, **_: Any) -> "FakeQuery":
+        self.action, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows: Any, **_: Any) -> "FakeQuery":
+        self.action, self.payload = "upsert", rows
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "FakeQuery":
+        self.action, self.payload = "update", values
+        return self
+
+    def delete(self) -> "FakeQuery":
+        self.action = "delete"
+        return self
+
+    def _matches(self, row: Dict[str, Any]) -> bool:
+        for column, value in self.filters:
+            if isinstance(value, set):
+                if row.get(column) not in value:
+                    return False
+            elif row.get(column) != value:
+                return False
+        return True
+
+    async def execute(self) -> FakeResponse:
+        await self.db.profile.apply("supabase")
+        rows = self.db.tables.setdefault(self.table, [])
+
+        if self.action in ("insert", "upsert"):
+            payload = self.payload if isinstance(self.payload, list) else [self.payload]
+            for item in payload:
+                existing = next((row for row in rows if "id" in item and row.get("id") == item["id"]), None)
+                if existing is not None and self.action == "upsert":
+                    existing.update(item)
+                else:
+                    rows.append(dict(item))
+            return FakeResponse([dict(item) for item in payload])
+
+        matched = [row for row in rows if self._matches(row)]
+
+        if self.action == "update":
+            for row in matched:
+                row.update(self.payload)
+            return FakeResponse([dict(row) for row in matched])
+
+        if self.action == "delete":
+            self.db.tables[self.table] = [row for row in rows if not self._matches(row)]
+            return FakeResponse([dict(row) for row in matched])
+
+        if self.order_by:
+            column, desc = self.order_by
+            matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+
+        if self.row_limit is not None:
+            matched = matched[:self.row_limit]
+
+        if self.columns:
+            matched = [{column: row.get(column) for column in self.columns} for row in matched]
+
+        return FakeResponse([dict(row) for row in matched])
+
+
+class FakeBucket:
+    def __init__(self, db: "FakeSupabase", bucket: str) -> None:
+        self.db = db
+        self.bucket = bucket
+
+    async def upload(self, path: str, file: bytes, file_options: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        await self.db.profile.apply("supabase")
+        self.db.objects[(self.bucket, path)] = bytes(file)
+        return {"path": path}
+
+    async def download(self, path: str) -> bytes:
+        await self.db.profile.apply("supabase")
+        try:
+            return self.db.objects[(self.bucket, path)]
+        except KeyError:
+            raise FakeProviderError(f"Object not found: {self.bucket}/{path}")
+
+
+class FakeStorage:
+    def __init__(self, db: "FakeSupabase") -> None:
+        self.db = db
+
+    def from_(self, bucket: str) -> FakeBucket:
+        return FakeBucket(self.db, bucket)
+
+
+class FakeSupabase:
+    def __init__(self, profile: FaultProfile) -> None:
+        self.profile = profile
+        self.tables: Dict[str, List[Dict[str, Any]]] = {"users": []}
+        self.objects: Dict[tuple, bytes] = {}
+        self.storage = FakeStorage(self)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+
+# -----------------------------
+# Groq (instructor) and Gemini
+# -----------------------------
+
+class FakeCompletions:
+    def __init__(self, profile: FaultProfile) -> None:
+        self.profile = profile
+
+    async def create(self, model: str, response_model, messages: List[Dict[str, str]], **_: Any):
+        await self.profile.apply("groq")
+        user_msg = messages[-1]["content"] if messages else ""
+
+        if response_model.__name__ == "QueryExpansionResult":
+            terms = [term for term in tokenize(user_msg) if len(term) > 3]
+            return response_model(
+                keywords=terms[:5],
+                search_terms=[" ".join(terms[:4])] if terms else [],
+                intent_summary=user_msg[:120],
+            )
+
+        if response_model.__name__ == "BatchMetadata":
+            # LabelingService pads short batches with empty metadata.
+            return response_model(metadata_list=[])
+
+        return response_model.model_construct()
+
+
+class FakeInstructorClient:
+    def __init__(self, profile: FaultProfile) -> None:
+        self.chat = type("FakeChat", (), {})()
+        self.chat.completions = FakeCompletions(profile)
+
+
+class FakeMessage:
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+
+class FakeGemini:
+    """
+    Answers with the first sentence of each context chunk; streams it word
+    by word with the call latency spread across the tokens.
+    """
+
+    def __init__(self, profile: FaultProfile, stream_chunks: int = 20) -> None:
+        self.profile = profile
+        self.stream_chunks = stream_chunks
+
+    @staticmethod
+    def _answer(messages: List[Any]) -> str:
+        prompt = " ".join(str(getattr(message, "content", message)) for message in messages)
+        sentences = re.findall(r"[A-Z][^.?!]{20,200}[.?!]", prompt)
+        return " ".join(sentences[-3:]) or "I could not find this in the provided documents."
+
+    async def ainvoke(self, messages: List[Any], **_: Any) -> FakeMessage:
+        await self.profile.apply("gemini")
+        return FakeMessage(self._answer(messages))
+
+    async def astream(self, messages: List[Any], **_: Any):
+        words = self._answer(messages).split(" ")
+        step = max(1, len(words) // self.stream_chunks)
+        per_chunk = FaultProfile(
+            latency_ms=self.profile.latency_ms / self.stream_chunks,
+            jitter_ms=self.profile.jitter_ms / self.stream_chunks,
+        )
+
+        # Failures and stalls hit before the first token, latency is spread.
+        await FaultProfile(
+            error_rate=self.profile.error_rate,
+            stall_rate=self.profile.stall_rate,
+            stall_ms=self.profile.stall_ms,
+        ).apply("gemini")
+
+        for start in range(0, len(words), step):
+            await per_chunk.apply("gemini")
+            yield FakeMessage(" ".join(words[start:start + step]) + " ")
+
+
+# -----------------------------
+# Cohere
+# -----------------------------
+
+class FakeRerankItem:
+    def __init__(self, index: int, relevance_score: float) -> None:
+        self.index = index
+        self.relevance_score = relevance_score
+
+
+class FakeCohere:
+    def __init__(self, profile: FaultProfile) -> None:
+        self.profile = profile
+
+    async def rerank(self, model: str, query: str, documents: List[Any], top_n: Optional[int] = None, **_: Any):
+        await self.profile.apply("cohere")
+        query_terms = set(tokenize(query))
+
+        scored = []
+        for idx, document in enumerate(documents):
+            text = document if isinstance(document, str) else json.dumps(document)
+            doc_terms = set(tokenize(text))
+            scored.append(FakeRerankItem(idx, len(query_terms & doc_terms) / (len(query_terms) or 1)))
+
+        scored.sort(key=lambda item: item.relevance_score, reverse=True)
+        response = type("FakeRerankResponse", (), {})()
+        response.results = scored[:top_n] if top_n else scored
+        return response
+
+
+# -----------------------------
+# Elasticsearch
+# -----------------------------
+
+class FakeApiResponse(dict):
+    """dict with the .body accessor the elasticsearch helpers read."""
+
+    @property
+    def body(self) -> Dict[str, Any]:
+        return self
+
+
+class FakeIndices:
+    def __init__(self, es: "FakeElasticsearch") -> None:
+        self.es = es
+
+    async def exists(self, index: str, **_: Any) -> bool:
+        return index in self.es.indexes
+
+    async def create(self, index: str, **_: Any) -> FakeApiResponse:
+        self.es.indexes.setdefault(index, {})
+        return FakeApiResponse({"acknowledged": True, "index": index})
+
+    async def put_mapping(self, index: str, **_: Any) -> FakeApiResponse:
+        self.es.indexes.setdefault(index, {})
+        return FakeApiResponse({"acknowledged": True})
+
+    async def delete(self, index: str, **_: Any) -> FakeApiResponse:
+        self.es.indexes.pop(index, None)
+        return FakeApiResponse({"acknowledged": True})
+
+    async def refresh(self, index: Optional[str] = None, **_: Any) -> FakeApiResponse:
+        return FakeApiResponse({})
+
+
+class FakeElasticsearch:
+    """
+    In-memory index supporting the filter + multi_match bodies built by
+    KeywordRetriever. Scoring is boosted term overlap per field (best
+    field wins), close enough to BM25 ordering for load purposes.
+    """
+
+    FIELDS = {"content": 4.0, "summary": 3.0, "keywords": 2.0, "search_terms": 2.0}
+
+    def __init__(self, profile: FaultProfile) -> None:
+        self.profile = profile
+        self.indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.indices = FakeIndices(self)
+
+        # helpers.async_bulk serializes actions with the transport's serializer.
+        self.transport = type("FakeTransport", (), {})()
+        self.transport.serializers = SerializerCollection()
+
+    def options(self, **_: Any) -> "FakeElasticsearch":
+        return self
+
+    async def ping(self, **_: Any) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
+    @staticmethod
+    def _field_text(source: Dict[str, Any], field: str) -> str:
+        value = source.get(field) or ""
+        return " ".join(value) if isinstance(value, list) else str(value)
+
+    @staticmethod
+    def _filters(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return body.get("query", {}).get("bool", {}).get("filter", [])
+
+    @staticmethod
+    def _query_text(body: Dict[str, Any]) -> str:
+        parts = []
+        for clause in body.get("query", {}).get("bool", {}).get("should", []):
+            match = clause.get("multi_match") or clause.get("match") or {}
+            if isinstance(match.get("query"), str):
+                parts.append(match["query"])
+        return " ".join(parts)
+
+    def _passes(self, source: Dict[str, Any], filters: List[Dict[str, Any]]) -> bool:
+        for clause in filters:
+            for kind, condition in clause.items():
+                if kind == "term":
+                    for field, value in condition.items():
+                        value = value.get("value") if isinstance(value, dict) else value
+                        if source.get(field) != value:
+                            return False
+                elif kind == "terms":
+                    for field, values in condition.items():
+                        if source.get(field) not in values:
+                            return False
+        return True
+
+    def _search_one(self, index: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        if "retriever" in body or "knn" in body:
+            raise FakeProviderError("The fake cluster does not support kNN; use RETRIEVAL_ENGINE=python_fusion.")
+
+        query_terms = Counter(tokenize(self._query_text(body)))
+        filters = self._filters(body)
+        hits = []
+
+        for doc_id, source in self.indexes.get(index, {}).items():
+            if not self._passes(source, filters):
+                continue
+
+            score = 0.0
+            for field, boost in self.FIELDS.items():
+                field_terms = set(tokenize(self._field_text(source, field)))
+                score = max(score, boost * sum(count for term, count in query_terms.items() if term in field_terms))
+
+            if score > 0:
+                hits.append({"_id": doc_id, "_index": index, "_score": score, "_source": source})
+
+        hits.sort(key=lambda hit: hit["_score"], reverse=True)
+        hits = hits[:body.get("size", 10)]
+
+        excludes = (body.get("_source") or {}).get("excludes", []) if isinstance(body.get("_source"), dict) else []
+        for hit in hits:
+            hit["_source"] = {key: value for key, value in hit["_source"].items() if key not in excludes}
+
+        return {"hits": {"total": {"value": len(hits)}, "hits": hits}}
+
+    async def search(self, index: str, body: Optional[Dict[str, Any]] = None, **kwargs: Any) -> FakeApiResponse:
+        await self.profile.apply("elastic")
+        return FakeApiResponse(self._search_one(index, body or kwargs))
+
+    async def msearch(self, searches: List[Dict[str, Any]], index: Optional[str] = None, **_: Any) -> FakeApiResponse:
+        await self.profile.apply("elastic")
+        responses = []
+
+        for header, body in zip(searches[0::2], searches[1::2]):
+            try:
+                responses.append(self._search_one(header.get("index", index), body))
+            except FakeProviderError as exc:
+                responses.append({"error": {"reason": str(exc)}, "status": 400})
+
+        return FakeApiResponse({"responses": responses})
+
+    async def mget(self, index: str, ids: List[str], source_excludes: Optional[List[str]] = None, **_: Any) -> FakeApiResponse:
+        await self.profile.apply("elastic")
+        docs = self.indexes.get(index, {})
+        excludes = set(source_excludes or [])
+
+        return FakeApiResponse({"docs": [
+            {
+                "_id": doc_id,
+                "found": doc_id in docs,
+                "_source": {key: value for key, value in docs.get(doc_id, {}).items() if key not in excludes},
+            }
+            for doc_id in ids
+        ]})
+
+    async def bulk(self, operations: List[Any], index: Optional[str] = None, **_: Any) -> FakeApiResponse:
+        await self.profile.apply("elastic")
+        lines = [json.loads(line) if isinstance(line, (bytes, str)) else line for line in operations]
+        items = []
+
+        idx = 0
+        while idx < len(lines):
+            action, meta = next(iter(lines[idx].items()))
+            target = meta.get("_index", index)
+
+            if action == "delete":
+                self.indexes.get(target, {}).pop(meta["_id"], None)
+                items.append({"delete": {"_id": meta["_id"], "status": 200}})
+                idx += 1
+                continue
+
+            source = lines[idx + 1]
+            if action == "update":
+                source = {**self.indexes.get(target, {}).get(meta["_id"], {}), **source.get("doc", {})}
+
+            self.indexes.setdefault(target, {})[meta["_id"]] = source
+            items.append({action: {"_id": meta["_id"], "_index": target, "status": 201}})
+            idx += 2
+
+        return FakeApiResponse({"errors": False, "items": items})
+
+
+# -----------------------------
+# Embeddings
+# -----------------------------
+
+class HashEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Chroma-compatible wrapper around the hashed bag-of-tokens vectors, so
+    the load test does not load the sentence-transformer.
+    """
+
+    def __init__(self, dims: int = 768) -> None:
+        self.dims = dims
+        self._embed = fake_embed(dims)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return self._embed(list(input))
+
+    @staticmethod
+    def name() -> str:
+        return "coeus_hash_embedding"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"dims": self.dims}
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "HashEmbeddingFunction":
+        return HashEmbeddingFunction(config.get("dims", 768))
+
+
+# -----------------------------
+# Wiring
+# -----------------------------
+
+@dataclass
+class FakeBackends:
+    supabase: FakeSupabase
+    elastic: Optional[FakeElasticsearch]
+    groq: FakeInstructorClient
+    gemini: FakeGemini
+    cohere: FakeCohere
+
+
+def install_fakes(
+    profiles: Dict[str, FaultProfile],
+    chroma_client,
+    fake_elastic: bool = True,
+    embedding_function: Optional[EmbeddingFunction] = None,
+) -> FakeBackends:
+    """
+    Point the bus singletons and provider clients at in-process fakes.
+    Must run before the app lifespan (connect() is a no-op once a client
+    is set). Chroma stays real: pass a local client.
+    """
+    from backend.clients.supabase_client import supabase_bus
+    from backend.clients.elastic_search_client import elastic_bus
+    from backend.clients.chroma_client import chroma_bus
+    from backend.clients.gemini_client import gemini_bus
+    from backend.clients.groq_client import groq_clients
+    from backend.clients.cohere_client import co_bus
+    from backend.services.query_expansion_service import QueryExpansionService
+    from backend.services.ingestion.embedding_service import EmbeddingService
+
+    backends = FakeBackends(
+        supabase=FakeSupabase(profiles.get("supabase", FaultProfile())),
+        elastic=FakeElasticsearch(profiles.get("elastic", FaultProfile())) if fake_elastic else None,
+        groq=FakeInstructorClient(profiles.get("groq", FaultProfile())),
+        gemini=FakeGemini(profiles.get("gemini", FaultProfile())),
+        cohere=FakeCohere(profiles.get("cohere", FaultProfile())),
+    )
+
+    supabase_bus.client = backends.supabase
+    if backends.elastic is not None:
+        elastic_bus.client = backends.elastic
+    chroma_bus.client = chroma_client
+
+    groq_clients.instructor_async_client = backends.groq
+    QueryExpansionService._get_instructor_client = staticmethod(lambda: backends.groq)
+    gemini_bus.model = backends.gemini
+    co_bus.async_client = backends.cohere
+
+    if embedding_function is not None:
+        EmbeddingService.get_embedding_function = staticmethod(lambda: embedding_function)
+
+    return backends
@@ -0,0 +1,118 @@
+"""
+Micro-benchmark for FusionService.fuse.
+
+Generates N ranked lists of synthetic candidates drawn from a shared pool
+(so lists overlap the way semantic and keyword results do) and times every
+fusion method. A dict-per-item two-list RRF, equivalent to the previous
+implementation, is timed alongside as a baseline.
+
+Usage:
+    python -m backend.benchmarks.fusion_benchmark
+    python -m backend.benchmarks.fusion_benchmark --sizes 100 1000 5000 --lists 3 --repeats 50
+"""
+import argparse
+import json
+import time
+from typing import List, Dict, Any, Callable
+
+import numpy as np
+
+from backend.services.fusion_service import FusionService, FUSION_METHODS
+
+
+def make_lists(n_lists: int, size: int, rng: np.random.Generator) -> Dict[str, List[Dict[str, Any]]]:
+    pool = size * 2
+    ranked_lists: Dict[str, List[Dict[str, Any]]] = {}
+
+    for list_idx in range(n_lists):
+        ids = rng.choice(pool, size=size, replace=False)
+        scores = np.sort(rng.random(size))[::-1]
+        ranked_lists[f"list_{list_idx}"] = [
+            {
+                "chunk_id": f"chunk_{chunk}",
+                "document_id": "doc_0",
+                "page": int(chunk % 50),
+                "chunk_index": int(chunk),
+                "summary": "synthetic",
+                "score": float(score),
+            }
+            for chunk, score in zip(ids, scores)
+        ]
+
+    return ranked_lists
+
+
+def dict_rrf_baseline(lists: List[List[Dict[str, Any]]], rrf_k: int, top_k: int) -> List[Dict[str, Any]]:
+    fused_scores: Dict[str, float] = {}
+    fused_items: Dict[str, Dict[str, Any]] = {}
+
+    for results in lists:
+        for rank, item in enumerate(results, start=1):
+            chunk_id = item["chunk_id"]
+            fused_scores[chunk_id] = fused_scores.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank)
+            merged = dict(fused_items.get(chunk_id, {}))
+            merged.update({k: v for k, v in item.items() if k not in merged})
+            fused_items[chunk_id] = merged
+
+    fused = []
+    for chunk_id, item in fused_items.items():
+        result = dict(item)
+        result["fused_score"] = fused_scores[chunk_id]
+        fused.append(result)
+
+    fused.sort(key=lambda x: x["fused_score"], reverse=True)
+    return fused[:top_k]
+
+
+def time_call(fn: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    fn()
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark N-way fusion.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--lists", type=int, default=2)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    report = []
+
+    for size in args.sizes:
+        ranked_lists = make_lists(args.lists, size, rng)
+        row: Dict[str, Any] = {"candidates_per_list": size, "lists": args.lists}
+
+        row["dict_rrf_baseline"] = time_call(
+            lambda: dict_rrf_baseline(list(ranked_lists.values()), 60, args.top_k),
+            args.repeats,
+        )
+
+        for method in FUSION_METHODS:
+            row[method] = time_call(
+                lambda method=method: FusionService.fuse(
+                    ranked_lists,
+                    method=method,
+                    top_k=args.top_k,
+                ),
+                args.repeats,
+            )
+
+        report.append(row)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Import-time profile of the API process.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters,
+parses the per-module timings and reports the slowest packages (cumulative
+and self time), the wall-clock import time and whether any of the heavy
+SDKs that should load lazily were imported eagerly.
+
+Usage:
+    python -m backend.benchmarks.import_profile
+    python -m backend.benchmarks.import_profile --module backend.main --runs 5 --top 15
+    python -m backend.benchmarks.import_profile --output import_profile.json
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any
+
+
+# Should only load on first use or during the lifespan warm-up.
+LAZY_MODULES = (
+    "torch",
+    "sentence_transformers",
+    "chromadb",
+    "langchain_google_genai",
+    "langchain_groq",
+    "instructor",
+    "groq",
+    "cohere",
+    "pdfplumber",
+)
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile_once(module: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"Importing {module} failed:\n{tail}")
+
+    modules: List[Dict[str, Any]] = []
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+
+    return {"wall_ms": wall_ms, "modules": modules}
+
+
+def summarize(runs: List[Dict[str, Any]], module: str, top: int) -> Dict[str, Any]:
+    # Use the median run (by wall time) for the per-module breakdown.
+    runs = sorted(runs, key=lambda run: run["wall_ms"])
+    median_run = runs[len(runs) // 2]
+    modules = median_run["modules"]
+
+    packages: Dict[str, float] = {}
+    for item in modules:
+        package = item["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + item["self_ms"]
+
+    target = next((item for item in modules if item["module"] == module), None)
+    imported = {item["module"].split(".")[0] for item in modules}
+
+    return {
+        "module": module,
+        "runs": len(runs),
+        "wall_ms_median": round(statistics.median(run["wall_ms"] for run in runs), 1),
+        "import_ms": round(target["cumulative_ms"], 1) if target else None,
+        "eager_heavy_imports": [name for name in LAZY_MODULES if name in imported],
+        "top_packages_ms": [
+            {"package": name, "self_ms": round(ms, 1)}
+            for name, ms in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        ],
+        "top_cumulative": [
+            {"module": item["module"], "cumulative_ms": round(item["cumulative_ms"], 1)}
+            for item in sorted(modules, key=lambda item: item["cumulative_ms"], reverse=True)[:top]
+        ],
+        "top_self": [
+            {"module": item["module"], "self_ms": round(item["self_ms"], 1)}
+            for item in sorted(modules, key=lambda item: item["self_ms"], reverse=True)[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile import time of the API entry point.")
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to run (median is reported)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    runs = [profile_once(args.module) for _ in range(args.runs)]
+    report = summarize(runs, args.module, args.top)
+
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
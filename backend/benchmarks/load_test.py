@@ -0,0 +1,453 @@
+"""
+End-to-end load test: the real FastAPI app and LangGraph pipelines, with
+in-process fakes for Supabase, Groq, Gemini, Cohere (and Elasticsearch,
+unless --elastic-url is given) and a real local Chroma directory.
+
+The app runs under uvicorn in a background thread with its own event loop.
+A monitor task on that loop samples how late asyncio.sleep wakes up (event
+loop lag), so blocking work on the loop shows up directly. Traffic is
+open-loop: requests fire on a fixed or Poisson schedule whether or not
+earlier ones finished, so queueing shows up as latency instead of being
+hidden by a closed-loop client slowing down.
+
+There is no ingest scenario: ingestion in this tree is incomplete
+(EmbeddingService.embed_and_store never builds its ids / metadatas,
+ElasticService.ensure_index has no mapping and _build_elastic_doc and
+PDFService.extract_raw_text do not exist), so every /ingest request
+returned 500 and only measured the error path. Add it to SCENARIOS once
+the ingestion graph runs end to end.
+
+Usage:
+    python -m backend.benchmarks.load_test --rps 20 --duration 30
+    python -m backend.benchmarks.load_test --poisson \\
+        --fault gemini=1500:400 --fault cohere=200:50:0.05 --output load.json
+    python -m backend.benchmarks.load_test --fault groq=300:100:0:0.02 --timeout-seconds 5
+
+--fault takes provider=latency_ms[:jitter_ms[:error_rate[:stall_rate]]] for
+supabase, elastic, groq, gemini and cohere.
+"""
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import chromadb
+import httpx
+import numpy as np
+import uvicorn
+
+from backend.benchmarks.elastic_hybrid_smoke import build_mapping
+from backend.benchmarks.fakes import FaultProfile, HashEmbeddingFunction, install_fakes
+from backend.benchmarks.retrieval_eval import build_chunks, EVAL_USER_ID
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+CORPUS_PATH = FIXTURES_DIR / "eval_corpus.json"
+QUESTIONS_PATH = FIXTURES_DIR / "eval_questions.json"
+
+SCENARIOS = ("chat",)
+
+DEFAULT_FAULTS = {
+    "supabase": FaultProfile(latency_ms=15, jitter_ms=5),
+    "elastic": FaultProfile(latency_ms=10, jitter_ms=3),
+    "groq": FaultProfile(latency_ms=350, jitter_ms=100),
+    "gemini": FaultProfile(latency_ms=1200, jitter_ms=300),
+    "cohere": FaultProfile(latency_ms=180, jitter_ms=40),
+}
+
+
+def parse_fault(spec: str) -> tuple:
+    provider, _, values = spec.partition("=")
+    if provider not in DEFAULT_FAULTS:
+        raise argparse.ArgumentTypeError(f"Unknown provider '{provider}'")
+
+    numbers = [float(value) for value in values.split(":") if value != ""]
+    fields = ["latency_ms", "jitter_ms", "error_rate", "stall_rate"]
+    return provider, FaultProfile(**dict(zip(fields, numbers)))
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario '{name}'")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# -----------------------------
+# Seeding
+# -----------------------------
+
+async def seed_chat_corpus(chunks: List[Dict[str, Any]], user_id: str) -> None:
+    """
+    Index the eval corpus for the load-test user in Chroma and Elasticsearch,
+    the same shape ingestion would leave behind.
+    """
+    from backend.clients.elastic_search_client import elastic_bus
+    from backend.config import settings
+    from backend.services.elastic_routing import ElasticRouting
+    from backend.services.ingestion.embedding_service import EmbeddingService
+
+    collection = EmbeddingService.get_collection(user_id)
+    collection.upsert(
+        ids=[chunk["id"] for chunk in chunks],
+        documents=[chunk["content"] for chunk in chunks],
+        metadatas=[
+            {
+                "user_id": user_id,
+                "document_id": chunk["document_id"],
+                "source": chunk["source"],
+                "page": chunk["page"],
+                "chunk_index": chunk["chunk_index"],
+                "start_index": chunk["start_index"],
+                "summary": chunk["summary"],
+                "keywords": ",".join(chunk["keywords"]),
+                "search_terms": ",".join(chunk["search_terms"]),
+            }
+            for chunk in chunks
+        ],
+    )
+
+    client = elastic_bus.get_client()
+    bulk_meta = ElasticRouting.bulk_meta(user_id)
+    index_name = bulk_meta["_index"]
+    if not await client.indices.exists(index=index_name):
+        await client.indices.create(
+            index=index_name,
+            body=ElasticRouting.apply_to_mapping(build_mapping(settings.ELASTIC_EMBEDDING_DIMS)),
+        )
+
+    operations: List[Dict[str, Any]] = []
+    for chunk in chunks:
+        operations.append({"index": {**bulk_meta, "_id": chunk["id"]}})
+        operations.append({
+            "id": chunk["id"],
+            "user_id": user_id,
+            "document_id": chunk["document_id"],
+            "source": chunk["source"].lower(),
+            "page": chunk["page"],
+            "chunk_index": chunk["chunk_index"],
+            "start_index": chunk["start_index"],
+            "content": chunk["content"],
+            "summary": chunk["summary"],
+            "keywords": chunk["keywords"],
+            "search_terms": chunk["search_terms"],
+        })
+
+    response = await client.bulk(operations=operations, refresh="wait_for")
+    if response.get("errors"):
+        raise RuntimeError("Seeding the load-test index reported errors.")
+
+
+# -----------------------------
+# Server thread + event loop lag
+# -----------------------------
+
+class ServerThread:
+    """
+    uvicorn in a daemon thread; the loop-lag monitor runs on the server's
+    own loop so the client's work does not pollute the samples.
+    """
+
+    def __init__(self, app, port: int, lag_interval: float) -> None:
+        self.server = uvicorn.Server(uvicorn.Config(
+            app,
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+            lifespan="on",
+        ))
+        self.lag_interval = lag_interval
+        self.lag_samples: List[float] = []
+        self.recording = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _monitor_lag(self) -> None:
+        while not self.server.should_exit:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            if self.recording:
+                self.lag_samples.append(time.perf_counter() - started - self.lag_interval)
+
+    async def _serve(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        monitor = asyncio.create_task(self._monitor_lag())
+        try:
+            await self.server.serve()
+        finally:
+            monitor.cancel()
+
+    def _run(self) -> None:
+        asyncio.run(self._serve())
+
+    def start(self, timeout: float = 60.0) -> None:
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("Server exited during startup, see the log above.")
+            if time.monotonic() > deadline:
+                raise RuntimeError("Server did not start in time.")
+            time.sleep(0.05)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=30)
+
+
+# -----------------------------
+# Open-loop traffic
+# -----------------------------
+
+def arrival_offsets(rps: float, duration: float, poisson: bool, rng: random.Random) -> List[float]:
+    offsets, t = [], 0.0
+    while True:
+        t += rng.expovariate(rps) if poisson else 1.0 / rps
+        if t >= duration:
+            return offsets
+        offsets.append(t)
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None, "mean": None}
+
+    arr = np.asarray(values, dtype=np.float64)
+    return {
+        "p50": round(float(np.percentile(arr, 50)), 2),
+        "p95": round(float(np.percentile(arr, 95)), 2),
+        "p99": round(float(np.percentile(arr, 99)), 2),
+        "max": round(float(arr.max()), 2),
+        "mean": round(float(arr.mean()), 2),
+    }
+
+
+class LoadDriver:
+    def __init__(self, args, base_url: str, questions: List[str]) -> None:
+        self.args = args
+        self.base_url = base_url
+        self.questions = questions
+        self.rng = random.Random(args.seed)
+        self.results: List[Dict[str, Any]] = []
+        self.send_delays: List[float] = []
+
+    def _next_request(self, scenario: str) -> tuple:
+        payload = {
+            "user_id": EVAL_USER_ID,
+            "query": self.rng.choice(self.questions),
+            "verbosity": "answer",
+        }
+        if self.args.timeout_seconds:
+            payload["timeout_seconds"] = self.args.timeout_seconds
+        return "/api/v1/chat/ask", payload
+
+    async def _fire(self, client: httpx.AsyncClient, scenario: str, path: str, payload: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        record: Dict[str, Any] = {"scenario": scenario}
+
+        try:
+            response = await client.post(path, json=payload)
+            record["status"] = response.status_code
+            if scenario == "chat" and response.status_code == 200:
+                record["degraded"] = response.json().get("degraded") or []
+        except httpx.HTTPError as exc:
+            record["status"] = type(exc).__name__
+
+        record["latency_ms"] = (time.perf_counter() - started) * 1000
+        self.results.append(record)
+
+    async def run(self) -> float:
+        mix = self.args.mix
+        names, weights = list(mix), list(mix.values())
+        offsets = arrival_offsets(self.args.rps, self.args.duration, self.args.poisson, self.rng)
+
+        limits = httpx.Limits(max_connections=self.args.max_connections, max_keepalive_connections=self.args.max_connections)
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=limits,
+            timeout=self.args.client_timeout,
+        ) as client:
+            tasks = []
+            started = time.perf_counter()
+
+            for offset in offsets:
+                delay = started + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # How late the driver itself fired; large values mean the
+                # client, not the server, is the bottleneck.
+                self.send_delays.append(max(0.0, -delay) * 1000)
+
+                scenario = self.rng.choices(names, weights)[0]
+
+                path, payload = self._next_request(scenario)
+                tasks.append(asyncio.create_task(self._fire(client, scenario, path, payload)))
+
+            await asyncio.gather(*tasks)
+            return time.perf_counter() - started
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        scenarios: Dict[str, Any] = {}
+
+        for name in sorted({record["scenario"] for record in self.results}):
+            records = [record for record in self.results if record["scenario"] == name]
+            ok = [record for record in records if record["status"] == 200]
+
+            statuses: Dict[str, int] = {}
+            for record in records:
+                statuses[str(record["status"])] = statuses.get(str(record["status"]), 0) + 1
+
+            degraded: Dict[str, int] = {}
+            for record in ok:
+                for flag in record.get("degraded", []):
+                    degraded[flag] = degraded.get(flag, 0) + 1
+
+            scenarios[name] = {
+                "sent": len(records),
+                "ok": len(ok),
+                "error_rate": round(1 - len(ok) / len(records), 4) if records else 0.0,
+                "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+                "latency_ms": percentiles([record["latency_ms"] for record in ok]),
+                "statuses": statuses,
+                "degraded": degraded,
+            }
+
+        return {
+            "offered_rps": self.args.rps,
+            "duration_s": self.args.duration,
+            "elapsed_s": round(elapsed, 2),
+            "arrivals": "poisson" if self.args.poisson else "fixed",
+            "scenarios": scenarios,
+            "driver_send_delay_ms": percentiles(self.send_delays),
+        }
+
+
+# -----------------------------
+# Entry point
+# -----------------------------
+
+def run(args) -> Dict[str, Any]:
+    profiles = dict(DEFAULT_FAULTS)
+    profiles.update(dict(args.fault or []))
+
+    chroma_dir = args.chroma_path or tempfile.mkdtemp(prefix="coeus_load_chroma_")
+    embedding_function = None if args.real_embeddings else HashEmbeddingFunction(args.dims)
+
+    install_fakes(
+        profiles,
+        chroma_client=chromadb.PersistentClient(path=chroma_dir),
+        fake_elastic=not args.elastic_url,
+        embedding_function=embedding_function,
+    )
+
+    if args.elastic_url:
+        from elasticsearch import AsyncElasticsearch
+        from backend.clients.elastic_search_client import elastic_bus
+        elastic_bus.client = AsyncElasticsearch(args.elastic_url)
+
+    # Import after the fakes are in place so nothing captures real clients.
+    from backend.main import app
+    from backend.utils.bounded_executor import vector_executor
+
+    documents = json.loads(CORPUS_PATH.read_text(encoding="utf-8"))
+    for document in documents:
+        for page in document["pages"]:
+            page.setdefault("source", document["source"])
+
+    questions = [item["question"] for item in json.loads(QUESTIONS_PATH.read_text(encoding="utf-8"))]
+
+    server = ServerThread(app, args.port, args.lag_interval)
+    server.start()
+
+    try:
+        # Seed on the server loop: a real AsyncElasticsearch binds to it.
+        seed = asyncio.run_coroutine_threadsafe(
+            seed_chat_corpus(build_chunks(documents), EVAL_USER_ID),
+            server.loop,
+        )
+        seed.result(timeout=120)
+
+        driver = LoadDriver(args, f"http://127.0.0.1:{args.port}", questions)
+
+        # Short warm-up so model/collection caches do not skew the run.
+        asyncio.run(_warmup(driver, args.warmup))
+
+        server.recording = True
+        elapsed = asyncio.run(driver.run())
+        server.recording = False
+
+        report = driver.report(elapsed)
+        report["event_loop_lag_ms"] = percentiles([lag * 1000 for lag in server.lag_samples])
+        report["vector_executor"] = vector_executor.stats()
+        report["faults"] = {name: vars(profile) for name, profile in profiles.items()}
+        return report
+
+    finally:
+        server.stop()
+        if not args.chroma_path and not args.keep:
+            shutil.rmtree(chroma_dir, ignore_errors=True)
+
+
+async def _warmup(driver: LoadDriver, count: int) -> None:
+    async with httpx.AsyncClient(base_url=driver.base_url, timeout=driver.args.client_timeout) as client:
+        # The lifespan warm-up runs in the background; wait for /ready.
+        for _ in range(600):
+            if (await client.get("/ready")).status_code == 200:
+                break
+            await asyncio.sleep(0.1)
+        else:
+            raise RuntimeError("App did not become ready within 60s.")
+
+        for question in driver.questions[:count]:
+            await client.post("/api/v1/chat/ask", json={"user_id": EVAL_USER_ID, "query": question})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load test of /chat/ask against faked providers.")
+    parser.add_argument("--rps", type=float, default=10.0, help="Offered request rate")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of traffic")
+    parser.add_argument("--poisson", action="store_true", help="Poisson arrivals instead of a fixed interval")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("chat=1"), help=f"Scenario weights, e.g. chat=1 (one of: {', '.join(SCENARIOS)})")
+    parser.add_argument("--fault", type=parse_fault, action="append", help="provider=latency_ms[:jitter_ms[:error_rate[:stall_rate]]]")
+    parser.add_argument("--timeout-seconds", type=float, default=None, help="Per-request chat deadline sent to the API")
+    parser.add_argument("--client-timeout", type=float, default=120.0)
+    parser.add_argument("--max-connections", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=3, help="Sequential chat requests after /ready, before measuring")
+    parser.add_argument("--lag-interval", type=float, default=0.01, help="Loop lag sampling interval in seconds")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--dims", type=int, default=768, help="Hashed embedding size")
+    parser.add_argument("--real-embeddings", action="store_true", help="Use the configured sentence-transformer")
+    parser.add_argument("--elastic-url", default=None, help="Use a real cluster instead of the in-memory fake")
+    parser.add_argument("--chroma-path", default=None, help="Chroma directory (default: temporary)")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary Chroma directory")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    # A scenario that never succeeded measured nothing but its error path.
+    broken = [
+        name for name in args.mix
+        if not report["scenarios"].get(name, {}).get("ok")
+    ]
+    if broken:
+        raise SystemExit(f"No successful requests for scenario(s): {', '.join(broken)}; see statuses above.")
+
+
+if __name__ == "__main__":
+    main()
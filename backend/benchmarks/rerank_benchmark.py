@@ -0,0 +1,149 @@
+"""
+Compare rerank backends on the fixture set.
+
+Reports per-backend latency (p50/p95 over repeated runs) and how closely
+each local backend's ranking agrees with the reference backend (Cohere by
+default): top-k overlap, top-1 agreement and Kendall's tau over the full
+candidate ordering.
+
+Usage:
+    python -m backend.benchmarks.rerank_benchmark
+    python -m backend.benchmarks.rerank_benchmark --backends cross_encoder embedding --repeats 20
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import List, Dict, Any
+
+import numpy as np
+
+from backend.services.rerank_backends import get_rerank_backend
+from backend.services.reranker_service import RerankerService
+
+FIXTURES_PATH = Path(__file__).resolve().parent / "fixtures" / "rerank_fixtures.json"
+
+
+def load_fixtures(path: Path) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def kendall_tau(order_a: List[int], order_b: List[int]) -> float:
+    """
+    Kendall's tau between two full orderings of the same candidate indexes.
+    """
+    n = len(order_a)
+    if n < 2:
+        return 1.0
+
+    rank_a = np.empty(n, dtype=np.int64)
+    rank_b = np.empty(n, dtype=np.int64)
+    rank_a[order_a] = np.arange(n)
+    rank_b[order_b] = np.arange(n)
+
+    diff_a = np.sign(rank_a[:, None] - rank_a[None, :])
+    diff_b = np.sign(rank_b[:, None] - rank_b[None, :])
+
+    concordance = (diff_a * diff_b)[np.triu_indices(n, k=1)]
+    return float(concordance.sum() / concordance.size)
+
+
+async def rank_fixture(backend_name: str, fixture: Dict[str, Any]) -> Dict[str, Any]:
+    candidates = fixture["candidates"]
+    documents = RerankerService._build_rerank_documents(candidates, use_summary=True)
+    backend = get_rerank_backend(backend_name)
+
+    started = time.perf_counter()
+    scored = await backend.score(
+        query=fixture["query"],
+        documents=documents,
+        candidates=candidates,
+        top_n=len(documents),
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        "order": [idx for idx, _ in scored],
+        "latency_ms": elapsed_ms,
+    }
+
+
+async def benchmark_backend(
+    backend_name: str,
+    fixtures: List[Dict[str, Any]],
+    repeats: int,
+) -> Dict[str, Any]:
+    # One untimed pass so model loading is not counted as query latency.
+    orders = [(await rank_fixture(backend_name, fixture))["order"] for fixture in fixtures]
+
+    latencies: List[float] = []
+    for _ in range(repeats):
+        for fixture in fixtures:
+            latencies.append((await rank_fixture(backend_name, fixture))["latency_ms"])
+
+    return {
+        "orders": orders,
+        "latency_p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "latency_p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "calls": len(latencies),
+    }
+
+
+def agreement(
+    reference_orders: List[List[int]],
+    orders: List[List[int]],
+    k: int,
+) -> Dict[str, float]:
+    overlaps = []
+    top1 = []
+    taus = []
+
+    for ref, ours in zip(reference_orders, orders):
+        top_k = min(k, len(ref))
+        overlaps.append(len(set(ref[:top_k]) & set(ours[:top_k])) / top_k)
+        top1.append(1.0 if ref[0] == ours[0] else 0.0)
+        taus.append(kendall_tau(ref, ours))
+
+    return {
+        f"overlap_at_{k}": round(float(np.mean(overlaps)), 3),
+        "top1_agreement": round(float(np.mean(top1)), 3),
+        "kendall_tau": round(float(np.mean(taus)), 3),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark rerank backends against a reference.")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_PATH)
+    parser.add_argument("--reference", default="cohere")
+    parser.add_argument("--backends", nargs="+", default=["cross_encoder", "embedding"])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+
+    reference = await benchmark_backend(args.reference, fixtures, args.repeats)
+    report: Dict[str, Any] = {
+        args.reference: {
+            "latency_p50_ms": reference["latency_p50_ms"],
+            "latency_p95_ms": reference["latency_p95_ms"],
+            "calls": reference["calls"],
+        }
+    }
+
+    for backend_name in args.backends:
+        result = await benchmark_backend(backend_name, fixtures, args.repeats)
+        report[backend_name] = {
+            "latency_p50_ms": result["latency_p50_ms"],
+            "latency_p95_ms": result["latency_p95_ms"],
+            "calls": result["calls"],
+            **agreement(reference["orders"], result["orders"], args.k),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,566 @@
+"""
+Offline retrieval quality and latency benchmark.
+
+Chunks a fixture corpus with the production PDFService splitter, indexes it
+into a throwaway local Chroma collection and a keyword index, then runs a
+labelled question set through the retrieval stages:
+
+    expansion -> semantic / keyword -> fusion -> (optional) rerank
+
+For every stage it reports recall@k, MRR and nDCG@k against page-level
+relevance labels, plus p50/p95 latency. Labels name (source, page) pairs,
+so they stay valid when CHUNK_SIZE changes.
+
+No LLM is called unless asked for:
+- chunk labels (summary / keywords) are derived locally instead of by Groq
+- query expansion is off, read from a cache file, or run live and cached
+- the keyword side is an in-process BM25 stand-in using KeywordRetriever's
+  field boosts, or a real Elasticsearch cluster via --elastic-url
+
+Usage:
+    python -m backend.benchmarks.retrieval_eval --fake-embeddings
+    python -m backend.benchmarks.retrieval_eval --rrf-k 20 --chunk-size 512 --output rrf20.json
+    python -m backend.benchmarks.retrieval_eval --baseline rrf60.json --output rrf20.json
+    python -m backend.benchmarks.retrieval_eval --pdf-dir ./docs --questions my_questions.json
+    python -m backend.benchmarks.retrieval_eval --elastic-url http://localhost:9200
+    python -m backend.benchmarks.retrieval_eval --expansion live --expansion-cache expansions.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import re
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+import chromadb
+import numpy as np
+
+from backend.config import settings
+from backend.benchmarks.elastic_hybrid_smoke import fake_embed, build_mapping
+from backend.services.chat_session_service import STOPWORDS
+from backend.services.fusion_service import FusionService, FUSION_METHODS
+from backend.services.semantic_retriever import SemanticRetriever
+from backend.services.ingestion.pdf_chunking_service import PDFService
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+EVAL_USER_ID = "retrieval_eval_user"
+STAGES = ("semantic", "keyword", "fused", "reranked")
+
+# Same best_fields boosts as KeywordRetriever's main multi_match clause.
+FIELD_BOOSTS = {"content": 4.0, "summary": 3.0, "keywords": 2.0, "search_terms": 2.0}
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        term
+        for term in re.findall(r"[a-z0-9]+", (text or "").lower())
+        if term not in STOPWORDS
+    ]
+
+
+# -----------------------------
+# Corpus
+# -----------------------------
+
+def load_corpus(args) -> List[Dict[str, Any]]:
+    """
+    Documents as {"document_id", "source", "pages": [{"page", "text", "source"}]}.
+    """
+    if args.pdf_dir:
+        documents = []
+        for pdf_path in sorted(Path(args.pdf_dir).glob("*.pdf")):
+            pages = PDFService.extract_pages(filename=pdf_path.name, raw_bytes=pdf_path.read_bytes())
+            documents.append({
+                "document_id": pdf_path.stem,
+                "source": pdf_path.name,
+                "pages": pages,
+            })
+        return documents
+
+    documents = json.loads(Path(args.corpus).read_text(encoding="utf-8"))
+    for document in documents:
+        for page in document["pages"]:
+            page.setdefault("source", document["source"])
+    return documents
+
+
+def stub_labels(content: str) -> Dict[str, Any]:
+    """
+    Local stand-in for LabelingService: first sentence as summary and the
+    most frequent content terms as keywords.
+    """
+    first_sentence = re.split(r"(?<=[.!?])\s+", content.strip(), maxsplit=1)[0]
+    counts = Counter(term for term in tokenize(content) if len(term) > 2 and not term.isdigit())
+
+    return {
+        "summary": first_sentence[:200],
+        "keywords": [term for term, _ in counts.most_common(5)],
+        "search_terms": [],
+    }
+
+
+def build_chunks(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    chunks: List[Dict[str, Any]] = []
+
+    for document in documents:
+        records = PDFService.chunk_pages(
+            pages=document["pages"],
+            user_id=EVAL_USER_ID,
+            job_id="retrieval_eval",
+            document_id=document["document_id"],
+        )
+
+        for record in records:
+            metadata = record["source_metadata"]
+            chunks.append({
+                "id": record["id"],
+                "content": record["content"],
+                "document_id": document["document_id"],
+                "source": metadata["source"],
+                "page": metadata["page"],
+                "chunk_index": metadata["chunk_index"],
+                "start_index": metadata.get("start_index"),
+                **stub_labels(record["content"]),
+            })
+
+    return chunks
+
+
+# -----------------------------
+# Semantic side (local Chroma)
+# -----------------------------
+
+class LocalSemanticIndex:
+    def __init__(self, client, chunks: List[Dict[str, Any]], embed_fn: Callable) -> None:
+        self.embed_fn = embed_fn
+        self.collection = client.create_collection(
+            name="retrieval_eval",
+            metadata={"hnsw:space": "cosine"},
+        )
+        self.collection.add(
+            ids=[chunk["id"] for chunk in chunks],
+            documents=[chunk["content"] for chunk in chunks],
+            embeddings=embed_fn([chunk["content"] for chunk in chunks]),
+            metadatas=[
+                {
+                    "document_id": chunk["document_id"],
+                    "source": chunk["source"],
+                    "page": chunk["page"],
+                    "chunk_index": chunk["chunk_index"],
+                    "summary": chunk["summary"],
+                    "keywords": ",".join(chunk["keywords"]),
+                    "search_terms": ",".join(chunk["search_terms"]),
+                }
+                for chunk in chunks
+            ],
+        )
+
+    def search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        response = self.collection.query(
+            query_embeddings=self.embed_fn([query]),
+            n_results=top_k,
+            include=SemanticRetriever._include_fields(include_content=True),
+        )
+        return SemanticRetriever._normalize_response(response)
+
+
+# -----------------------------
+# Keyword side (BM25 stand-in or real Elasticsearch)
+# -----------------------------
+
+class Bm25Index:
+    """
+    In-process BM25 over the same fields KeywordRetriever searches, scoring
+    each chunk by its best boosted field (multi_match best_fields).
+    """
+
+    def __init__(self, chunks: List[Dict[str, Any]], k1: float = 1.2, b: float = 0.75) -> None:
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.fields: Dict[str, List[Counter]] = {}
+        self.avg_len: Dict[str, float] = {}
+        self.doc_freq: Dict[str, Counter] = {}
+
+        for field in FIELD_BOOSTS:
+            term_counts = [Counter(tokenize(self._field_text(chunk, field))) for chunk in chunks]
+            self.fields[field] = term_counts
+            self.avg_len[field] = (sum(sum(c.values()) for c in term_counts) / len(chunks)) if chunks else 0.0
+            self.doc_freq[field] = Counter(term for counts in term_counts for term in counts)
+
+    @staticmethod
+    def _field_text(chunk: Dict[str, Any], field: str) -> str:
+        value = chunk.get(field) or ""
+        return " ".join(value) if isinstance(value, list) else value
+
+    def _field_score(self, field: str, idx: int, terms: List[str]) -> float:
+        counts = self.fields[field][idx]
+        length = sum(counts.values())
+        avg_len = self.avg_len[field] or 1.0
+        n_docs = len(self.chunks)
+        score = 0.0
+
+        for term in terms:
+            tf = counts.get(term, 0)
+            if not tf:
+                continue
+            df = self.doc_freq[field][term]
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            score += idf * tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / avg_len))
+
+        return score
+
+    def search(self, query: str, top_k: int, expanded_terms: List[str]) -> List[Dict[str, Any]]:
+        terms = tokenize(" ".join([query, *expanded_terms]))
+        scored: List[Tuple[float, int]] = []
+
+        for idx in range(len(self.chunks)):
+            score = max(
+                boost * self._field_score(field, idx, terms)
+                for field, boost in FIELD_BOOSTS.items()
+            )
+            if score > 0:
+                scored.append((score, idx))
+
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+
+        return [
+            {
+                "chunk_id": self.chunks[idx]["id"],
+                "document_id": self.chunks[idx]["document_id"],
+                "source": self.chunks[idx]["source"],
+                "page": self.chunks[idx]["page"],
+                "chunk_index": self.chunks[idx]["chunk_index"],
+                "content": self.chunks[idx]["content"],
+                "summary": self.chunks[idx]["summary"],
+                "keywords": self.chunks[idx]["keywords"],
+                "search_terms": self.chunks[idx]["search_terms"],
+                "score": float(score),
+                "retrieval_type": "keyword",
+            }
+            for score, idx in scored[:top_k]
+        ]
+
+
+class ElasticKeywordIndex:
+    """
+    Real KeywordRetriever against a throwaway index on a local cluster.
+    """
+
+    def __init__(self, index_name: str) -> None:
+        from backend.services.keyword_retriever import KeywordRetriever
+
+        self.index_name = index_name
+        self.retriever = KeywordRetriever()
+        self.retriever.index_name = index_name
+
+    async def setup(self, elastic_url: str, chunks: List[Dict[str, Any]]) -> None:
+        from backend.clients.elastic_search_client import elastic_bus
+        from backend.services.elastic_routing import ElasticRouting
+
+        settings.ELASTIC_SEARCH_URL = elastic_url
+        settings.ELASTIC_SEARCH_API_KEY = ""
+        await elastic_bus.connect()
+        client = elastic_bus.get_client()
+
+        mapping = build_mapping(settings.ELASTIC_EMBEDDING_DIMS)
+        mapping["mappings"]["properties"].pop("embedding")
+
+        if await client.indices.exists(index=self.index_name):
+            await client.indices.delete(index=self.index_name)
+        await client.indices.create(index=self.index_name, body=mapping)
+
+        operations: List[Dict[str, Any]] = []
+        for chunk in chunks:
+            operations.append({"index": {**ElasticRouting.bulk_meta(EVAL_USER_ID, self.index_name), "_id": chunk["id"]}})
+            operations.append({**chunk, "user_id": EVAL_USER_ID, "source": chunk["source"].lower()})
+
+        await client.bulk(operations=operations, refresh="wait_for")
+
+    async def search(self, query: str, top_k: int, expansion: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        return await self.retriever.search(
+            query=query,
+            user_id=EVAL_USER_ID,
+            top_k=top_k,
+            expanded_keywords=expansion.get("keywords", []),
+            expanded_search_terms=expansion.get("search_terms", []),
+            include_content=True,
+        )
+
+    async def close(self) -> None:
+        from backend.clients.elastic_search_client import elastic_bus
+
+        await elastic_bus.get_client().indices.delete(index=self.index_name, ignore_unavailable=True)
+        await elastic_bus.close()
+
+
+# -----------------------------
+# Expansion (stubbed / cached / live)
+# -----------------------------
+
+async def load_expansions(args, questions: List[str]) -> Dict[str, Dict[str, List[str]]]:
+    cache: Dict[str, Dict[str, List[str]]] = {}
+    cache_path = Path(args.expansion_cache) if args.expansion_cache else None
+
+    if cache_path and cache_path.exists():
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+
+    if args.expansion == "none":
+        return {}
+
+    if args.expansion == "live":
+        from backend.services.query_expansion_service import QueryExpansionService
+
+        for question in questions:
+            if question in cache:
+                continue
+            expansion = await QueryExpansionService.expand_query(question)
+            cache[question] = {"keywords": expansion.keywords, "search_terms": expansion.search_terms}
+
+        if cache_path:
+            cache_path.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+
+    return cache
+
+
+# -----------------------------
+# Metrics
+# -----------------------------
+
+def page_key(item: Dict[str, Any]) -> Tuple[str, Any]:
+    return ((item.get("source") or "").lower(), item.get("page"))
+
+
+def score_ranking(results: List[Dict[str, Any]], relevant: set, k: int) -> Dict[str, float]:
+    """
+    Page-level binary relevance: only the first chunk of each relevant page
+    earns gain, so several chunks from one page do not inflate the scores.
+    """
+    gains: List[float] = []
+    seen = set()
+
+    for item in results[:k]:
+        key = page_key(item)
+        gains.append(1.0 if key in relevant and key not in seen else 0.0)
+        seen.add(key)
+
+    dcg = sum(gain / math.log2(rank + 2) for rank, gain in enumerate(gains))
+    idcg = sum(1.0 / math.log2(rank + 2) for rank in range(min(len(relevant), k)))
+
+    return {
+        "recall": sum(gains) / len(relevant) if relevant else 0.0,
+        "mrr": next((1.0 / (rank + 1) for rank, gain in enumerate(gains) if gain), 0.0),
+        "ndcg": dcg / idcg if idcg else 0.0,
+    }
+
+
+def summarize_latency(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    return {
+        "p50": round(float(np.percentile(samples, 50)), 3),
+        "p95": round(float(np.percentile(samples, 95)), 3),
+        "mean": round(float(np.mean(samples)), 3),
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    deltas: Dict[str, Any] = {}
+
+    for stage, by_k in report["quality"].items():
+        for k, metrics in by_k.items():
+            previous = baseline.get("quality", {}).get(stage, {}).get(k)
+            if not previous:
+                continue
+            deltas.setdefault(stage, {})[k] = {
+                name: round(value - previous.get(name, 0.0), 4)
+                for name, value in metrics.items()
+            }
+
+    return deltas
+
+
+# -----------------------------
+# Run
+# -----------------------------
+
+async def run(args) -> Dict[str, Any]:
+    if args.chunk_size:
+        settings.CHUNK_SIZE = args.chunk_size
+    if args.chunk_overlap is not None:
+        settings.CHUNK_OVERLAP = args.chunk_overlap
+
+    questions = json.loads(Path(args.questions).read_text(encoding="utf-8"))
+    chunks = build_chunks(load_corpus(args))
+
+    if args.fake_embeddings:
+        embed_fn = fake_embed(args.dims)
+    else:
+        from backend.services.ingestion.embedding_service import EmbeddingService
+        embed_fn = EmbeddingService.embed_texts
+
+    expansions = await load_expansions(args, [item["question"] for item in questions])
+    ks = sorted(set(args.k))
+    depth = max(max(ks), args.top_k)
+
+    latencies: Dict[str, List[float]] = {"semantic": [], "keyword": [], "fuse": [], "rerank": []}
+    totals: Dict[str, Dict[int, Dict[str, float]]] = {stage: {k: Counter() for k in ks} for stage in STAGES}
+    per_question: List[Dict[str, Any]] = []
+
+    elastic_index: Optional[ElasticKeywordIndex] = None
+    bm25_index: Optional[Bm25Index] = None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        semantic_index = LocalSemanticIndex(chromadb.PersistentClient(path=tmp_dir), chunks, embed_fn)
+
+        if args.elastic_url:
+            elastic_index = ElasticKeywordIndex(args.elastic_index)
+            await elastic_index.setup(args.elastic_url, chunks)
+        else:
+            bm25_index = Bm25Index(chunks)
+
+        try:
+            for item in questions:
+                question = item["question"]
+                relevant = {((label["source"]).lower(), label["page"]) for label in item["relevant"]}
+                expansion = expansions.get(question, {})
+                stage_results: Dict[str, List[Dict[str, Any]]] = {}
+
+                started = time.perf_counter()
+                stage_results["semantic"] = semantic_index.search(question, depth)
+                latencies["semantic"].append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                if elastic_index is not None:
+                    stage_results["keyword"] = await elastic_index.search(question, depth, expansion)
+                else:
+                    stage_results["keyword"] = bm25_index.search(
+                        question,
+                        depth,
+                        [*expansion.get("keywords", []), *expansion.get("search_terms", [])],
+                    )
+                latencies["keyword"].append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                stage_results["fused"] = FusionService.fuse(
+                    ranked_lists={
+                        "semantic": stage_results["semantic"],
+                        "keyword": stage_results["keyword"],
+                    },
+                    weights={
+                        "semantic": args.semantic_weight,
+                        "keyword": args.keyword_weight,
+                    },
+                    method=args.fusion_method,
+                    rrf_k=args.rrf_k,
+                    top_k=args.top_k,
+                )
+                latencies["fuse"].append((time.perf_counter() - started) * 1000)
+
+                if args.rerank_backend:
+                    from backend.services.reranker_service import RerankerService
+
+                    started = time.perf_counter()
+                    outcome = await RerankerService.rerank(
+                        query=question,
+                        candidates=stage_results["fused"],
+                        top_k=max(ks),
+                        timeout=args.rerank_timeout,
+                        backend=args.rerank_backend,
+                    )
+                    latencies["rerank"].append((time.perf_counter() - started) * 1000)
+                    stage_results["reranked"] = outcome["results"]
+
+                row: Dict[str, Any] = {"question": question}
+
+                for stage, results in stage_results.items():
+                    for k in ks:
+                        totals[stage][k].update(score_ranking(results, relevant, k))
+                    row[stage] = [item.get("chunk_id") for item in results[:max(ks)]]
+
+                per_question.append(row)
+
+        finally:
+            if elastic_index is not None:
+                await elastic_index.close()
+
+    quality = {
+        stage: {
+            f"@{k}": {name: round(value / len(questions), 4) for name, value in sorted(totals[stage][k].items())}
+            for k in ks
+        }
+        for stage in STAGES
+        if any(totals[stage][k] for k in ks)
+    }
+
+    return {
+        "run": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "questions": len(questions),
+            "chunks": len(chunks),
+            "config": {
+                "chunk_size": settings.CHUNK_SIZE,
+                "chunk_overlap": settings.CHUNK_OVERLAP,
+                "fusion_method": args.fusion_method,
+                "rrf_k": args.rrf_k,
+                "semantic_weight": args.semantic_weight,
+                "keyword_weight": args.keyword_weight,
+                "fused_top_k": args.top_k,
+                "keyword_engine": "elasticsearch" if args.elastic_url else "bm25_stand_in",
+                "embeddings": "fake" if args.fake_embeddings else settings.HF_EMBEDDING_MODEL,
+                "expansion": args.expansion,
+                "rerank_backend": args.rerank_backend,
+            },
+        },
+        "quality": quality,
+        "latency_ms": {stage: summarize_latency(samples) for stage, samples in latencies.items() if samples},
+        "per_question": per_question,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline retrieval quality and latency benchmark.")
+    parser.add_argument("--corpus", default=str(FIXTURES_DIR / "eval_corpus.json"))
+    parser.add_argument("--pdf-dir", default=None, help="Use PDFs from this directory instead of --corpus")
+    parser.add_argument("--questions", default=str(FIXTURES_DIR / "eval_questions.json"))
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--chunk-overlap", type=int, default=None)
+    parser.add_argument("--fusion-method", choices=FUSION_METHODS, default=settings.FUSION_METHOD)
+    parser.add_argument("--rrf-k", type=int, default=settings.FUSION_RRF_K)
+    parser.add_argument("--semantic-weight", type=float, default=settings.FUSION_SEMANTIC_WEIGHT)
+    parser.add_argument("--keyword-weight", type=float, default=settings.FUSION_KEYWORD_WEIGHT)
+    parser.add_argument("--top-k", type=int, default=10, help="Fused candidates kept (graph uses 10)")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--fake-embeddings", action="store_true", help="Hashed token vectors instead of the model")
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--expansion", choices=["none", "cache", "live"], default="none")
+    parser.add_argument("--expansion-cache", default=None, help="JSON file of cached expansions")
+    parser.add_argument("--elastic-url", default=None, help="Run the real KeywordRetriever against this cluster")
+    parser.add_argument("--elastic-index", default="coeus_retrieval_eval")
+    parser.add_argument("--rerank-backend", choices=["cohere", "cross_encoder"], default=None)
+    parser.add_argument("--rerank-timeout", type=float, default=30.0)
+    parser.add_argument("--output", default=None, help="Write the full JSON report here")
+    parser.add_argument("--baseline", default=None, help="Earlier report to diff quality metrics against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        report["delta_vs_baseline"] = compare_to_baseline(report, baseline)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    summary = {key: value for key, value in report.items() if key != "per_question"}
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
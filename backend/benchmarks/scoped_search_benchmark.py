@@ -0,0 +1,111 @@
+"""
+Latency of scoped (document_id prefilter) vs unscoped Chroma queries as the
+collection grows.
+
+Builds throwaway collections of random unit vectors spread over a fixed
+number of documents, then times the same query with and without the
+`where={"document_id": ...}` prefilter SemanticRetriever applies.
+
+Usage:
+    python -m backend.benchmarks.scoped_search_benchmark
+    python -m backend.benchmarks.scoped_search_benchmark --sizes 1000 10000 50000 --documents 50
+"""
+import argparse
+import json
+import tempfile
+import time
+from typing import List, Dict, Any
+
+import chromadb
+import numpy as np
+
+from backend.services.semantic_retriever import SemanticRetriever
+
+
+def build_collection(client, size: int, documents: int, dim: int, rng: np.random.Generator):
+    collection = client.create_collection(
+        name=f"scoped_bench_{size}",
+        metadata={"hnsw:space": "cosine"},
+    )
+
+    batch_size = 5000
+    for start in range(0, size, batch_size):
+        stop = min(start + batch_size, size)
+        vectors = rng.standard_normal((stop - start, dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        collection.add(
+            ids=[f"chunk_{idx}" for idx in range(start, stop)],
+            embeddings=vectors.tolist(),
+            metadatas=[
+                {"document_id": f"doc_{idx % documents}", "source": f"doc_{idx % documents}.pdf"}
+                for idx in range(start, stop)
+            ],
+        )
+
+    return collection
+
+
+def time_queries(collection, queries: np.ndarray, top_k: int, where) -> Dict[str, float]:
+    latencies: List[float] = []
+
+    for vector in queries:
+        started = time.perf_counter()
+        collection.query(
+            query_embeddings=[vector.tolist()],
+            n_results=top_k,
+            where=where,
+            include=["metadatas", "distances"],
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scoped vs unscoped Chroma search.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 50000])
+    parser.add_argument("--documents", type=int, default=20, help="Distinct document_ids per collection")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    report: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client = chromadb.PersistentClient(path=tmp_dir)
+
+        for size in args.sizes:
+            collection = build_collection(client, size, args.documents, args.dim, rng)
+
+            queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+            queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+            # Warm the index so the first timed query does not pay load cost.
+            time_queries(collection, queries[:3], args.top_k, None)
+
+            report.append({
+                "collection_size": size,
+                "vectors_per_document": size // args.documents,
+                "unscoped": time_queries(collection, queries, args.top_k, None),
+                "scoped": time_queries(
+                    collection,
+                    queries,
+                    args.top_k,
+                    SemanticRetriever._build_where(document_id="doc_0"),
+                ),
+            })
+
+            client.delete_collection(collection.name)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,25 @@
 import logging
-import chromadb
-from chromadb.api import ClientAPI
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional
 from backend.config import settings
 
+if TYPE_CHECKING:
+    from chromadb.api import ClientAPI
+
 logger = logging.getLogger("coeus_ai.chroma_bus")
 
 class ChromaBus:
     def __init__(self):
-        self.client: ClientAPI | None = None
+        self.client: "ClientAPI | None" = None
+        # LRU of collection handles by name. get_or_create_collection is a
+        # sysdb round trip; the handle itself stays valid until the
+        # collection is deleted.
+        self._collections: "OrderedDict[str, Any]" = OrderedDict()
+        self._collections_lock = threading.Lock()
+        self._collections_client: "ClientAPI | None" = None
+        self.collection_hits = 0
+        self.collection_misses = 0
 
     async def connect(self):
         """
@@ -19,6 +31,9 @@ class ChromaBus:
         try:
             logger.info(f"Connecting to ChromaDB at {settings.CHROMA_PATH}...")
             
+            # Imported here: chromadb is slow to import and only needed once connected.
+            import chromadb
+
             # We wrap the sync call in a standard way so the Bus pattern remains consistent
             self.client = chromadb.PersistentClient(path=settings.CHROMA_PATH)
             
@@ -36,17 +51,70 @@ class ChromaBus:
         Resets the client reference. PersistentClient handles file closing 
         internally, but clearing the reference prevents accidental post-shutdown leaks.
         """
+        self.forget_collections()
         if self.client:
             logger.info("ChromaDB Connection Reference Cleared.")
             self.client = None
 
-    def get_collection(self, name: str):
+    def get_collection(
+        self,
+        name: str,
+        embedding_function: Any = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
         """
-        Returns or creates a collection.
+        Returns or creates a collection, reusing a cached handle when there is one.
+        Blocking on a cache miss: call it through vector_executor from async code.
         """
         if not self.client:
             raise RuntimeError("ChromaDB client is not initialized. Call connect() first.")
-        return self.client.get_or_create_collection(name=name)
+
+        with self._collections_lock:
+            # Handles belong to the client that created them.
+            if self._collections_client is not self.client:
+                self._collections.clear()
+                self._collections_client = self.client
+
+            collection = self._collections.get(name)
+            if collection is not None:
+                self._collections.move_to_end(name)
+                self.collection_hits += 1
+                return collection
+            self.collection_misses += 1
+
+        kwargs: Dict[str, Any] = {"name": name}
+        if embedding_function is not None:
+            kwargs["embedding_function"] = embedding_function
+        if metadata is not None:
+            kwargs["metadata"] = metadata
+
+        collection = self.client.get_or_create_collection(**kwargs)
+
+        with self._collections_lock:
+            self._collections[name] = collection
+            self._collections.move_to_end(name)
+            while len(self._collections) > settings.CHROMA_COLLECTION_CACHE_SIZE:
+                self._collections.popitem(last=False)
+
+        return collection
+
+    def forget_collections(self, name: Optional[str] = None) -> None:
+        """
+        Drop one cached handle (after deleting that collection) or all of them.
+        """
+        with self._collections_lock:
+            if name is None:
+                self._collections.clear()
+            else:
+                self._collections.pop(name, None)
+
+    def collection_stats(self) -> Dict[str, Any]:
+        return {
+            "layout": settings.CHROMA_LAYOUT,
+            "cached_handles": len(self._collections),
+            "hits": self.collection_hits,
+            "misses": self.collection_misses,
+        }
 
 # Singleton Instance
-chroma_bus = ChromaBus()
\ No newline at end of file
+chroma_bus = ChromaBus()
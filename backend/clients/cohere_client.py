@@ -1,8 +1,39 @@
-import cohere
 from backend.config import settings
+from backend.clients.http_pool import http_pools
 
 class CohereClient:
+    """
+    Clients are built on first use, so processes that never rerank with
+    Cohere do not pay for importing the SDK.
+    """
+
     def __init__(self):
-        self.client = cohere.Client(api_key=settings.CO_API_KEY)
+        self._client = None
+        self._async_client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import cohere
+            self._client = cohere.Client(api_key=settings.CO_API_KEY)
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            import cohere
+            self._async_client = cohere.AsyncClient(
+                api_key=settings.CO_API_KEY,
+                httpx_client=http_pools.client("cohere", timeout=settings.RERANK_TIMEOUT_SECONDS),
+            )
+        return self._async_client
+
+    @async_client.setter
+    def async_client(self, value):
+        self._async_client = value
 
-co_bus = CohereClient()
\ No newline at end of file
+co_bus = CohereClient()
@@ -23,12 +23,16 @@ class ElasticBus:
                 self.client = AsyncElasticsearch(
                     hosts=settings.ELASTIC_SEARCH_URL,
                     api_key=settings.ELASTIC_SEARCH_API_KEY,
-                    verify_certs=True
+                    verify_certs=True,
+                    connections_per_node=settings.ELASTIC_CONNECTIONS_PER_NODE,
                 )
             
             # 3. No Auth (Dev/Local)
             else:
-                self.client = AsyncElasticsearch(settings.ELASTIC_SEARCH_URL)
+                self.client = AsyncElasticsearch(
+                    settings.ELASTIC_SEARCH_URL,
+                    connections_per_node=settings.ELASTIC_CONNECTIONS_PER_NODE,
+                )
 
             # Validate Connection
             if await self.client.ping():
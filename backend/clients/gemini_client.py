@@ -1,15 +1,35 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from backend.config import settings
+from backend.clients.http_pool import http_pools
 
 class GeminiClient:
     def __init__(self):
-        self.model = ChatGoogleGenerativeAI(
-            model=settings.GEMINI_MODEL,
-            temperature=0.2,
-            max_tokens=None,
-            timeout=None,
-            max_retries=settings.DEBUG and 0 or 2,
-            google_api_key=settings.GEMINI_API_KEY
-        )
-
-gemini_bus = GeminiClient()
\ No newline at end of file
+        self._model = None
+
+    @property
+    def model(self):
+        """
+        Built on first use: importing langchain_google_genai is one of the
+        slowest imports in the app and ingestion never needs it.
+        """
+        if self._model is None:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            self._model = ChatGoogleGenerativeAI(
+                model=settings.GEMINI_MODEL,
+                temperature=0.2,
+                max_tokens=None,
+                timeout=settings.GEMINI_TIMEOUT_SECONDS,
+                max_retries=settings.DEBUG and 0 or 2,
+                google_api_key=settings.GEMINI_API_KEY,
+                # A transport makes google-genai use httpx (not its own
+                # aiohttp session) over the shared pool. Only async calls
+                # are made, so the sync client never touches it.
+                client_args={"transport": http_pools.transport("gemini")},
+            )
+        return self._model
+
+    @model.setter
+    def model(self, value):
+        self._model = value
+
+gemini_bus = GeminiClient()
@@ -1,25 +1,57 @@
-import instructor
-from groq import AsyncGroq
-from langchain_groq import ChatGroq
-
 from backend.config import settings
+from backend.clients.http_pool import http_pools
 
 
 class GroqClients:
+    """
+    Both clients are built on first use; instructor and langchain_groq
+    pull in the openai SDK and take seconds to import. They share one
+    connection pool (http_pools "groq").
+    """
+
     def __init__(self):
-        self.langchain_model = ChatGroq(
-            model=settings.GROQ_MODEL,
-            temperature=0,
-            max_tokens=8192,
-            timeout=None,
-            max_retries=2,
-            api_key=settings.GROQ_API_KEY,
-        )
-
-        self.instructor_async_client = instructor.from_groq(
-            AsyncGroq(api_key=settings.GROQ_API_KEY),
-            mode=instructor.Mode.JSON,
-        )
-
-
-groq_clients = GroqClients()
\ No newline at end of file
+        self._langchain_model = None
+        self._instructor_async_client = None
+
+    @property
+    def langchain_model(self):
+        if self._langchain_model is None:
+            from langchain_groq import ChatGroq
+
+            self._langchain_model = ChatGroq(
+                model=settings.GROQ_MODEL,
+                temperature=0,
+                max_tokens=8192,
+                timeout=settings.GROQ_TIMEOUT_SECONDS,
+                max_retries=2,
+                api_key=settings.GROQ_API_KEY,
+                http_async_client=http_pools.client("groq", timeout=settings.GROQ_TIMEOUT_SECONDS),
+            )
+        return self._langchain_model
+
+    @langchain_model.setter
+    def langchain_model(self, value):
+        self._langchain_model = value
+
+    @property
+    def instructor_async_client(self):
+        if self._instructor_async_client is None:
+            import instructor
+            from groq import AsyncGroq
+
+            self._instructor_async_client = instructor.from_groq(
+                AsyncGroq(
+                    api_key=settings.GROQ_API_KEY,
+                    timeout=settings.GROQ_TIMEOUT_SECONDS,
+                    http_client=http_pools.client("groq", timeout=settings.GROQ_TIMEOUT_SECONDS),
+                ),
+                mode=instructor.Mode.JSON,
+            )
+        return self._instructor_async_client
+
+    @instructor_async_client.setter
+    def instructor_async_client(self, value):
+        self._instructor_async_client = value
+
+
+groq_clients = GroqClients()
@@ -0,0 +1,167 @@
+import importlib.util
+import logging
+from typing import Dict, Any, Optional
+
+import httpx
+
+from backend.config import settings
+
+logger = logging.getLogger("coeus_ai.http_pool")
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """
+    Keeps a request counted as in flight until its body is closed, which
+    is when httpx hands the connection back to the pool.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close) -> None:
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            on_close, self._on_close = self._on_close, None
+            if on_close is not None:
+                on_close()
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """
+    AsyncHTTPTransport that tracks pool usage: requests in flight (and the
+    peak), how many found every connection busy and had to queue, errors,
+    and the open / idle connection counts of the underlying pool.
+    """
+
+    def __init__(self, name: str, limits: httpx.Limits, http2: bool) -> None:
+        super().__init__(limits=limits, http2=http2)
+        self.name = name
+        self.max_connections = limits.max_connections
+        self.http2 = http2
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.queued_requests = 0
+        self.errors = 0
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        # Pool full and no connection can take another request (an HTTP/2
+        # connection can, while it has free streams): this one will wait.
+        connections = self._pool.connections
+        if (
+            self.max_connections
+            and len(connections) >= self.max_connections
+            and not any(connection.is_available() for connection in connections)
+        ):
+            self.queued_requests += 1
+
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            self._release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TrackedStream(response.stream, self._release),
+            extensions=response.extensions,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        connections = list(self._pool.connections)
+        idle = sum(1 for connection in connections if connection.is_idle())
+
+        return {
+            "name": self.name,
+            "max_connections": self.max_connections,
+            "http2": self.http2,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "requests": self.requests,
+            "queued_requests": self.queued_requests,
+            "errors": self.errors,
+        }
+
+
+class HttpPools:
+    """
+    One long-lived connection pool per outbound provider, shared by every
+    client that talks to it, so requests reuse warm TLS connections instead
+    of each SDK instance (or each call) opening its own pool. Pools are
+    separate per provider so a slow upstream cannot starve the others.
+
+    Elasticsearch keeps its own aiohttp pool (ELASTIC_CONNECTIONS_PER_NODE).
+    """
+
+    def __init__(self) -> None:
+        self._transports: Dict[str, InstrumentedTransport] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _http2_available() -> bool:
+        if not settings.HTTP_POOL_HTTP2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP_POOL_HTTP2 is set but the 'h2' package is missing; using HTTP/1.1.")
+            return False
+        return True
+
+    def transport(self, name: str) -> InstrumentedTransport:
+        if name not in self._transports:
+            self._transports[name] = InstrumentedTransport(
+                name,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                http2=self._http2_available(),
+            )
+        return self._transports[name]
+
+    def client(self, name: str, timeout: Optional[float] = None) -> httpx.AsyncClient:
+        """
+        Shared AsyncClient over the provider's pool. SDKs set base URLs and
+        auth headers per request, so one client serves all of them.
+        """
+        if name not in self._clients:
+            self._clients[name] = httpx.AsyncClient(
+                transport=self.transport(name),
+                timeout=httpx.Timeout(timeout, connect=settings.HTTP_POOL_CONNECT_TIMEOUT_SECONDS),
+                follow_redirects=True,
+            )
+        return self._clients[name]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: transport.stats() for name, transport in self._transports.items()}
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        for transport in self._transports.values():
+            await transport.aclose()
+
+        self._clients.clear()
+        self._transports.clear()
+
+
+# Singleton Instance
+http_pools = HttpPools()
@@ -1,12 +1,16 @@
 import logging
-from supabase import create_async_client, AsyncClient
+from typing import TYPE_CHECKING
 from backend.config import settings
+from backend.clients.http_pool import http_pools
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
 
 logger = logging.getLogger("coeus_ai.supabase_bus")
 
 class SupabaseBus:
     def __init__(self):
-        self.client: AsyncClient | None = None
+        self.client: "AsyncClient | None" = None
 
     async def connect(self):
         """
@@ -17,10 +21,15 @@ class SupabaseBus:
 
         try:
             logger.info("Connecting to Supabase...")
+            from supabase import create_async_client, AsyncClientOptions
             
             self.client = await create_async_client(
                 settings.SUPABASE_URL,
                 settings.SUPABASE_SECRET_KEY,
+                # PostgREST and Storage share one pool instead of one each.
+                options=AsyncClientOptions(
+                    httpx_client=http_pools.client("supabase", timeout=settings.SUPABASE_TIMEOUT_SECONDS),
+                ),
             )
 
             await self.client.table("users").select("id").limit(1).execute()
@@ -40,7 +49,7 @@ class SupabaseBus:
             logger.info("Supabase Connection Reference Cleared.")
             self.client = None
 
-    def get_client(self) -> AsyncClient:
+    def get_client(self) -> "AsyncClient":
         """
         Returns the active client. Raises error if not initialized.
         """
@@ -15,13 +15,20 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     ALLOWED_ORIGINS: List[str] = ["*"]
 
+    # --- Response Encoding ---
+    RESPONSE_GZIP_ENABLED: bool = True
+    RESPONSE_GZIP_MIN_SIZE: int = 1024
+
     # --- Groq Configuration ---
     GROQ_API_KEY: str
     GROQ_MODEL: str 
 
+    GROQ_TIMEOUT_SECONDS: float = 10.0
+
     # --- Gemini Configuration ---
     GEMINI_API_KEY: str
     GEMINI_MODEL: str
+    GEMINI_TIMEOUT_SECONDS: float = 30.0
 
     # --- Supabase Configuration ---
     SUPABASE_URL: str
@@ -31,6 +38,13 @@ class Settings(BaseSettings):
     # --- Cohere Configuration ---
     CO_API_KEY: str 
     COHERE_RERANK_MODEL: str 
+    RERANK_TIMEOUT_SECONDS: float = 2.0
+
+    # --- Reranker Backend Configuration ---
+    # cohere | cross_encoder | embedding
+    RERANK_BACKEND: str = "cohere"
+    LOCAL_RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    LOCAL_RERANK_BATCH_SIZE: int = 16
     
     # --- Hugging Face & Embeddings ---
     HF_TOKEN: str
@@ -40,17 +54,166 @@ class Settings(BaseSettings):
     ELASTIC_SEARCH_API_KEY: str
     ELASTIC_SEARCH_URL: str
     ELASTIC_SEARCH_INDEX: str
-    
+    ELASTIC_STORE_EMBEDDINGS: bool = False
+    ELASTIC_EMBEDDING_DIMS: int = 768
+    ELASTIC_KNN_NUM_CANDIDATES: int = 100
+
+    #--- Elasticsearch Routing Configuration ---
+    # Index and search chunks with routing=user_id: one shard per query
+    # instead of all of them. Chunks indexed without routing must be
+    # re-indexed first (`python -m backend.scripts.reindex_elastic_routing`).
+    ELASTIC_ROUTING_ENABLED: bool = False
+    # > 0: spread users over this many `<ELASTIC_SEARCH_INDEX>-group-NNN`
+    # indexes, all behind ELASTIC_TENANT_ALIAS (default `<index>-all`).
+    ELASTIC_TENANT_GROUPS: int = 0
+    ELASTIC_TENANT_ALIAS: str = ""
+
+    #--- Retrieval Engine Configuration ---
+    # python_fusion: Chroma + Elasticsearch BM25, fused in Python
+    # elastic_hybrid: one Elasticsearch kNN + BM25 request with ES-side RRF.
+    #   Only chunks indexed with an `embedding` take part in the kNN side;
+    #   run `python -m backend.scripts.backfill_elastic_embeddings` before
+    #   switching, or chunks ingested earlier are found by BM25 only.
+    RETRIEVAL_ENGINE: str = "python_fusion"
+
+    #--- Chroma Layout Configuration ---
+    # per_user: one collection per user (user_collection_<id>)
+    # sharded: CHROMA_SHARD_COUNT shared collections, user picked by a stable
+    #          hash of user_id and isolated with a user_id metadata filter
+    # Switching layouts needs `python -m backend.scripts.migrate_chroma_layout`.
+    CHROMA_LAYOUT: str = "per_user"
+    CHROMA_SHARD_COUNT: int = 16
+    CHROMA_SHARD_PREFIX: str = "tenant_shard"
+    # Collection handles kept by chroma_bus, so requests skip get_or_create.
+    CHROMA_COLLECTION_CACHE_SIZE: int = 1024
+
     #--- Ingestion Configuration ---
     CHUNK_SIZE: int = 1024
     CHUNK_OVERLAP: int = 256
 
+    #--- Fusion Configuration ---
+    # rrf | minmax | zscore | combsum
+    FUSION_METHOD: str = "rrf"
+    FUSION_RRF_K: int = 60
+    FUSION_SEMANTIC_WEIGHT: float = 1.0
+    FUSION_KEYWORD_WEIGHT: float = 1.0
+
+    #--- MMR Diversification Configuration ---
+    # Retrieve MMR_CANDIDATE_POOL fused candidates, keep MMR_TOP_K diverse ones.
+    MMR_ENABLED: bool = False
+    MMR_CANDIDATE_POOL: int = 20
+    MMR_TOP_K: int = 8
+    # 1.0 = pure relevance, 0.0 = pure diversity.
+    MMR_LAMBDA: float = 0.5
+    MMR_BUDGET_SECONDS: float = 0.5
+
+    #--- Latency Budget Configuration ---
+    # Request-level deadline for /chat/ask, sliced across graph stages.
+    CHAT_REQUEST_BUDGET_SECONDS: float = 20.0
+    EXPANSION_BUDGET_SECONDS: float = 2.5
+    RETRIEVAL_BUDGET_SECONDS: float = 3.0
+    HYDRATION_BUDGET_SECONDS: float = 1.5
+    # BM25-only retry when the elastic_hybrid request misses its budget.
+    HYBRID_FALLBACK_BUDGET_SECONDS: float = 1.0
+    # Time held back for answer generation by every earlier stage.
+    ANSWER_RESERVE_SECONDS: float = 5.0
+    # Below this much remaining time the answer uses fewer chunks.
+    ANSWER_SHORTEN_BELOW_SECONDS: float = 8.0
+    ANSWER_SHORT_TOP_K: int = 3
+
+    #--- Answer Evidence Configuration ---
+    # Merge adjacent / overlapping chunks so the splitter overlap is sent once.
+    ANSWER_STITCH_EVIDENCE: bool = True
+    # Upper bound on evidence sent to Gemini (estimated at ~4 chars per token).
+    ANSWER_EVIDENCE_TOKEN_BUDGET: int = 2000
+
+    #--- Context Expansion Configuration ---
+    # After rerank, also fetch the N chunks either side of each survivor.
+    CONTEXT_EXPANSION_ENABLED: bool = False
+    CONTEXT_EXPANSION_WINDOW: int = 1
+    CONTEXT_EXPANSION_BUDGET_SECONDS: float = 0.75
+    # LRU of fetched chunk documents, shared by hydration and expansion.
+    CHUNK_CACHE_MAX_ENTRIES: int = 5000
+    # Cached chunks expire after this long (0 = never), so processes other
+    # than the one re-ingesting a document stop serving its old text.
+    CHUNK_CACHE_TTL_SECONDS: float = 300.0
+
+    #--- Chat Session Configuration ---
+    CHAT_SESSION_TTL_SECONDS: float = 1800.0
+    CHAT_SESSION_MAX_SESSIONS: int = 1000
+    CHAT_SESSION_MAX_TURNS: int = 6
+    CHAT_SESSION_POOL_SIZE: int = 10
+    # Share of follow-up terms the cached pool must contain to skip retrieval.
+    CHAT_SESSION_MIN_POOL_COVERAGE: float = 0.6
+
+    #--- Vector Executor Configuration ---
+    VECTOR_EXECUTOR_WORKERS: int = 4
+    VECTOR_EXECUTOR_MAX_QUEUE: int = 32
+    VECTOR_EXECUTOR_QUEUE_TIMEOUT_SECONDS: float = 5.0
+
+    #--- Startup Warm-up Configuration ---
+    # Heavy SDKs and models load lazily; the warm-up loads them after boot
+    # and /ready stays 503 until it finishes.
+    WARMUP_ENABLED: bool = True
+    WARMUP_LLM_CLIENTS: bool = True
+    WARMUP_EMBEDDING_MODEL: bool = True
+    # Load the cross-encoder even when RERANK_BACKEND is another backend, so
+    # a per-request rerank_backend="cross_encoder" does not load it inside
+    # the rerank budget. Without it, such requests are rejected.
+    WARMUP_RERANK_MODEL: bool = True
+
+    #--- HTTP Pool Configuration ---
+    # Per-provider outbound pools (Groq, Gemini, Cohere, Supabase).
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_POOL_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_POOL_HTTP2: bool = True
+    SUPABASE_TIMEOUT_SECONDS: float = 20.0
+    ELASTIC_CONNECTIONS_PER_NODE: int = 25
+
+    #--- Health Probe Configuration ---
+    # Probes are cached so load balancer polling never fans out to backends.
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 1.0
+    HEALTH_CACHE_TTL_SECONDS: float = 5.0
+
+    #--- Circuit Breaker Configuration ---
+    # Per LLM provider: consecutive failures before failing fast, and how
+    # long to fail fast before letting one trial call through.
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: float = 30.0
+
+    #--- Logging Configuration ---
+    LOG_LEVEL: str = "INFO"
+    # Per-logger overrides, e.g. "coeus_ai.keyword_retriever=DEBUG,elastic_transport=WARNING".
+    # httpx logs every outbound provider call at INFO.
+    LOG_LEVELS: str = "httpx=WARNING"
+    # json | text
+    LOG_FORMAT: str = "json"
+    # Share of requests whose DEBUG payloads (query bodies, hit lists) are logged.
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+    # Records buffered for the log writer thread; beyond this they are dropped.
+    LOG_QUEUE_SIZE: int = 10000
+    REQUEST_ID_HEADER: str = "X-Request-ID"
+
     # --- LangSmith Tracing Configuration ---
     LANGSMITH_TRACING: bool 
     LANGSMITH_ENDPOINT: str 
     LANGSMITH_API_KEY: str
     LANGSMITH_PROJECT: str 
 
+    #--- Trace Sampling Configuration ---
+    # Share of traced roots (API handlers, ingestion runs) sent to LangSmith;
+    # everything beneath a root follows its decision.
+    TRACE_SAMPLE_RATE: float = 1.0
+    # Per-route overrides, e.g. "api.chat=0.01,api.retrieve=0.05,ingestion=1.0"
+    TRACE_SAMPLE_RATES: str = ""
+    # Payload limits applied to trace inputs / outputs.
+    TRACE_MAX_STRING_CHARS: int = 2000
+    TRACE_MAX_LIST_ITEMS: int = 20
+    TRACE_MAX_DEPTH: int = 4
+    TRACE_REDACT_KEYS: str = "api_key,authorization,password,secret,token,embedding,embeddings,query_vector,file_bytes"
+
     model_config = SettingsConfigDict(
         env_file=".env", 
         env_file_encoding="utf-8",
@@ -1,7 +1,7 @@
 import asyncio
 import os
 from typing import List, Dict, Any, Optional
-from typing_extensions import TypedDict
+from typing_extensions import TypedDict, Annotated
 from langgraph.graph import StateGraph, START, END
 
 from backend.config import settings
@@ -11,6 +11,11 @@ from backend.services.ingestion.labeling_service import LabelingService
 from backend.services.ingestion.embedding_service import EmbeddingService
 from backend.services.ingestion.keyword_insertion_service import ElasticService
 from backend.services.ingestion.ingestion_finalizer_service import IngestionFinalizerService
+from backend.services.chunk_hydration_service import chunk_cache
+from backend.utils.metrics import timed_node, merge_timings
+from backend.utils.logging_setup import get_logger
+
+logger = get_logger("ingestion_graph")
 
 
 class IngestionState(TypedDict, total=False):
@@ -27,6 +32,9 @@ class IngestionState(TypedDict, total=False):
     chroma_count: int
     elastic_count: int
 
+    # Per-stage durations in ms, merged across nodes
+    timings: Annotated[Dict[str, float], merge_timings]
+
     status: str
     error: Optional[str]
     error_stage: Optional[str]
@@ -54,13 +62,14 @@ def route_from_status(state: IngestionState) -> str:
     return STATUS_TO_NODE[status]
 
 
+@timed_node("ingestion", "extract")
 async def extract_node(state: IngestionState) -> IngestionState:
     """
     Step 1: Extract pages from uploaded PDF.
     Allowed only when job status = uploaded.
     Service updates job status to extracted.
     """
-    print(f"[1/6] Extracting for job_id={state['job_id']}")
+    logger.info("[1/6] Extracting", extra={"fields": {"job_id": state["job_id"]}})
 
     try:
         result = await PDFService.run_pdf_extraction_for_job(
@@ -78,7 +87,7 @@ async def extract_node(state: IngestionState) -> IngestionState:
         }
 
     except Exception as e:
-        print(f"Extraction Error: {e}")
+        logger.exception("Extraction failed", extra={"fields": {"job_id": state["job_id"]}})
         return {
             "status": "failed",
             "error": str(e),
@@ -86,6 +95,7 @@ async def extract_node(state: IngestionState) -> IngestionState:
         }
 
 
+@timed_node("ingestion", "chunk")
 async def chunk_node(state: IngestionState) -> IngestionState:
     """
     Step 2: Chunk extracted PDF.
@@ -95,7 +105,7 @@ async def chunk_node(state: IngestionState) -> IngestionState:
     if state.get("status") == "failed":
         return state
 
-    print(f"[2/6] Chunking for job_id={state['job_id']}")
+    logger.info("[2/6] Chunking", extra={"fields": {"job_id": state["job_id"]}})
 
     try:
         result = await PDFService.run_pdf_chunking_for_job(
@@ -112,7 +122,7 @@ async def chunk_node(state: IngestionState) -> IngestionState:
         }
 
     except Exception as e:
-        print(f"Chunking Error: {e}")
+        logger.exception("Chunking failed", extra={"fields": {"job_id": state["job_id"]}})
         return {
             "status": "failed",
             "error": str(e),
@@ -120,6 +130,7 @@ async def chunk_node(state: IngestionState) -> IngestionState:
         }
 
 
+@timed_node("ingestion", "label")
 async def label_node(state: IngestionState) -> IngestionState:
     """
     Step 3: AI label chunks.
@@ -129,7 +140,7 @@ async def label_node(state: IngestionState) -> IngestionState:
     if state.get("status") == "failed":
         return state
 
-    print(f"[3/6] Labeling for job_id={state['job_id']}")
+    logger.info("[3/6] Labeling", extra={"fields": {"job_id": state["job_id"]}})
 
     try:
         chunk_records = state.get("chunk_records")
@@ -173,13 +184,14 @@ async def label_node(state: IngestionState) -> IngestionState:
         }
 
     except Exception as e:
-        print(f"Labeling Error: {e}")
+        logger.exception("Labeling failed", extra={"fields": {"job_id": state["job_id"]}})
         return {
             "status": "failed",
             "error": str(e),
             "error_stage": "label",
         }
 
+@timed_node("ingestion", "embed")
 async def embed_node(state: IngestionState) -> IngestionState:
     """
     Step 4: Embed chunks and insert vectors into Chroma.
@@ -189,7 +201,7 @@ async def embed_node(state: IngestionState) -> IngestionState:
     if state.get("status") == "failed":
         return state
 
-    print(f"[4/6] Embedding for job_id={state['job_id']}")
+    logger.info("[4/6] Embedding", extra={"fields": {"job_id": state["job_id"]}})
 
     try:
         chroma_count = await EmbeddingService.embed_and_store(
@@ -206,7 +218,7 @@ async def embed_node(state: IngestionState) -> IngestionState:
         }
 
     except Exception as e:
-        print(f"Embedding Error: {e}")
+        logger.exception("Embedding failed", extra={"fields": {"job_id": state["job_id"]}})
         return {
             "status": "failed",
             "error": str(e),
@@ -214,6 +226,7 @@ async def embed_node(state: IngestionState) -> IngestionState:
         }
 
 
+@timed_node("ingestion", "keyword_insert")
 async def keyword_insert_node(state: IngestionState) -> IngestionState:
     """
     Step 5: Insert keyword documents into Elasticsearch.
@@ -223,7 +236,7 @@ async def keyword_insert_node(state: IngestionState) -> IngestionState:
     if state.get("status") == "failed":
         return state
 
-    print(f"[5/6] Keyword insertion for job_id={state['job_id']}")
+    logger.info("[5/6] Keyword insertion", extra={"fields": {"job_id": state["job_id"]}})
 
     try:
         elastic_count = await ElasticService.bulk_insert_chunks(
@@ -232,6 +245,10 @@ async def keyword_insert_node(state: IngestionState) -> IngestionState:
             job_id=state["job_id"],
         )
 
+        # A re-ingested document keeps its chunk ids; drop the old bodies.
+        if state.get("document_id"):
+            chunk_cache.forget_document(state["document_id"])
+
         return {
             "elastic_count": elastic_count,
             "status": "keyword_inserted",
@@ -240,7 +257,7 @@ async def keyword_insert_node(state: IngestionState) -> IngestionState:
         }
 
     except Exception as e:
-        print(f"Keyword Insertion Error: {e}")
+        logger.exception("Keyword insertion failed", extra={"fields": {"job_id": state["job_id"]}})
         return {
             "status": "failed",
             "error": str(e),
@@ -248,6 +265,7 @@ async def keyword_insert_node(state: IngestionState) -> IngestionState:
         }
 
 
+@timed_node("ingestion", "finalize")
 async def finalize_node(state: IngestionState) -> IngestionState:
     """
     Final step: mark ingestion job as done.
@@ -256,7 +274,7 @@ async def finalize_node(state: IngestionState) -> IngestionState:
     if state.get("status") == "failed":
         return state
 
-    print(f"[6/6] Finalizing job_id={state['job_id']}")
+    logger.info("[6/6] Finalizing", extra={"fields": {"job_id": state["job_id"]}})
 
     try:
         result = await IngestionFinalizerService.finalize_job(
@@ -272,7 +290,7 @@ async def finalize_node(state: IngestionState) -> IngestionState:
         }
 
     except Exception as e:
-        print(f"Finalization Error: {e}")
+        logger.exception("Finalization failed", extra={"fields": {"job_id": state["job_id"]}})
         return {
             "status": "failed",
             "error": str(e),
@@ -312,14 +330,14 @@ workflow.add_edge("finalize", END)
 ingestion_app = workflow.compile()
 
 
-if settings.LANGSMITH_TRACING:
-    os.environ["LANGSMITH_TRACING"] = "true"
-    os.environ["LANGSMITH_ENDPOINT"] = settings.LANGSMITH_ENDPOINT
-    os.environ["LANGSMITH_API_KEY"] = settings.LANGSMITH_API_KEY
-    os.environ["LANGSMITH_PROJECT"] = settings.LANGSMITH_PROJECT
-
-
 async def main():
+    # Manual trace run: trace everything, not a sampled share.
+    if settings.LANGSMITH_TRACING:
+        os.environ["LANGSMITH_TRACING"] = "true"
+        os.environ["LANGSMITH_ENDPOINT"] = settings.LANGSMITH_ENDPOINT
+        os.environ["LANGSMITH_API_KEY"] = settings.LANGSMITH_API_KEY
+        os.environ["LANGSMITH_PROJECT"] = settings.LANGSMITH_PROJECT
+
     initial_state = {
         "user_id": "user_abc",
         "user_name": "Test User",
@@ -1,13 +1,26 @@
-from typing import List, Dict, Any, Optional
-from typing_extensions import TypedDict
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple
+from typing_extensions import TypedDict, Annotated
 from langgraph.graph import StateGraph, START, END
 
-from backend.services.query_expansion_service import QueryExpansionService
+from backend.config import settings
+
+from backend.services.query_expansion_service import QueryExpansionService, QueryExpansionResult
 from backend.services.semantic_retriever import SemanticRetriever
 from backend.services.keyword_retriever import KeywordRetriever
+from backend.services.hybrid_retriever import ElasticHybridRetriever
 from backend.services.fusion_service import FusionService
+from backend.services.chunk_hydration_service import ChunkHydrationService
+from backend.services.mmr_service import MMRService
 from backend.services.reranker_service import RerankerService
 from backend.services.answer_service import AnswerService
+from backend.services.chat_session_service import ChatSessionService
+from backend.utils.circuit_breaker import CircuitOpenError
+from backend.utils.deadline import Deadline, stage_budget, add_degraded
+from backend.utils.metrics import timed, timed_node, merge_timings
+from backend.utils.logging_setup import get_logger
+
+logger = get_logger("retrieval_graph")
 
 
 class RetrievalState(TypedDict, total=False):
@@ -16,6 +29,18 @@ class RetrievalState(TypedDict, total=False):
     user_id: str
     document_id: Optional[str]
     source: Optional[str]
+    rerank_backend: Optional[str]
+
+    # Chat session: earlier turns and the previous turn's fused candidates
+    session_history: List[Dict[str, str]]
+    candidate_pool: List[Dict[str, Any]]
+    pool_reused: bool
+    pool_coverage: float
+
+    # Latency budget: monotonic expiry set by the router (see utils.deadline)
+    deadline_at: Optional[float]
+    # Stages that fell back to keep within the deadline
+    degraded: List[str]
 
     # Query expansion
     expanded_keywords: List[str]
@@ -23,14 +48,24 @@ class RetrievalState(TypedDict, total=False):
     intent_summary: str
 
     # Retrieval outputs
+    # Query embedding from retrieval, reused by MMR instead of re-embedding
+    query_vector: Optional[List[float]]
     semantic_results: List[Dict[str, Any]]
     keyword_results: List[Dict[str, Any]]
     fused_results: List[Dict[str, Any]]
+    # Fused candidates MMR replaced with more diverse ones
+    mmr_displaced: int
     reranked_results: List[Dict[str, Any]]
+    rerank_path: str
+    # Neighbouring chunks added around the reranked survivors
+    context_added: int
 
     # Final output
     final_answer: Dict[str, Any]
 
+    # Per-stage durations in ms, merged across nodes
+    timings: Annotated[Dict[str, float], merge_timings]
+
     # Status / error
     status: str
     error: Optional[str]
@@ -39,29 +74,128 @@ class RetrievalState(TypedDict, total=False):
 
 semantic_retriever = SemanticRetriever()
 keyword_retriever = KeywordRetriever()
+hybrid_retriever = ElasticHybridRetriever()
 
 
+async def _semantic_search(state: RetrievalState) -> Tuple[List[Dict[str, Any]], Optional[List[float]]]:
+    """
+    Semantic retrieval that also hands back the query vector it used.
+    """
+    if not state["query"].strip():
+        return [], None
+
+    query_vector = await SemanticRetriever.embed_query(state["query"])
+    results = await semantic_retriever.search(
+        query=state["query"],
+        user_id=state["user_id"],
+        document_id=state.get("document_id"),
+        source=state.get("source"),
+        top_k=MMRService.candidate_pool_size(),
+        query_vector=query_vector,
+    )
+    return results, query_vector
+
+
+async def _hybrid_search(state: RetrievalState) -> Tuple[List[Dict[str, Any]], Optional[List[float]]]:
+    """
+    elastic_hybrid retrieval that also hands back the query vector it used.
+    """
+    if not state["query"].strip():
+        return [], None
+
+    query_vector = await SemanticRetriever.embed_query(state["query"])
+    results = await hybrid_retriever.search(
+        query=state["query"],
+        user_id=state["user_id"],
+        document_id=state.get("document_id"),
+        source=state.get("source"),
+        top_k=MMRService.candidate_pool_size(),
+        expanded_keywords=state.get("expanded_keywords", []),
+        expanded_search_terms=state.get("expanded_search_terms", []),
+        query_vector=query_vector,
+    )
+    return results, query_vector
+
+
+@timed_node("chat", "reuse_pool")
+async def reuse_pool_node(state: RetrievalState) -> RetrievalState:
+    """
+    Step 0 (session follow-ups): check whether the previous turn's fused
+    candidates cover the new question. If they do, skip expansion and
+    retrieval and rerank that pool directly.
+    """
+    pool = state.get("candidate_pool") or []
+    coverage = ChatSessionService.pool_coverage(state["query"], pool)
+    reused = coverage >= settings.CHAT_SESSION_MIN_POOL_COVERAGE
+
+    logger.debug("[0/6] Candidate pool checked", extra={"fields": {"coverage": round(coverage, 2), "reused": reused}})
+
+    if not reused:
+        return {
+            "pool_reused": False,
+            "pool_coverage": coverage,
+        }
+
+    return {
+        "expanded_keywords": [],
+        "expanded_search_terms": [],
+        "intent_summary": state["query"].strip(),
+        "semantic_results": [],
+        "keyword_results": [],
+        "fused_results": pool,
+        "pool_reused": True,
+        "pool_coverage": coverage,
+        "status": "fused",
+        "error": None,
+        "error_stage": None,
+    }
+
+
+@timed_node("chat", "expand")
 async def expand_query_node(state: RetrievalState) -> RetrievalState:
     """
     Step 1: Expand query for lexical retrieval.
     Original query remains unchanged for semantic retrieval.
     """
-    print(f"[1/5] Expanding query: {state['query']}")
+    logger.debug("[1/6] Expanding query")
+
+    budget = stage_budget(
+        state,
+        settings.EXPANSION_BUDGET_SECONDS,
+        reserve=settings.ANSWER_RESERVE_SECONDS,
+    )
 
     try:
-        expansion = await QueryExpansionService.expand_query(state["query"])
+        degraded = state.get("degraded", [])
+
+        try:
+            if budget <= 0:
+                raise asyncio.TimeoutError()
+
+            expansion = await QueryExpansionService.expand_query(state["query"], timeout=budget)
+
+        except asyncio.TimeoutError:
+            # Same shape as QueryExpansionService's own failure fallback.
+            logger.warning("Query expansion skipped, no result within %.2fs", budget)
+            expansion = QueryExpansionResult(
+                keywords=[],
+                search_terms=[state["query"].strip()],
+                intent_summary=state["query"].strip(),
+            )
+            degraded = add_degraded(state, "expansion_skipped")
 
         return {
             "expanded_keywords": expansion.keywords,
             "expanded_search_terms": expansion.search_terms,
             "intent_summary": expansion.intent_summary,
+            "degraded": degraded,
             "status": "expanded",
             "error": None,
             "error_stage": None,
         }
 
     except Exception as e:
-        print(f"Query Expansion Error: {e}")
+        logger.exception("Query expansion failed")
         return {
             "status": "failed",
             "error": str(e),
@@ -69,49 +203,71 @@ async def expand_query_node(state: RetrievalState) -> RetrievalState:
         }
 
 
+@timed_node("chat", "retrieve")
 async def retrieve_node(state: RetrievalState) -> RetrievalState:
     """
     Step 2: Run semantic and keyword retrieval in parallel.
+    If only one side finishes within the budget, continue with that side.
     """
     if state.get("status") == "failed":
         return state
 
-    print(f"[2/5] Retrieving for user_id: {state['user_id']}")
+    logger.debug("[2/6] Retrieving", extra={"fields": {"user_id": state["user_id"]}})
+
+    budget = stage_budget(state, settings.RETRIEVAL_BUDGET_SECONDS)
+    timings: Dict[str, float] = {}
 
     try:
-        semantic_task = semantic_retriever.search(
-            query=state["query"],
-            user_id=state["user_id"],
-            document_id=state.get("document_id"),
-            source=state.get("source"),
-            top_k=10,
-        )
+        semantic_task = asyncio.ensure_future(timed("chat", "retrieve_semantic", _semantic_search(state), timings))
 
-        keyword_task = keyword_retriever.search(
+        keyword_task = asyncio.ensure_future(timed("chat", "retrieve_keyword", keyword_retriever.search(
             query=state["query"],
             user_id=state["user_id"],
             document_id=state.get("document_id"),
             source=state.get("source"),
-            top_k=10,
+            top_k=MMRService.candidate_pool_size(),
             expanded_keywords=state.get("expanded_keywords", []),
             expanded_search_terms=state.get("expanded_search_terms", []),
-        )
+        ), timings))
 
-        semantic_results, keyword_results = await __import__("asyncio").gather(
-            semantic_task,
-            keyword_task,
+        done, pending = await asyncio.wait(
+            [semantic_task, keyword_task],
+            timeout=budget if budget > 0 else 0.001,
         )
 
+        for task in pending:
+            task.cancel()
+
+        if not done:
+            raise asyncio.TimeoutError(f"Retrieval exceeded {budget:.2f}s budget")
+
+        degraded = state.get("degraded", [])
+
+        if semantic_task in pending:
+            degraded = add_degraded(state, "semantic_timeout")
+            semantic_results, query_vector = [], None
+        else:
+            semantic_results, query_vector = semantic_task.result()
+
+        if keyword_task in pending:
+            degraded = add_degraded({"degraded": degraded}, "keyword_timeout")
+            keyword_results = []
+        else:
+            keyword_results = keyword_task.result()
+
         return {
+            "query_vector": query_vector,
             "semantic_results": semantic_results,
             "keyword_results": keyword_results,
+            "degraded": degraded,
+            "timings": timings,
             "status": "retrieved",
             "error": None,
             "error_stage": None,
         }
 
     except Exception as e:
-        print(f"Retrieval Error: {e}")
+        logger.exception("Retrieval failed")
         return {
             "status": "failed",
             "error": str(e),
@@ -119,21 +275,117 @@ async def retrieve_node(state: RetrievalState) -> RetrievalState:
         }
 
 
+@timed_node("chat", "hybrid_retrieve")
+async def hybrid_retrieve_node(state: RetrievalState) -> RetrievalState:
+    """
+    Step 2-3 (elastic_hybrid engine): one Elasticsearch request running kNN
+    and BM25 together with ES-side rank fusion. Produces fused_results
+    directly, so the Chroma query and fuse step are skipped.
+    If it misses the budget, fall back to BM25 alone (or to no candidates).
+    """
+    if state.get("status") == "failed":
+        return state
+
+    logger.debug("[2/6] Hybrid retrieving in Elasticsearch", extra={"fields": {"user_id": state["user_id"]}})
+
+    budget = stage_budget(state, settings.RETRIEVAL_BUDGET_SECONDS)
+
+    try:
+        degraded = state.get("degraded", [])
+
+        try:
+            fused_results, query_vector = await asyncio.wait_for(
+                _hybrid_search(state),
+                timeout=budget if budget > 0 else 0.001,
+            )
+
+        except asyncio.TimeoutError:
+            logger.warning("Hybrid retrieval exceeded %.2fs budget, falling back to BM25", budget)
+            degraded = add_degraded(state, "hybrid_timeout")
+            fused_results, query_vector = await _keyword_fallback(state), None
+
+        return {
+            "query_vector": query_vector,
+            "semantic_results": [],
+            "keyword_results": [],
+            "fused_results": fused_results,
+            "degraded": degraded,
+            "status": "fused",
+            "error": None,
+            "error_stage": None,
+        }
+
+    except Exception as e:
+        logger.exception("Hybrid retrieval failed")
+        return {
+            "status": "failed",
+            "error": str(e),
+            "error_stage": "hybrid_retrieve",
+        }
+
+
+async def _keyword_fallback(state: RetrievalState) -> List[Dict[str, Any]]:
+    """
+    BM25-only candidates for when the hybrid request timed out, shaped like
+    fused results. Empty when there is no time left or BM25 misses too.
+    """
+    budget = stage_budget(
+        state,
+        settings.HYBRID_FALLBACK_BUDGET_SECONDS,
+        reserve=settings.ANSWER_RESERVE_SECONDS,
+    )
+    if budget <= 0:
+        return []
+
+    try:
+        keyword_results = await asyncio.wait_for(
+            keyword_retriever.search(
+                query=state["query"],
+                user_id=state["user_id"],
+                document_id=state.get("document_id"),
+                source=state.get("source"),
+                top_k=MMRService.candidate_pool_size(),
+                expanded_keywords=state.get("expanded_keywords", []),
+                expanded_search_terms=state.get("expanded_search_terms", []),
+            ),
+            timeout=budget,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("BM25 fallback exceeded %.2fs budget, continuing without candidates", budget)
+        return []
+
+    return FusionService.fuse(
+        ranked_lists={"keyword": keyword_results},
+        weights={"keyword": settings.FUSION_KEYWORD_WEIGHT},
+        method=settings.FUSION_METHOD,
+        rrf_k=settings.FUSION_RRF_K,
+        top_k=MMRService.candidate_pool_size(),
+    )
+
+
+@timed_node("chat", "fuse")
 async def fuse_node(state: RetrievalState) -> RetrievalState:
     """
-    Step 3: Fuse semantic and keyword results using Reciprocal Rank Fusion.
+    Step 3: Fuse semantic and keyword results (weighted RRF by default).
     """
     if state.get("status") == "failed":
         return state
 
-    print("[3/5] Fusing retrieval results...")
+    logger.debug("[3/6] Fusing retrieval results")
 
     try:
-        fused_results = FusionService.reciprocal_rank_fusion(
-            semantic_results=state.get("semantic_results", []),
-            keyword_results=state.get("keyword_results", []),
-            rrf_k=60,
-            top_k=10,
+        fused_results = FusionService.fuse(
+            ranked_lists={
+                "semantic": state.get("semantic_results", []),
+                "keyword": state.get("keyword_results", []),
+            },
+            weights={
+                "semantic": settings.FUSION_SEMANTIC_WEIGHT,
+                "keyword": settings.FUSION_KEYWORD_WEIGHT,
+            },
+            method=settings.FUSION_METHOD,
+            rrf_k=settings.FUSION_RRF_K,
+            top_k=MMRService.candidate_pool_size(),
         )
 
         return {
@@ -144,7 +396,7 @@ async def fuse_node(state: RetrievalState) -> RetrievalState:
         }
 
     except Exception as e:
-        print(f"Fusion Error: {e}")
+        logger.exception("Fusion failed")
         return {
             "status": "failed",
             "error": str(e),
@@ -152,32 +404,174 @@ async def fuse_node(state: RetrievalState) -> RetrievalState:
         }
 
 
+@timed_node("chat", "diversify")
+async def diversify_node(state: RetrievalState) -> RetrievalState:
+    """
+    Step 3b: Maximal marginal relevance over the fused pool, so MMR_TOP_K
+    diverse candidates (not several near-duplicate chunks) go on to
+    hydration and rerank. Out of budget, or on error, the fused order is
+    kept and simply cut to MMR_TOP_K.
+    """
+    if state.get("status") == "failed":
+        return state
+
+    fused_results = state.get("fused_results", [])
+    if not settings.MMR_ENABLED:
+        return {"mmr_displaced": 0}
+
+    logger.debug("[3/6] Diversifying fused results (MMR)")
+
+    budget = stage_budget(
+        state,
+        settings.MMR_BUDGET_SECONDS,
+        reserve=settings.ANSWER_RESERVE_SECONDS,
+    )
+
+    try:
+        if budget <= 0:
+            raise asyncio.TimeoutError()
+
+        diversified, displaced = await asyncio.wait_for(
+            MMRService.diversify(
+                query=state["query"],
+                candidates=fused_results,
+                user_id=state["user_id"],
+                top_k=settings.MMR_TOP_K,
+                lambda_mult=settings.MMR_LAMBDA,
+                query_vector=state.get("query_vector"),
+            ),
+            timeout=budget,
+        )
+
+        return {
+            "fused_results": diversified,
+            "mmr_displaced": displaced,
+        }
+
+    except asyncio.TimeoutError:
+        logger.warning("MMR skipped, no result within %.2fs; keeping fused order", budget)
+        return {
+            "fused_results": fused_results[:settings.MMR_TOP_K],
+            "mmr_displaced": 0,
+            "degraded": add_degraded(state, "mmr_skipped"),
+        }
+
+    except Exception:
+        logger.exception("MMR failed; keeping fused order")
+        return {
+            "fused_results": fused_results[:settings.MMR_TOP_K],
+            "mmr_displaced": 0,
+            "degraded": add_degraded(state, "mmr_failed"),
+        }
+
+
+@timed_node("chat", "hydrate")
+async def hydrate_node(state: RetrievalState) -> RetrievalState:
+    """
+    Step 4: Fetch full chunk text for the fused survivors in one batched lookup.
+    Retrievers only return ids, scores and small metadata.
+    Out of budget, chunk summaries stand in for the missing text.
+    """
+    if state.get("status") == "failed":
+        return state
+
+    logger.debug("[4/6] Hydrating fused results")
+
+    budget = stage_budget(
+        state,
+        settings.HYDRATION_BUDGET_SECONDS,
+        reserve=settings.ANSWER_RESERVE_SECONDS,
+    )
+
+    try:
+        degraded = state.get("degraded", [])
+
+        try:
+            if budget <= 0:
+                raise asyncio.TimeoutError()
+
+            fused_results = await asyncio.wait_for(
+                ChunkHydrationService.hydrate(
+                    chunks=state.get("fused_results", []),
+                    user_id=state["user_id"],
+                ),
+                timeout=budget,
+            )
+
+        except asyncio.TimeoutError:
+            logger.warning("Hydration skipped, no result within %.2fs; using summaries", budget)
+            fused_results = [
+                item if item.get("content") else {**item, "content": item.get("summary") or ""}
+                for item in state.get("fused_results", [])
+            ]
+            degraded = add_degraded(state, "hydration_skipped")
+
+        return {
+            "fused_results": fused_results,
+            "degraded": degraded,
+            "status": "hydrated",
+            "error": None,
+            "error_stage": None,
+        }
+
+    except Exception as e:
+        logger.exception("Hydration failed")
+        return {
+            "status": "failed",
+            "error": str(e),
+            "error_stage": "hydrate",
+        }
+
+
+@timed_node("chat", "rerank")
 async def rerank_node(state: RetrievalState) -> RetrievalState:
     """
-    Step 4: Rerank fused candidates using Cohere.
+    Step 5: Rerank fused candidates (Cohere unless another backend is selected).
+    Falls back to fused ordering when the backend fails or exceeds its budget.
     """
     if state.get("status") == "failed":
         return state
 
-    print("[4/5] Reranking fused results...")
+    logger.debug("[5/6] Reranking fused results")
+
+    budget = stage_budget(
+        state,
+        settings.RERANK_TIMEOUT_SECONDS,
+        reserve=settings.ANSWER_RESERVE_SECONDS,
+    )
+
+    query = state["query"]
+    if state.get("pool_reused"):
+        query = ChatSessionService.contextual_query(query, state.get("session_history", []))
 
     try:
-        reranked_results = RerankerService.rerank(
-            query=state["query"],
+        rerank_outcome = await RerankerService.rerank(
+            query=query,
             candidates=state.get("fused_results", []),
             top_k=5,
             use_summary=True,
+            timeout=budget,
+            backend=state.get("rerank_backend"),
+            user_id=state["user_id"],
         )
 
+        degraded = state.get("degraded", [])
+        if rerank_outcome["rerank_path"] in ("timeout_fallback", "deadline_skipped"):
+            degraded = add_degraded(state, "rerank_skipped")
+        elif rerank_outcome["rerank_path"] == "error_fallback":
+            degraded = add_degraded(state, "rerank_failed")
+
         return {
-            "reranked_results": reranked_results,
+            "reranked_results": rerank_outcome["results"],
+            "rerank_path": rerank_outcome["rerank_path"],
+            "degraded": degraded,
             "status": "reranked",
             "error": None,
             "error_stage": None,
         }
 
     except Exception as e:
-        print(f"Reranking Error: {e}")
+        logger.exception("Reranking failed")
         return {
             "status": "failed",
             "error": str(e),
@@ -185,31 +579,127 @@ async def rerank_node(state: RetrievalState) -> RetrievalState:
         }
 
 
-async def answer_node(state: RetrievalState) -> RetrievalState:
+@timed_node("chat", "expand_context")
+async def expand_context_node(state: RetrievalState) -> RetrievalState:
     """
-    Step 5: Generate final grounded answer from top reranked chunks.
+    Step 5b: Widen each reranked survivor with the chunks either side of it
+    in its document (CONTEXT_EXPANSION_WINDOW), fetched in one batched
+    lookup. Cheaper than retrieving and reranking more candidates.
+    Out of budget, the reranked chunks are used as they are.
     """
     if state.get("status") == "failed":
         return state
 
-    print("[5/5] Generating grounded answer...")
+    reranked_results = state.get("reranked_results", [])
+    if not settings.CONTEXT_EXPANSION_ENABLED or not reranked_results:
+        return {"context_added": 0}
+
+    logger.debug("[5/6] Expanding context around reranked chunks")
+
+    budget = stage_budget(
+        state,
+        settings.CONTEXT_EXPANSION_BUDGET_SECONDS,
+        reserve=settings.ANSWER_RESERVE_SECONDS,
+    )
 
     try:
-        final_answer = await AnswerService.generate_answer(
-            query=state["query"],
-            reranked_chunks=state.get("reranked_results", []),
-            top_k=5,
+        if budget <= 0:
+            raise asyncio.TimeoutError()
+
+        expanded, added = await asyncio.wait_for(
+            ChunkHydrationService.expand_with_neighbours(
+                chunks=reranked_results,
+                window=settings.CONTEXT_EXPANSION_WINDOW,
+                user_id=state["user_id"],
+            ),
+            timeout=budget,
         )
 
+        return {
+            "reranked_results": expanded,
+            "context_added": added,
+        }
+
+    except asyncio.TimeoutError:
+        logger.warning("Context expansion skipped, no result within %.2fs", budget)
+        return {
+            "context_added": 0,
+            "degraded": add_degraded(state, "context_expansion_skipped"),
+        }
+
+    except Exception:
+        # Expansion only widens evidence; never fail the request over it.
+        logger.exception("Context expansion failed")
+        return {"context_added": 0}
+
+
+@timed_node("chat", "answer")
+async def answer_node(state: RetrievalState) -> RetrievalState:
+    """
+    Step 6: Generate final grounded answer from top reranked chunks.
+    Short on time it answers from fewer chunks; out of time it returns an
+    extractive answer pointing at the top chunks.
+    """
+    if state.get("status") == "failed":
+        return state
+
+    logger.debug("[6/6] Generating grounded answer")
+
+    deadline = Deadline.from_state(state)
+    reranked_results = state.get("reranked_results", [])
+
+    try:
+        degraded = state.get("degraded", [])
+        top_k = 5
+        timeout = None
+
+        if deadline is not None:
+            timeout = deadline.remaining()
+
+            if timeout < settings.ANSWER_SHORTEN_BELOW_SECONDS:
+                top_k = settings.ANSWER_SHORT_TOP_K
+                degraded = add_degraded(state, "answer_shortened")
+
+        try:
+            if timeout is not None and timeout <= 0:
+                raise asyncio.TimeoutError()
+
+            final_answer = await AnswerService.generate_answer(
+                query=state["query"],
+                reranked_chunks=reranked_results,
+                top_k=top_k,
+                history=state.get("session_history"),
+                timeout=timeout,
+            )
+
+        except asyncio.TimeoutError:
+            logger.warning("Answer generation ran out of budget, returning top evidence")
+            final_answer = AnswerService.fallback_answer(
+                query=state["query"],
+                reranked_chunks=reranked_results,
+                top_k=settings.ANSWER_SHORT_TOP_K,
+            )
+            degraded = add_degraded({"degraded": degraded}, "answer_timeout")
+
+        except CircuitOpenError:
+            logger.warning("Gemini circuit open, returning top evidence")
+            final_answer = AnswerService.fallback_answer(
+                query=state["query"],
+                reranked_chunks=reranked_results,
+                top_k=settings.ANSWER_SHORT_TOP_K,
+            )
+            degraded = add_degraded({"degraded": degraded}, "answer_circuit_open")
+
         return {
             "final_answer": final_answer,
+            "degraded": degraded,
             "status": "completed",
             "error": None,
             "error_stage": None,
         }
 
     except Exception as e:
-        print(f"Answer Generation Error: {e}")
+        logger.exception("Answer generation failed")
         return {
             "status": "failed",
             "error": str(e),
@@ -217,19 +707,89 @@ async def answer_node(state: RetrievalState) -> RetrievalState:
         }
 
 
-workflow = StateGraph(RetrievalState)
+def route_entry(state: RetrievalState) -> str:
+    """
+    Session follow-ups with a cached candidate pool try the pool first.
+    """
+    if state.get("candidate_pool"):
+        return "reuse_pool"
+    return "expand_query"
+
+
+def route_after_pool_check(state: RetrievalState) -> str:
+    if state.get("pool_reused"):
+        return "diversify"
+    return "expand_query"
 
-workflow.add_node("expand_query", expand_query_node)
-workflow.add_node("retrieve", retrieve_node)
-workflow.add_node("fuse", fuse_node)
-workflow.add_node("rerank", rerank_node)
-workflow.add_node("answer", answer_node)
 
-workflow.add_edge(START, "expand_query")
-workflow.add_edge("expand_query", "retrieve")
-workflow.add_edge("retrieve", "fuse")
-workflow.add_edge("fuse", "rerank")
-workflow.add_edge("rerank", "answer")
-workflow.add_edge("answer", END)
+def route_retrieval_engine(state: RetrievalState) -> str:
+    """
+    Pick the retrieval path configured by RETRIEVAL_ENGINE.
+    """
+    if settings.RETRIEVAL_ENGINE == "elastic_hybrid":
+        return "hybrid_retrieve"
+    return "retrieve"
+
+
+def build_retrieval_workflow(include_answer: bool = True) -> StateGraph:
+    """
+    Build the retrieval workflow.
 
-retrieval_app = workflow.compile()
\ No newline at end of file
+    The streaming endpoint compiles it without the answer node so it can
+    stream Gemini tokens itself once the evidence stages have finished.
+    """
+    workflow = StateGraph(RetrievalState)
+
+    workflow.add_node("reuse_pool", reuse_pool_node)
+    workflow.add_node("expand_query", expand_query_node)
+    workflow.add_node("retrieve", retrieve_node)
+    workflow.add_node("hybrid_retrieve", hybrid_retrieve_node)
+    workflow.add_node("fuse", fuse_node)
+    workflow.add_node("diversify", diversify_node)
+    workflow.add_node("hydrate", hydrate_node)
+    workflow.add_node("rerank", rerank_node)
+    workflow.add_node("expand_context", expand_context_node)
+
+    workflow.add_conditional_edges(
+        START,
+        route_entry,
+        {
+            "reuse_pool": "reuse_pool",
+            "expand_query": "expand_query",
+        }
+    )
+    workflow.add_conditional_edges(
+        "reuse_pool",
+        route_after_pool_check,
+        {
+            "diversify": "diversify",
+            "expand_query": "expand_query",
+        }
+    )
+    workflow.add_conditional_edges(
+        "expand_query",
+        route_retrieval_engine,
+        {
+            "retrieve": "retrieve",
+            "hybrid_retrieve": "hybrid_retrieve",
+        }
+    )
+    workflow.add_edge("retrieve", "fuse")
+    workflow.add_edge("hybrid_retrieve", "diversify")
+    workflow.add_edge("fuse", "diversify")
+    workflow.add_edge("diversify", "hydrate")
+    workflow.add_edge("hydrate", "rerank")
+    workflow.add_edge("rerank", "expand_context")
+
+    if include_answer:
+        workflow.add_node("answer", answer_node)
+        workflow.add_edge("expand_context", "answer")
+        workflow.add_edge("answer", END)
+    else:
+        workflow.add_edge("expand_context", END)
+
+    return workflow
+
+
+retrieval_app = build_retrieval_workflow().compile()
+evidence_app = build_retrieval_workflow(include_answer=False).compile()
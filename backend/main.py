@@ -1,27 +1,48 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from backend.config import settings
 # Updated imports to use your new Bus singletons
 from backend.clients.supabase_client import supabase_bus
 from backend.clients.elastic_search_client import elastic_bus
 from backend.clients.chroma_client import chroma_bus
+from backend.clients.http_pool import http_pools
+from backend.utils.bounded_executor import vector_executor
+from backend.utils.logging_setup import logging_manager
+from backend.utils.tracing import tracing_stats
+from backend.utils.request_context import RequestContextMiddleware
+from backend.services.warmup_service import WarmupService, warmup_state
+from backend.services.health_service import health_service
+from backend.services.chunk_hydration_service import chunk_cache
+from backend.utils.metrics import (
+    render_metrics,
+    executor_gauges,
+    dependency_gauges,
+    http_pool_gauges,
+    chunk_cache_gauges,
+)
 
 from backend.routers.upload import upload_router
 from backend.routers.ingest import ingest_router
+from backend.routers.chat import router as chat_router
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# Setup logging: structured records written by a background thread
+logging_manager.configure()
+logger = logging.getLogger("coeus_ai.main")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Manages the application lifecycle using the Bus pattern.
     """
+    warmup_task = None
+
     try:
         logger.info("--- SYSTEM BOOT SEQUENCE STARTED ---")
 
@@ -35,6 +56,13 @@ async def lifespan(app: FastAPI):
         await chroma_bus.connect()
         # Ensure a collection exists to verify disk/memory access
         chroma_bus.get_collection("startup_healthcheck")
+
+        # 4. Warm-up in the background: the server accepts connections now,
+        # /ready turns green once models and prompts are loaded.
+        if settings.WARMUP_ENABLED:
+            warmup_task = asyncio.create_task(WarmupService.run())
+        else:
+            warmup_state.mark_ready()
         
         logger.info("--- ALL SYSTEMS OPERATIONAL: COEUIS AI IS ONLINE ---")
         
@@ -48,11 +76,16 @@ async def lifespan(app: FastAPI):
 
     finally:
         logger.info("--- INITIATING GRACEFUL SHUTDOWN ---")
+        if warmup_task and not warmup_task.done():
+            warmup_task.cancel()
         # Standardized cleanup for all services
         await elastic_bus.close()
         await supabase_bus.close()
         await chroma_bus.close()
+        await http_pools.aclose()
+        vector_executor.shutdown()
         logger.info("--- SHUTDOWN COMPLETE ---")
+        logging_manager.shutdown()
 
 
 app = FastAPI(
@@ -68,22 +101,82 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[settings.REQUEST_ID_HEADER],
 )
+app.add_middleware(RequestContextMiddleware)
+
+if settings.RESPONSE_GZIP_ENABLED:
+    # Streamed NDJSON / SSE must reach the client line by line, never buffered.
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.RESPONSE_GZIP_MIN_SIZE,
+        exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/x-ndjson",),
+    )
+
+@app.get("/live", tags=["Health"])
+async def liveness_check() -> JSONResponse:
+    """
+    The process is up and its event loop answers. No dependency checks:
+    a backend outage should pull the instance from rotation, not restart it.
+    """
+    return JSONResponse(status_code=status.HTTP_200_OK, content={"status": "alive"})
+
+@app.get("/ready", tags=["Health"])
+async def readiness_check() -> JSONResponse:
+    """
+    200 only once warm-up has finished and every critical dependency
+    answered its (cached) probe.
+    """
+    report = await health_service.report()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if report["ready"] else "not_ready",
+            "dependencies": {
+                name: result["status"] for name, result in report["dependencies"].items()
+            },
+            "warmup": report["warmup"]["status"],
+        },
+    )
 
 @app.get("/health", tags=["Health"])
 async def health_check() -> JSONResponse:
+    """
+    Full probe report: per dependency status and latency, LLM circuit
+    states, warm-up progress and executor stats.
+    """
+    report = await health_service.report()
     return JSONResponse(
-        status_code=status.HTTP_200_OK,
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE if report["status"] == "down" else status.HTTP_200_OK,
         content={
-            "status": "online",
-            "services": {
-                "supabase": "connected",
-                "elasticsearch": "connected",
-                "chromadb": "connected"
-            }
+            **report,
+            "executors": {
+                "vector": vector_executor.stats(),
+            },
+            "http_pools": http_pools.stats(),
+            "chunk_cache": chunk_cache.stats(),
+            "chroma_collections": chroma_bus.collection_stats(),
+            "logging": logging_manager.stats(),
+            "tracing": tracing_stats.snapshot(),
         }
     )
 
+@app.get("/metrics", tags=["Health"])
+async def metrics() -> PlainTextResponse:
+    """
+    Stage / request latency histograms, executor, HTTP pool and chunk cache counters and gauges, and
+    the last cached health probe results in the Prometheus text exposition format.
+    """
+    gauges = (
+        executor_gauges(vector_executor.stats())
+        + http_pool_gauges(http_pools.stats())
+        + chunk_cache_gauges(chunk_cache.stats())
+        + dependency_gauges(health_service.last_report)
+    )
+    body = render_metrics() + "\n".join(gauges) + "\n"
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Include separate logic modules
 app.include_router(upload_router)
-app.include_router(ingest_router)
\ No newline at end of file
+app.include_router(ingest_router)
+app.include_router(chat_router)
\ No newline at end of file
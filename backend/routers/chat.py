@@ -1,9 +1,22 @@
-from typing import Optional, List, Dict, Any
+import asyncio
+import json
+import time
+from typing import Optional, List, Dict, Any, AsyncIterator, Literal
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 
-from backend.graphs.retrieval_graph import retrieval_app
+from backend.config import settings
+from backend.graphs.retrieval_graph import retrieval_app, evidence_app
+from backend.services.answer_service import AnswerService
+from backend.services.batch_question_service import BatchQuestionService
+from backend.services.chat_session_service import ChatSessionService, ChatSession
+from backend.services.rerank_backends import CrossEncoderRerankBackend
+from backend.utils.circuit_breaker import CircuitOpenError
+from backend.utils.deadline import Deadline, add_degraded
+from backend.utils.metrics import request_duration, merge_timings
+from backend.utils.tracing import traced
 
 
 router = APIRouter(prefix="/api/v1/chat", tags=["Chat"])
@@ -14,22 +27,72 @@ class ChatRequest(BaseModel):
     query: str = Field(..., min_length=1, description="User question")
     document_id: Optional[str] = Field(default=None, description="Optional document filter")
     source: Optional[str] = Field(default=None, description="Optional source/file filter")
+    rerank_backend: Optional[Literal["cohere", "cross_encoder", "embedding"]] = Field(
+        default=None,
+        description="Optional reranker override, defaults to RERANK_BACKEND",
+    )
+    timeout_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        le=120,
+        description="Optional latency budget, defaults to CHAT_REQUEST_BUDGET_SECONDS",
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Chat session from POST /sessions; omit for a stateless question",
+    )
+    verbosity: Literal["answer", "citations", "debug"] = Field(
+        default="citations",
+        description=(
+            "answer: answer text only; citations: answer with used chunk refs; "
+            "debug: every intermediate result list and stage timings"
+        ),
+    )
+
+
+class ChatSessionRequest(BaseModel):
+    user_id: str = Field(..., description="User ID owning the session")
+
+
+class BatchChatRequest(BaseModel):
+    user_id: str = Field(..., description="User ID owning the indexed documents")
+    questions: List[str] = Field(..., min_length=1, max_length=1000, description="Questions to answer")
+    document_id: Optional[str] = Field(default=None, description="Optional document filter")
+    source: Optional[str] = Field(default=None, description="Optional source/file filter")
+    concurrency: int = Field(default=4, ge=1, le=32, description="Max concurrent LLM / rerank calls")
+    expand_queries: bool = Field(default=True, description="Run Groq query expansion per question")
+    rerank_backend: Optional[Literal["cohere", "cross_encoder", "embedding"]] = Field(
+        default=None,
+        description="Optional reranker override, defaults to RERANK_BACKEND",
+    )
 
 
 class ChatResponse(BaseModel):
+    """
+    Schema of /ask in the OpenAPI docs only: the handler returns a
+    pre-serialized body (see _build_chat_response), not this model.
+
+    Fields after error_stage are only filled at the matching verbosity:
+    citations adds intent_summary / rerank_path, debug adds the rest.
+    """
     query: str
     user_id: str
     status: str
     answer: Dict[str, Any]
-    expanded_keywords: List[str]
-    expanded_search_terms: List[str]
-    intent_summary: str
-    semantic_results: List[Dict[str, Any]]
-    keyword_results: List[Dict[str, Any]]
-    fused_results: List[Dict[str, Any]]
-    reranked_results: List[Dict[str, Any]]
+    session_id: Optional[str] = None
+    degraded: List[str] = Field(default_factory=list)
     error: Optional[str] = None
     error_stage: Optional[str] = None
+    intent_summary: Optional[str] = None
+    rerank_path: Optional[str] = None
+    pool_reused: Optional[bool] = None
+    expanded_keywords: Optional[List[str]] = None
+    expanded_search_terms: Optional[List[str]] = None
+    semantic_results: Optional[List[Dict[str, Any]]] = None
+    keyword_results: Optional[List[Dict[str, Any]]] = None
+    fused_results: Optional[List[Dict[str, Any]]] = None
+    reranked_results: Optional[List[Dict[str, Any]]] = None
+    timings: Optional[Dict[str, float]] = None
 
 
 @router.get("/health")
@@ -37,34 +100,444 @@ async def chat_health():
     return {"message": "Chat router is working"}
 
 
-@router.post("/ask", response_model=ChatResponse)
+@router.post("/sessions")
+async def create_session(payload: ChatSessionRequest):
+    """
+    Start a multi-turn chat session; pass its id as session_id to /ask.
+    """
+    session = ChatSessionService.get_or_create(None, payload.user_id)
+    return {"session_id": session.session_id, "user_id": payload.user_id}
+
+
+def _check_rerank_backend(rerank_backend: Optional[str]) -> None:
+    """
+    Reject a cross_encoder override the warm-up did not load: loading it
+    inside the rerank budget would only time out into the fused order.
+    """
+    if (
+        rerank_backend == "cross_encoder"
+        and rerank_backend != settings.RERANK_BACKEND
+        and not CrossEncoderRerankBackend.loaded()
+    ):
+        raise HTTPException(
+            status_code=422,
+            detail="rerank_backend 'cross_encoder' is not loaded on this instance (see WARMUP_RERANK_MODEL).",
+        )
+
+
+def _resolve_session(payload: ChatRequest) -> Optional[ChatSession]:
+    if not payload.session_id:
+        return None
+    return ChatSessionService.get_or_create(payload.session_id, payload.user_id)
+
+
+def _initial_state(payload: ChatRequest, session: Optional[ChatSession] = None) -> Dict[str, Any]:
+    """
+    Graph input for one chat request, including its deadline and, for
+    session follow-ups, the earlier turns and reusable candidate pool.
+    """
+    budget = payload.timeout_seconds or settings.CHAT_REQUEST_BUDGET_SECONDS
+
+    state: Dict[str, Any] = {
+        "query": payload.query,
+        "user_id": payload.user_id,
+        "document_id": payload.document_id,
+        "source": payload.source,
+        "rerank_backend": payload.rerank_backend,
+        "deadline_at": Deadline.after(budget).expires_at,
+        "degraded": [],
+    }
+
+    if session is not None:
+        state["session_history"] = ChatSessionService.history(session)
+        state["candidate_pool"] = ChatSessionService.reusable_pool(
+            session,
+            document_id=payload.document_id,
+            source=payload.source,
+        )
+
+    return state
+
+
+def _record_session_turn(
+    session: Optional[ChatSession],
+    payload: ChatRequest,
+    state: Dict[str, Any],
+    final_answer: Dict[str, Any],
+) -> None:
+    if session is None or state.get("status") == "failed":
+        return
+
+    ChatSessionService.record_turn(
+        session,
+        query=payload.query,
+        answer=final_answer.get("answer", ""),
+        candidates=state.get("fused_results", []),
+        document_id=payload.document_id,
+        source=payload.source,
+    )
+
+
+def _build_chat_response(
+    payload: ChatRequest,
+    result: Dict[str, Any],
+    timings: Dict[str, float],
+    session: Optional[ChatSession] = None,
+) -> Dict[str, Any]:
+    """
+    Shape the graph result for the requested verbosity.
+
+    Built as a plain dict and serialized with orjson: the debug lists hold
+    dozens of chunk bodies, and re-validating them through Pydantic on the
+    way out costs more than the dump itself.
+    """
+    final_answer = result.get("final_answer", {})
+
+    response: Dict[str, Any] = {
+        "query": payload.query,
+        "user_id": payload.user_id,
+        "status": result.get("status", "unknown"),
+        "answer": final_answer,
+        "session_id": session.session_id if session is not None else None,
+        "degraded": result.get("degraded", []),
+        "error": result.get("error"),
+        "error_stage": result.get("error_stage"),
+    }
+
+    if payload.verbosity == "answer":
+        response["answer"] = {"answer": final_answer.get("answer", "")} if final_answer else {}
+        return response
+
+    response["intent_summary"] = result.get("intent_summary", "")
+    response["rerank_path"] = result.get("rerank_path")
+    response["pool_reused"] = result.get("pool_reused", False)
+
+    if payload.verbosity == "debug":
+        response.update({
+            "expanded_keywords": result.get("expanded_keywords", []),
+            "expanded_search_terms": result.get("expanded_search_terms", []),
+            "semantic_results": result.get("semantic_results", []),
+            "keyword_results": result.get("keyword_results", []),
+            "fused_results": result.get("fused_results", []),
+            "reranked_results": result.get("reranked_results", []),
+            "timings": timings,
+        })
+
+    return response
+
+
+@router.post("/ask", response_class=ORJSONResponse, responses={200: {"model": ChatResponse}})
+@traced(name="API: Chat Ask", run_type="chain", route="api.chat")
 async def ask_question(payload: ChatRequest):
+    _check_rerank_backend(payload.rerank_backend)
+
+    started = time.perf_counter()
+    status = "error"
+
     try:
-        result = await retrieval_app.ainvoke({
+        session = _resolve_session(payload)
+
+        result = await retrieval_app.ainvoke(_initial_state(payload, session))
+        elapsed = time.perf_counter() - started
+        status = result.get("status", "unknown")
+
+        timings = dict(result.get("timings") or {})
+        timings["total"] = round(elapsed * 1000, 3)
+
+        _record_session_turn(session, payload, result, result.get("final_answer", {}))
+
+        return ORJSONResponse(_build_chat_response(payload, result, timings, session))
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Chat pipeline failed: {str(e)}"
+        )
+
+    finally:
+        request_duration.observe(time.perf_counter() - started, pipeline="chat", status=status)
+
+
+# -----------------------------
+# Streaming (Server-Sent Events)
+# -----------------------------
+
+STAGE_EVENTS = {
+    "reuse_pool": "pool_checked",
+    "expand_query": "expanded",
+    "retrieve": "retrieved",
+    "hybrid_retrieve": "retrieved",
+    "fuse": "fused",
+    "diversify": "diversified",
+    "rerank": "reranked",
+    "expand_context": "context_expanded",
+}
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _chunk_refs(items: List[Dict[str, Any]], score_field: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "chunk_id": item.get("chunk_id"),
+            "document_id": item.get("document_id"),
+            "source": item.get("source"),
+            "page": item.get("page"),
+            score_field: item.get(score_field),
+        }
+        for item in items
+    ]
+
+
+def _stage_payload(node_name: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Keep stage events small: ids and scores only, never chunk bodies.
+    """
+    if node_name == "reuse_pool":
+        return {
+            "pool_reused": state.get("pool_reused", False),
+            "pool_coverage": state.get("pool_coverage", 0.0),
+        }
+
+    if node_name == "expand_query":
+        return {
+            "expanded_keywords": state.get("expanded_keywords", []),
+            "expanded_search_terms": state.get("expanded_search_terms", []),
+            "intent_summary": state.get("intent_summary", ""),
+        }
+
+    if node_name == "retrieve":
+        return {
+            "semantic_count": len(state.get("semantic_results", [])),
+            "keyword_count": len(state.get("keyword_results", [])),
+        }
+
+    if node_name == "hybrid_retrieve":
+        return {
+            "engine": "elastic_hybrid",
+            "fused_results": _chunk_refs(state.get("fused_results", []), "fused_score"),
+        }
+
+    if node_name == "fuse":
+        return {"fused_results": _chunk_refs(state.get("fused_results", []), "fused_score")}
+
+    if node_name == "diversify":
+        return {
+            "mmr_displaced": state.get("mmr_displaced", 0),
+            "fused_results": _chunk_refs(state.get("fused_results", []), "fused_score"),
+        }
+
+    if node_name == "rerank":
+        return {
+            "rerank_path": state.get("rerank_path"),
+            "reranked_results": _chunk_refs(state.get("reranked_results", []), "rerank_score"),
+        }
+
+    if node_name == "expand_context":
+        return {"context_added": state.get("context_added", 0)}
+
+    return {}
+
+
+async def _stream_chat_events(payload: ChatRequest) -> AsyncIterator[str]:
+    started = time.perf_counter()
+    outcome = "error"
+    state: Dict[str, Any] = {}
+
+    try:
+        session = _resolve_session(payload)
+        state = _initial_state(payload, session)
+
+        async for update in evidence_app.astream(dict(state), stream_mode="updates"):
+            for node_name, node_update in update.items():
+                node_update = dict(node_update or {})
+                node_update["timings"] = merge_timings(state.get("timings"), node_update.get("timings"))
+                state.update(node_update)
+
+                if state.get("status") == "failed":
+                    outcome = "failed"
+                    yield _sse_event("error", {
+                        "status": "failed",
+                        "error": state.get("error"),
+                        "error_stage": state.get("error_stage"),
+                    })
+                    return
+
+                if node_name not in STAGE_EVENTS:
+                    continue
+
+                yield _sse_event(
+                    STAGE_EVENTS[node_name],
+                    _stage_payload(node_name, state),
+                )
+
+        final_answer: Dict[str, Any] = {}
+        degraded = state.get("degraded", [])
+        status = "completed"
+        streamed = False
+
+        # Same deadline rules as answer_node: fewer chunks when short on
+        # time, and the extractive fallback once the time is up.
+        deadline = Deadline.from_state(state)
+        remaining = deadline.remaining() if deadline is not None else None
+        top_k = 5
+
+        if remaining is not None and remaining < settings.ANSWER_SHORTEN_BELOW_SECONDS:
+            top_k = settings.ANSWER_SHORT_TOP_K
+            degraded = add_degraded(state, "answer_shortened")
+
+        try:
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError()
+
+            # The stream is bounded inside the Gemini breaker, so a stall
+            # also counts against it.
+            async for event in AnswerService.stream_answer(
+                query=payload.query,
+                reranked_chunks=state.get("reranked_results", []),
+                top_k=top_k,
+                history=state.get("session_history"),
+                timeout=remaining,
+            ):
+                if event["type"] == "token":
+                    streamed = True
+                    yield _sse_event("token", {"text": event["text"]})
+                else:
+                    final_answer = event["answer"]
+
+        except TimeoutError:
+            # Tokens already sent are superseded by the answer in `done`.
+            final_answer = AnswerService.fallback_answer(
+                query=payload.query,
+                reranked_chunks=state.get("reranked_results", []),
+                top_k=settings.ANSWER_SHORT_TOP_K,
+            )
+            degraded = add_degraded({"degraded": degraded}, "answer_timeout")
+            status = "degraded"
+            if not streamed:
+                yield _sse_event("token", {"text": final_answer["answer"]})
+
+        except CircuitOpenError:
+            # Raised before the first token, so the client sees only this.
+            final_answer = AnswerService.fallback_answer(
+                query=payload.query,
+                reranked_chunks=state.get("reranked_results", []),
+                top_k=settings.ANSWER_SHORT_TOP_K,
+            )
+            degraded = add_degraded({"degraded": degraded}, "answer_circuit_open")
+            yield _sse_event("token", {"text": final_answer["answer"]})
+
+        _record_session_turn(session, payload, state, final_answer)
+
+        outcome = status
+        yield _sse_event("done", {
             "query": payload.query,
             "user_id": payload.user_id,
-            "document_id": payload.document_id,
-            "source": payload.source,
+            "status": status,
+            "answer": final_answer,
+            "session_id": session.session_id if session is not None else None,
+            "pool_reused": state.get("pool_reused", False),
+            "degraded": degraded,
+            "timings": state.get("timings", {}),
         })
 
-        return ChatResponse(
-            query=payload.query,
-            user_id=payload.user_id,
-            status=result.get("status", "unknown"),
-            answer=result.get("final_answer", {}),
-            expanded_keywords=result.get("expanded_keywords", []),
-            expanded_search_terms=result.get("expanded_search_terms", []),
-            intent_summary=result.get("intent_summary", ""),
-            semantic_results=result.get("semantic_results", []),
-            keyword_results=result.get("keyword_results", []),
-            fused_results=result.get("fused_results", []),
-            reranked_results=result.get("reranked_results", []),
-            error=result.get("error"),
-            error_stage=result.get("error_stage"),
-        )
+    except (asyncio.CancelledError, GeneratorExit):
+        # Client went away mid-stream.
+        outcome = "cancelled"
+        raise
 
     except Exception as e:
+        outcome = "error"
+        yield _sse_event("error", {
+            "status": "failed",
+            "error": str(e),
+            "error_stage": state.get("error_stage") or "answer",
+        })
+
+    finally:
+        request_duration.observe(time.perf_counter() - started, pipeline="chat_stream", status=outcome)
+
+
+@router.post("/ask/stream")
+async def ask_question_stream(payload: ChatRequest):
+    """
+    Same pipeline as /ask, streamed as Server-Sent Events.
+
+    Emits expanded, retrieved, fused and reranked stage events, then one
+    token event per Gemini delta and a final done event with the answer
+    (status "degraded" with an extractive answer if the deadline hits first).
+    """
+    _check_rerank_backend(payload.rerank_backend)
+
+    return StreamingResponse(
+        _stream_chat_events(payload),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+
+# -----------------------------
+# Batch questions (NDJSON stream)
+# -----------------------------
+
+async def _stream_batch_results(payload: BatchChatRequest) -> AsyncIterator[str]:
+    started = time.perf_counter()
+    outcome = "error"
+    failed = 0
+
+    try:
+        async for result in BatchQuestionService.answer_questions(
+            questions=[question.strip() for question in payload.questions],
+            user_id=payload.user_id,
+            document_id=payload.document_id,
+            source=payload.source,
+            concurrency=payload.concurrency,
+            expand_queries=payload.expand_queries,
+            rerank_backend=payload.rerank_backend,
+        ):
+            if result.get("status") == "failed":
+                failed += 1
+            yield json.dumps(result, default=str) + "\n"
+
+        # "partial" when some questions failed, "failed" when all did.
+        if not failed:
+            outcome = "completed"
+        elif failed < len(payload.questions):
+            outcome = "partial"
+        else:
+            outcome = "failed"
+
+    except (asyncio.CancelledError, GeneratorExit):
+        outcome = "cancelled"
+        raise
+
+    finally:
+        request_duration.observe(time.perf_counter() - started, pipeline="chat_batch", status=outcome)
+
+
+@router.post("/ask/batch")
+async def ask_questions_batch(payload: BatchChatRequest):
+    """
+    Answer N questions with batched retrieval.
+
+    Streams one JSON object per line as each question completes; use the
+    "index" field to map results back to the request order.
+    """
+    if any(not question.strip() for question in payload.questions):
         raise HTTPException(
-            status_code=500,
-            detail=f"Chat pipeline failed: {str(e)}"
-        )
\ No newline at end of file
+            status_code=422,
+            detail="Questions must not be empty."
+        )
+
+    _check_rerank_backend(payload.rerank_backend)
+
+    return StreamingResponse(
+        _stream_batch_results(payload),
+        media_type="application/x-ndjson",
+    )
@@ -1,4 +1,5 @@
 import logging
+import time
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
@@ -7,11 +8,14 @@ from backend.graphs.ingestion_graph import ingestion_app
 from backend.schemas.models import IngestRequestModel
 # Updated Import: Using the new Singleton Bus
 from backend.clients.supabase_client import supabase_bus
+from backend.utils.metrics import request_duration
+from backend.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 ingest_router = APIRouter()
 
 @ingest_router.post("/api/v1/ingest")
+@traced(name="API: Run Ingestion", run_type="chain", route="api.ingest")
 async def run_ingestion(request: IngestRequestModel):
     try:
         # UPDATED: Get the managed client from our singleton bus
@@ -64,6 +68,7 @@ async def run_ingestion(request: IngestRequestModel):
         }
 
         # Invoke the graph with LangSmith tracing and persistence configuration
+        started = time.perf_counter()
         graph_result = await ingestion_app.ainvoke(
             graph_initial_state,
             config={
@@ -86,6 +91,11 @@ async def run_ingestion(request: IngestRequestModel):
                 },
             },
         )
+        elapsed = time.perf_counter() - started
+
+        request_duration.observe(elapsed, pipeline="ingestion", status=graph_result.get("status", "unknown"))
+        timings = dict(graph_result.get("timings") or {})
+        timings["total"] = round(elapsed * 1000, 3)
 
         # 4. ERROR HANDLING (Graph Level)
         if graph_result.get("status") == "failed":
@@ -99,6 +109,7 @@ async def run_ingestion(request: IngestRequestModel):
                     "current_stage": job_status,
                     "error": graph_result.get("error"),
                     "error_stage": graph_result.get("error_stage"),
+                    "timings": timings,
                 }
             )
 
@@ -116,6 +127,7 @@ async def run_ingestion(request: IngestRequestModel):
                 "elastic_count": graph_result.get("elastic_count", 0),
                 "error": graph_result.get("error"),
                 "error_stage": graph_result.get("error_stage"),
+                "timings": timings,
             }
         )
 
@@ -3,8 +3,7 @@ from typing import Optional, List, Any, Dict
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
-# 1. Import traceable from LangSmith
-from langsmith import traceable 
+from backend.utils.tracing import traced
 
 from backend.services.keyword_retriever import KeywordRetriever
 from backend.services.semantic_retriever import SemanticRetriever
@@ -70,7 +69,7 @@ def retrieval_health():
 # -----------------------------
 
 @router.post("/keyword", response_model=RetrievalResponse)
-@traceable(name="API: Keyword Search", run_type="retriever") # 2. Add the decorator here
+@traced(name="API: Keyword Search", run_type="retriever", route="api.retrieve")
 async def retrieve_keyword(payload: RetrievalRequest):
     try:
         results = await keyword_retriever.search(
@@ -79,6 +78,7 @@ async def retrieve_keyword(payload: RetrievalRequest):
             document_id=payload.document_id,
             source=payload.source,
             top_k=payload.top_k,
+            include_content=True,
         )
 
         return RetrievalResponse(
@@ -99,7 +99,7 @@ async def retrieve_keyword(payload: RetrievalRequest):
 # -----------------------------
 
 @router.post("/semantic", response_model=RetrievalResponse)
-@traceable(name="API: Semantic Search", run_type="retriever") # 3. And add it here!
+@traced(name="API: Semantic Search", run_type="retriever", route="api.retrieve")
 async def retrieve_semantic(payload: RetrievalRequest):
     try:
         results = await semantic_retriever.search(
@@ -108,6 +108,7 @@ async def retrieve_semantic(payload: RetrievalRequest):
             document_id=payload.document_id,
             source=payload.source,
             top_k=payload.top_k,
+            include_content=True,
         )
 
         return RetrievalResponse(
@@ -4,6 +4,9 @@ import uuid
 from fastapi import APIRouter, HTTPException, status
 from backend.schemas.users_model import UserCreate
 from backend.clients.supabase_client import get_supabase_client
+from backend.utils.logging_setup import get_logger
+
+logger = get_logger("user_router")
 
 user_router = APIRouter(
     prefix="/users",
@@ -61,8 +64,8 @@ async def create_user(user_data: UserCreate):
 
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error saving user: {e}")
+    except Exception:
+        logger.exception("Error saving user")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while saving user data."
@@ -0,0 +1,139 @@
+"""
+Add the `embedding` field to Elasticsearch chunks indexed without one, so
+the elastic_hybrid engine's kNN side covers chunks ingested before it (or
+ELASTIC_STORE_EMBEDDINGS) was switched on.
+
+Scans every chunk index of the current layout (ElasticRouting) for docs
+missing `embedding`, takes each chunk's vector from Chroma where it is
+stored and embeds only the rest, then writes them back with partial
+updates (same index and routing as the doc). Re-running is safe: chunks
+that already have a vector are skipped by the scan.
+
+Usage:
+    python -m backend.scripts.backfill_elastic_embeddings --dry-run
+    python -m backend.scripts.backfill_elastic_embeddings --batch-size 200
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Dict, Any
+
+from elasticsearch import helpers
+
+from backend.clients.chroma_client import chroma_bus
+from backend.clients.elastic_search_client import elastic_bus
+from backend.services.elastic_routing import ElasticRouting
+from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.services.ingestion.keyword_insertion_service import ElasticService
+
+MISSING_EMBEDDING_QUERY = {"query": {"bool": {"must_not": [{"exists": {"field": "embedding"}}]}}}
+
+
+async def backfill_batch(client, hits: List[Dict[str, Any]], report: Dict[str, Any], dry_run: bool) -> None:
+    # Vectors are looked up per user: Chroma collections are per tenant.
+    by_user: Dict[str, List[Dict[str, Any]]] = {}
+    for hit in hits:
+        user_id = hit.get("_source", {}).get("user_id")
+        if not user_id:
+            report["missing_user_id"] += 1
+            continue
+        by_user.setdefault(user_id, []).append(hit)
+
+    actions: List[Dict[str, Any]] = []
+    for user_id, user_hits in by_user.items():
+        stored = EmbeddingService.stored_embeddings(user_id, [hit["_id"] for hit in user_hits])
+        missing = [hit for hit in user_hits if hit["_id"] not in stored]
+        report["from_chroma"] += len(user_hits) - len(missing)
+        report["embedded"] += len(missing)
+
+        if dry_run:
+            continue
+
+        fresh = EmbeddingService.embed_texts([hit.get("_source", {}).get("content") or "" for hit in missing])
+        vectors = {chunk_id: list(map(float, vector)) for chunk_id, vector in stored.items()}
+        vectors.update(zip((hit["_id"] for hit in missing), fresh))
+
+        for hit in user_hits:
+            action: Dict[str, Any] = {
+                "_op_type": "update",
+                "_index": hit["_index"],
+                "_id": hit["_id"],
+                "doc": {"embedding": vectors[hit["_id"]]},
+            }
+            if hit.get("_routing"):
+                action["routing"] = hit["_routing"]
+            actions.append(action)
+
+    if actions:
+        updated, errors = await helpers.async_bulk(client, actions, raise_on_error=False)
+        report["updated"] += updated
+        report["errors"] += len(errors)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    await chroma_bus.connect()
+    await elastic_bus.connect()
+    client = elastic_bus.get_client()
+
+    started = time.perf_counter()
+    report: Dict[str, Any] = {
+        "dry_run": args.dry_run,
+        "indexes": [],
+        "scanned": 0,
+        "from_chroma": 0,
+        "embedded": 0,
+        "updated": 0,
+        "errors": 0,
+        "missing_user_id": 0,
+    }
+
+    try:
+        for index_name in ElasticRouting.all_indices():
+            if not await client.indices.exists(index=index_name):
+                continue
+            report["indexes"].append(index_name)
+
+            if not args.dry_run:
+                await ElasticService.ensure_embedding_mapping(index_name)
+
+            # The scroll reads a snapshot, so updating batch by batch while
+            # scanning neither skips nor repeats chunks.
+            hits: List[Dict[str, Any]] = []
+            async for hit in helpers.async_scan(
+                client,
+                index=index_name,
+                query=MISSING_EMBEDDING_QUERY,
+                size=args.batch_size,
+            ):
+                report["scanned"] += 1
+                hits.append(hit)
+
+                if len(hits) >= args.batch_size:
+                    await backfill_batch(client, hits, report, args.dry_run)
+                    hits = []
+
+            await backfill_batch(client, hits, report, args.dry_run)
+
+            if not args.dry_run:
+                await client.indices.refresh(index=index_name)
+
+    finally:
+        await elastic_bus.close()
+        await chroma_bus.close()
+
+    report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill chunk embeddings into Elasticsearch for elastic_hybrid.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Count what would be backfilled; write nothing")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
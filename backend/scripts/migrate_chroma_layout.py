@@ -0,0 +1,242 @@
+"""
+Copy Chroma vectors between the per_user and sharded layouts (CHROMA_LAYOUT).
+
+Reads every collection of the other layout page by page, resolves the
+owner of each vector (its user_id metadata, else the owning document in
+Supabase) and upserts the stored embeddings, documents and metadata into
+the owner's collection in the target layout, stamped with user_id.
+Nothing is re-embedded, and re-running is safe: upserts are keyed by
+chunk id.
+
+Source collections are kept unless --delete-source is given, and one is
+only deleted when every vector in it was copied and read back, so the
+old layout stays available until CHROMA_LAYOUT is switched and verified.
+
+Usage:
+    python -m backend.scripts.migrate_chroma_layout --to sharded --dry-run
+    python -m backend.scripts.migrate_chroma_layout --to sharded
+    python -m backend.scripts.migrate_chroma_layout --to per_user --delete-source
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Dict, Any, Optional
+
+from backend.clients.chroma_client import chroma_bus
+from backend.clients.http_pool import http_pools
+from backend.clients.supabase_client import supabase_bus
+from backend.config import settings
+from backend.services.ingestion.embedding_service import EmbeddingService
+
+LAYOUTS = ("per_user", "sharded")
+PER_USER_PREFIX = "user_collection_"
+SUPABASE_LOOKUP_BATCH = 200
+
+
+def source_collections(target_layout: str) -> List[str]:
+    """
+    Names of the collections making up the other layout.
+    """
+    if target_layout == "sharded":
+        prefix = PER_USER_PREFIX
+    else:
+        prefix = f"{settings.CHROMA_SHARD_PREFIX}_"
+
+    names = [collection.name for collection in chroma_bus.client.list_collections()]
+    return sorted(name for name in names if name.startswith(prefix))
+
+
+async def resolve_owners(
+    metadatas: List[Dict[str, Any]],
+    document_owners: Dict[str, Optional[str]],
+) -> List[Optional[str]]:
+    """
+    user_id of every row: from its metadata, else from the Supabase
+    `documents` row of its document_id. Lookups are cached across batches.
+    """
+    unknown = {
+        metadata.get("document_id")
+        for metadata in metadatas
+        if not metadata.get("user_id") and metadata.get("document_id")
+    } - document_owners.keys()
+
+    if unknown:
+        await supabase_bus.connect()
+        supabase = supabase_bus.get_client()
+        pending = sorted(unknown)
+
+        for start in range(0, len(pending), SUPABASE_LOOKUP_BATCH):
+            batch = pending[start:start + SUPABASE_LOOKUP_BATCH]
+            result = (
+                await supabase.table("documents")
+                .select("id, user_id")
+                .in_("id", batch)
+                .execute()
+            )
+            found = {row["id"]: row["user_id"] for row in result.data or []}
+            for document_id in batch:
+                document_owners[document_id] = found.get(document_id)
+
+    return [
+        metadata.get("user_id") or document_owners.get(metadata.get("document_id"))
+        for metadata in metadatas
+    ]
+
+
+async def migrate_collection(
+    name: str,
+    target_layout: str,
+    batch_size: int,
+    dry_run: bool,
+    document_owners: Dict[str, Optional[str]],
+) -> Dict[str, Any]:
+    source = chroma_bus.client.get_collection(name=name)
+    embedding_function = None if dry_run else EmbeddingService.get_embedding_function()
+
+    report: Dict[str, Any] = {
+        "collection": name,
+        "vectors": 0,
+        "copied": 0,
+        "unresolved": 0,
+        "mismatched": 0,
+        "missing_after_copy": 0,
+        "targets": {},
+    }
+
+    offset = 0
+    while True:
+        page = source.get(
+            limit=batch_size,
+            offset=offset,
+            include=["documents", "metadatas", "embeddings"],
+        )
+        ids = page.get("ids") or []
+        if not ids:
+            break
+        offset += len(ids)
+
+        metadatas = [metadata or {} for metadata in page.get("metadatas") or [{}] * len(ids)]
+        documents = page.get("documents") or [None] * len(ids)
+        embeddings = page.get("embeddings")
+        owners = await resolve_owners(metadatas, document_owners)
+
+        report["vectors"] += len(ids)
+
+        # Rows grouped by the collection they belong to in the target layout.
+        groups: Dict[str, Dict[str, List[Any]]] = {}
+        for idx, owner in enumerate(owners):
+            if not owner:
+                report["unresolved"] += 1
+                continue
+
+            # A per-user collection only holds its own user's vectors.
+            if name.startswith(PER_USER_PREFIX) and EmbeddingService.collection_name(owner, "per_user") != name:
+                report["mismatched"] += 1
+                continue
+
+            target_name = EmbeddingService.collection_name(owner, target_layout)
+            group = groups.setdefault(target_name, {"ids": [], "documents": [], "metadatas": [], "embeddings": []})
+            group["ids"].append(ids[idx])
+            group["documents"].append(documents[idx])
+            group["metadatas"].append({**metadatas[idx], "user_id": str(owner)})
+            group["embeddings"].append(embeddings[idx])
+
+        for target_name, group in groups.items():
+            report["targets"][target_name] = report["targets"].get(target_name, 0) + len(group["ids"])
+            if dry_run:
+                continue
+
+            target = chroma_bus.get_collection(
+                target_name,
+                embedding_function=embedding_function,
+                metadata={"hnsw:space": "cosine"},
+            )
+            target.upsert(
+                ids=group["ids"],
+                embeddings=group["embeddings"],
+                documents=group["documents"],
+                metadatas=group["metadatas"],
+            )
+
+            stored = target.get(ids=group["ids"], include=[])
+            report["copied"] += len(stored.get("ids") or [])
+            report["missing_after_copy"] += len(group["ids"]) - len(stored.get("ids") or [])
+
+    return report
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    await chroma_bus.connect()
+    document_owners: Dict[str, Optional[str]] = {}
+
+    started = time.perf_counter()
+    names = source_collections(args.to)
+    reports: List[Dict[str, Any]] = []
+
+    try:
+        for name in names:
+            report = await migrate_collection(name, args.to, args.batch_size, args.dry_run, document_owners)
+
+            complete = (
+                not args.dry_run
+                and report["copied"] == report["vectors"]
+                and report["missing_after_copy"] == 0
+            )
+            if args.delete_source and complete:
+                chroma_bus.client.delete_collection(name=name)
+                chroma_bus.forget_collections(name)
+            report["source_deleted"] = args.delete_source and complete
+
+            print(
+                f"{name}: {report['vectors']} vectors, {report['copied']} copied, "
+                f"{report['unresolved']} unresolved, {report['mismatched']} mismatched"
+            )
+            reports.append(report)
+    finally:
+        await supabase_bus.close()
+        await http_pools.aclose()
+        await chroma_bus.close()
+
+    return {
+        "target_layout": args.to,
+        "shard_count": settings.CHROMA_SHARD_COUNT,
+        "dry_run": args.dry_run,
+        "source_collections": len(names),
+        "target_collections": len({target for report in reports for target in report["targets"]}),
+        "vectors": sum(report["vectors"] for report in reports),
+        "copied": sum(report["copied"] for report in reports),
+        "unresolved": sum(report["unresolved"] for report in reports),
+        "mismatched": sum(report["mismatched"] for report in reports),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "collections": reports if args.verbose else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate Chroma vectors between the per_user and sharded layouts.")
+    parser.add_argument("--to", choices=LAYOUTS, required=True, help="Target layout")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Shard count for the sharded layout; must match CHROMA_SHARD_COUNT of the app",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Read and resolve owners only; write nothing")
+    parser.add_argument(
+        "--delete-source",
+        action="store_true",
+        help="Delete each source collection once all its vectors are copied and read back",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Include per-collection reports")
+    args = parser.parse_args()
+
+    if args.shards:
+        settings.CHROMA_SHARD_COUNT = args.shards
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
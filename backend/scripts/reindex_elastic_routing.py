@@ -0,0 +1,149 @@
+"""
+Re-index Elasticsearch chunks into the routed / tenant-group layout
+(ELASTIC_ROUTING_ENABLED, ELASTIC_TENANT_GROUPS).
+
+Scans --source-index and bulk-indexes every chunk into the index
+ElasticRouting picks for its user_id, with routing=user_id. Routing cannot
+change in place (the same _id would then exist on two shards), so the
+source must be a different index: point ELASTIC_SEARCH_INDEX at the new
+name, then pass the old index as --source-index. Target indexes are
+created with the source's mappings plus the routing requirement.
+
+The source index is kept unless --delete-source is given, and then only
+when every chunk was copied.
+
+Usage:
+    python -m backend.scripts.reindex_elastic_routing --source-index coeus_chunks --dry-run
+    python -m backend.scripts.reindex_elastic_routing --source-index coeus_chunks --shards 6
+    python -m backend.scripts.reindex_elastic_routing --source-index coeus_chunks --delete-source
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Dict, Any, Optional, Set
+
+from elasticsearch import helpers
+
+from backend.clients.elastic_search_client import elastic_bus
+from backend.config import settings
+from backend.services.elastic_routing import ElasticRouting
+
+
+async def ensure_target(
+    client,
+    index_name: str,
+    mappings: Dict[str, Any],
+    shards: Optional[int],
+    created: Set[str],
+) -> None:
+    if index_name in created:
+        return
+
+    if not await client.indices.exists(index=index_name):
+        body: Dict[str, Any] = {"mappings": json.loads(json.dumps(mappings))}
+        if shards:
+            body["settings"] = {"number_of_shards": shards}
+        await client.indices.create(index=index_name, body=ElasticRouting.apply_to_mapping(body))
+
+    created.add(index_name)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.source_index in ElasticRouting.all_indices():
+        raise SystemExit(
+            f"{args.source_index} is a target of the current layout; set ELASTIC_SEARCH_INDEX "
+            "to a new index name and pass the old one as --source-index."
+        )
+
+    await elastic_bus.connect()
+    client = elastic_bus.get_client()
+
+    started = time.perf_counter()
+    report: Dict[str, Any] = {
+        "source_index": args.source_index,
+        "routing": settings.ELASTIC_ROUTING_ENABLED,
+        "tenant_groups": settings.ELASTIC_TENANT_GROUPS,
+        "dry_run": args.dry_run,
+        "scanned": 0,
+        "copied": 0,
+        "errors": 0,
+        "missing_user_id": 0,
+        "targets": {},
+    }
+
+    try:
+        mapping_response = await client.indices.get_mapping(index=args.source_index)
+        mappings = next(iter(mapping_response.body.values()))["mappings"]
+        created: Set[str] = set()
+        batch: List[Dict[str, Any]] = []
+
+        async def flush() -> None:
+            if not batch:
+                return
+            if not args.dry_run:
+                for index_name in {action["_index"] for action in batch}:
+                    await ensure_target(client, index_name, mappings, args.shards, created)
+
+                copied, errors = await helpers.async_bulk(client, batch, raise_on_error=False)
+                report["copied"] += copied
+                report["errors"] += len(errors)
+            batch.clear()
+
+        async for hit in helpers.async_scan(
+            client,
+            index=args.source_index,
+            query={"query": {"match_all": {}}},
+            size=args.batch_size,
+        ):
+            report["scanned"] += 1
+            source = hit.get("_source", {})
+            user_id = source.get("user_id")
+
+            if not user_id:
+                report["missing_user_id"] += 1
+                continue
+
+            meta = ElasticRouting.bulk_meta(user_id)
+            report["targets"][meta["_index"]] = report["targets"].get(meta["_index"], 0) + 1
+
+            batch.append({"_op_type": "index", **meta, "_id": hit["_id"], "_source": source})
+            if len(batch) >= args.batch_size:
+                await flush()
+
+        await flush()
+
+        if not args.dry_run and created:
+            await client.indices.refresh(index=",".join(sorted(created)))
+
+        complete = (
+            not args.dry_run
+            and report["errors"] == 0
+            and report["missing_user_id"] == 0
+            and report["copied"] == report["scanned"]
+        )
+        if args.delete_source and complete:
+            await client.indices.delete(index=args.source_index)
+        report["source_deleted"] = args.delete_source and complete
+
+    finally:
+        await elastic_bus.close()
+
+    report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-index Elasticsearch chunks with user_id routing / tenant groups.")
+    parser.add_argument("--source-index", required=True, help="Index holding the chunks to move")
+    parser.add_argument("--shards", type=int, default=None, help="number_of_shards for newly created target indexes")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Scan and report target indexes only; write nothing")
+    parser.add_argument("--delete-source", action="store_true", help="Delete the source index once every chunk is copied")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
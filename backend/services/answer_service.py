@@ -1,11 +1,18 @@
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 
 from backend.clients.gemini_client import gemini_bus
+from backend.config import settings
+from backend.utils.circuit_breaker import gemini_breaker
 from backend.utils.prompt_loader import load_prompt
 
 
 class AnswerService:
+    # Shorter suffix/prefix matches between neighbours are treated as chance.
+    MIN_TEXT_OVERLAP = 16
+    # Below this, the budget left over is not worth a truncated span.
+    MIN_PARTIAL_SPAN_TOKENS = 64
+
     @staticmethod
     def _clean_text(text: str) -> str:
         if not text:
@@ -37,29 +44,245 @@ class AnswerService:
         return AnswerService._clean_text(text)
 
     @staticmethod
-    def _format_chunks_for_prompt(chunks: List[Dict[str, Any]]) -> str:
-        if not chunks:
-            return "No evidence available."
+    def _estimate_tokens(text: str) -> int:
+        # Rough count (about 4 characters per token); close enough for budgeting.
+        return (len(text) + 3) // 4
+
+    @staticmethod
+    def _text_overlap(left: str, right: str) -> int:
+        """
+        Length of the longest suffix of `left` that is also a prefix of
+        `right` (prefix function over right + sep + tail of left).
+        """
+        max_len = min(len(left), len(right))
+        if max_len == 0:
+            return 0
+
+        text = right[:max_len] + "\0" + left[-max_len:]
+        prefix = [0] * len(text)
 
-        evidence_blocks = []
+        for i in range(1, len(text)):
+            k = prefix[i - 1]
+            while k and text[i] != text[k]:
+                k = prefix[k - 1]
+            if text[i] == text[k]:
+                k += 1
+            prefix[i] = k
 
-        for idx, item in enumerate(chunks, start=1):
-            raw_content = item.get("content", "") or ""
-            content = AnswerService._extract_content_only(raw_content)
+        return prefix[-1]
 
-            if not content:
+    @staticmethod
+    def _is_adjacent(previous: Dict[str, Any], item: Dict[str, Any]) -> bool:
+        if previous["last_chunk_index"] is not None and item["chunk_index"] is not None:
+            if item["chunk_index"] - previous["last_chunk_index"] == 1:
+                return True
+
+        # Same page and the next chunk starts inside the current span.
+        return (
+            previous["page"] == item["page"]
+            and previous["end_index"] is not None
+            and item["start_index"] is not None
+            and item["start_index"] <= previous["end_index"]
+        )
+
+    @staticmethod
+    def _stitch_evidence(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Merge chunks that are neighbours in the same document (consecutive
+        chunk_index, or overlapping start_index ranges on a page) into one
+        span, dropping the text the splitter repeated between them.
+
+        Spans come back in the order of their best-ranked chunk.
+        """
+        items: List[Dict[str, Any]] = []
+        seen_ids = set()
+
+        for rank, chunk in enumerate(chunks):
+            content = AnswerService._extract_content_only(chunk.get("content", "") or "")
+            chunk_id = chunk.get("chunk_id")
+            if not content or (chunk_id is not None and chunk_id in seen_ids):
+                continue
+            seen_ids.add(chunk_id)
+
+            start_index = chunk.get("start_index")
+            items.append({
+                "rank": rank,
+                "document": chunk.get("document_id") or chunk.get("source"),
+                "page": chunk.get("page"),
+                "chunk_index": chunk.get("chunk_index"),
+                "start_index": start_index,
+                "end_index": start_index + len(chunk.get("content") or "") if start_index is not None else None,
+                "content": content,
+            })
+
+        if not settings.ANSWER_STITCH_EVIDENCE:
+            return [{"rank": item["rank"], "content": item["content"], "chunks": 1} for item in items]
+
+        by_document: Dict[Any, List[Dict[str, Any]]] = {}
+        for item in items:
+            by_document.setdefault(item["document"], []).append(item)
+
+        spans: List[Dict[str, Any]] = []
+
+        for document, group in by_document.items():
+            if document is None:
+                spans.extend({"rank": item["rank"], "content": item["content"], "chunks": 1} for item in group)
                 continue
 
-            evidence_blocks.append(f"Evidence {idx}:\n{content}")
+            group.sort(key=lambda item: (
+                item["chunk_index"] is None,
+                item["chunk_index"] or 0,
+                item["page"] or 0,
+                item["start_index"] or 0,
+            ))
+
+            current: Optional[Dict[str, Any]] = None
+            for item in group:
+                if current is not None and AnswerService._is_adjacent(current, item):
+                    overlap = AnswerService._text_overlap(current["content"], item["content"])
+                    if overlap < AnswerService.MIN_TEXT_OVERLAP:
+                        overlap = 0
+
+                    addition = item["content"][overlap:]
+                    if addition.strip() and item["content"] not in current["content"]:
+                        current["content"] = (
+                            current["content"] + addition if overlap else f"{current['content']} {addition}"
+                        )
+
+                    same_page = current["page"] == item["page"] and current["end_index"] is not None
+                    if item["end_index"] is not None:
+                        current["end_index"] = (
+                            max(current["end_index"], item["end_index"]) if same_page else item["end_index"]
+                        )
+                    current["rank"] = min(current["rank"], item["rank"])
+                    current["chunks"] += 1
+                    current["page"] = item["page"]
+                    current["last_chunk_index"] = item["chunk_index"]
+                    continue
+
+                if current is not None:
+                    spans.append(current)
+                current = {**item, "chunks": 1, "last_chunk_index": item["chunk_index"]}
+
+            if current is not None:
+                spans.append(current)
+
+        spans.sort(key=lambda span: span["rank"])
+        return [{"rank": span["rank"], "content": span["content"], "chunks": span["chunks"]} for span in spans]
+
+    @staticmethod
+    def _pack_evidence(spans: List[Dict[str, Any]], token_budget: int) -> List[str]:
+        """
+        Take spans in rank order until the token budget is spent. The span
+        that crosses the budget is cut at a sentence (or word) boundary
+        rather than dropped, unless too little budget is left to matter.
+        """
+        packed: List[str] = []
+        remaining = token_budget
+
+        for span in spans:
+            content = span["content"]
+            tokens = AnswerService._estimate_tokens(content)
+
+            if tokens <= remaining:
+                packed.append(content)
+                remaining -= tokens
+                continue
+
+            if remaining >= AnswerService.MIN_PARTIAL_SPAN_TOKENS or not packed:
+                cut = content[: remaining * 4]
+                boundary = max(cut.rfind(". "), cut.rfind("\n"))
+                if boundary < len(cut) // 2:
+                    boundary = cut.rfind(" ")
+                packed.append(cut[: boundary + 1].strip() if boundary > 0 else cut.strip())
+            break
+
+        return packed
+
+    @staticmethod
+    def _format_chunks_for_prompt(chunks: List[Dict[str, Any]]) -> str:
+        if not chunks:
+            return "No evidence available."
+
+        spans = AnswerService._stitch_evidence(chunks)
+        evidence = AnswerService._pack_evidence(spans, settings.ANSWER_EVIDENCE_TOKEN_BUDGET)
+
+        evidence_blocks = [
+            f"Evidence {idx}:\n{content}"
+            for idx, content in enumerate(evidence, start=1)
+            if content
+        ]
 
         return "\n\n".join(evidence_blocks) if evidence_blocks else "No evidence available."
 
     @staticmethod
-    async def generate_answer(
+    def _build_messages(
         query: str,
-        reranked_chunks: List[Dict[str, Any]],
-        top_k: int = 5,
-    ) -> Dict[str, Any]:
+        selected_chunks: List[Dict[str, Any]],
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        Build the system/human message pair sent to Gemini.
+        `history` holds earlier {"query", "answer"} turns of a chat session.
+        """
+        evidence_text = AnswerService._format_chunks_for_prompt(selected_chunks)
+
+        system_msg = load_prompt(
+            "backend/prompts/answering_agent/prompt.yaml",
+            "system_prompt",
+        )
+        user_msg = load_prompt(
+            "backend/prompts/answering_agent/prompt.yaml",
+            "user_prompt_template",
+            query=query.strip(),
+            evidence_chunks=evidence_text,
+            history=history or [],
+        )
+
+        return [
+            ("system", system_msg),
+            ("human", user_msg),
+        ]
+
+    @staticmethod
+    def _select_chunks(reranked_chunks: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """
+        Top `top_k` reranked chunks, each with any neighbouring context
+        chunks (`context_of`) that context expansion placed after it.
+        """
+        selected: List[Dict[str, Any]] = []
+        ranked = 0
+
+        for item in reranked_chunks:
+            if item.get("context_of") is None:
+                if ranked >= top_k:
+                    break
+                ranked += 1
+            selected.append(item)
+
+        return selected
+
+    @staticmethod
+    def _build_used_chunks(selected_chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Neighbouring context widens the evidence but is not itself cited.
+        return [
+            {
+                "chunk_id": item.get("chunk_id"),
+                "document_id": item.get("document_id"),
+                "source": item.get("source"),
+                "page": item.get("page"),
+                "chunk_index": item.get("chunk_index"),
+                "rerank_score": item.get("rerank_score", 0.0),
+            }
+            for item in selected_chunks
+            if item.get("context_of") is None
+        ]
+
+    @staticmethod
+    def _early_answer(query: str, reranked_chunks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Return a canned answer when there is nothing to send to Gemini.
+        """
         if not query or not query.strip():
             return {
                 "answer": "No question was provided.",
@@ -74,24 +297,59 @@ class AnswerService:
                 "total_chunks": 0,
             }
 
-        selected_chunks = reranked_chunks[:top_k]
-        evidence_text = AnswerService._format_chunks_for_prompt(selected_chunks)
+        return None
 
-        system_msg = load_prompt(
-            "backend/prompts/answering_agent/prompt.yaml",
-            "system_prompt",
-        )
-        user_msg = load_prompt(
-            "backend/prompts/answering_agent/prompt.yaml",
-            "user_prompt_template",
-            query=query.strip(),
-            evidence_chunks=evidence_text,
-        )
+    @staticmethod
+    def fallback_answer(
+        query: str,
+        reranked_chunks: List[Dict[str, Any]],
+        top_k: int = 3,
+    ) -> Dict[str, Any]:
+        """
+        Short extractive answer used when Gemini cannot answer in time:
+        points the user at the top evidence without an LLM call.
+        """
+        early_answer = AnswerService._early_answer(query, reranked_chunks)
+        if early_answer is not None:
+            return early_answer
 
-        response = await gemini_bus.model.ainvoke([
-            ("system", system_msg),
-            ("human", user_msg),
-        ])
+        selected_chunks = [item for item in reranked_chunks if item.get("context_of") is None][:top_k]
+        lines = ["A full answer could not be generated in time. The most relevant passages are:"]
+
+        for item in selected_chunks:
+            text = AnswerService._clean_text(item.get("summary") or "") or AnswerService._extract_content_only(
+                item.get("content") or ""
+            )[:300]
+            location = item.get("source") or "unknown source"
+            if item.get("page") is not None:
+                location = f"{location}, page {item.get('page')}"
+
+            lines.append(f"- {text} ({location})")
+
+        return {
+            "answer": "\n".join(lines),
+            "used_chunks": AnswerService._build_used_chunks(selected_chunks),
+            "total_chunks": len(selected_chunks),
+        }
+
+    @staticmethod
+    async def generate_answer(
+        query: str,
+        reranked_chunks: List[Dict[str, Any]],
+        top_k: int = 5,
+        history: Optional[List[Dict[str, str]]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        early_answer = AnswerService._early_answer(query, reranked_chunks)
+        if early_answer is not None:
+            return early_answer
+
+        selected_chunks = AnswerService._select_chunks(reranked_chunks, top_k)
+        messages = AnswerService._build_messages(query, selected_chunks, history)
+
+        # Bounded inside the breaker so a stalled Gemini counts as a failure.
+        async with gemini_breaker.guard(timeout):
+            response = await gemini_bus.model.ainvoke(messages)
 
         answer_text = (
             str(response.content).strip()
@@ -99,18 +357,59 @@ class AnswerService:
             else str(response).strip()
         )
 
+        used_chunks = AnswerService._build_used_chunks(selected_chunks)
+
         return {
             "answer": answer_text,
-            "used_chunks": [
-                {
-                    "chunk_id": item.get("chunk_id"),
-                    "document_id": item.get("document_id"),
-                    "source": item.get("source"),
-                    "page": item.get("page"),
-                    "chunk_index": item.get("chunk_index"),
-                    "rerank_score": item.get("rerank_score", 0.0),
-                }
-                for item in selected_chunks
-            ],
-            "total_chunks": len(selected_chunks),
-        }
\ No newline at end of file
+            "used_chunks": used_chunks,
+            "total_chunks": len(used_chunks),
+        }
+
+    @staticmethod
+    async def stream_answer(
+        query: str,
+        reranked_chunks: List[Dict[str, Any]],
+        top_k: int = 5,
+        history: Optional[List[Dict[str, str]]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the grounded answer from Gemini as it is generated.
+
+        Yields {"type": "token", "text": ...} for every streamed delta and
+        finishes with {"type": "answer", "answer": {...}} carrying the same
+        payload generate_answer would have returned. Raises TimeoutError
+        if the whole stream takes longer than `timeout` seconds.
+        """
+        early_answer = AnswerService._early_answer(query, reranked_chunks)
+        if early_answer is not None:
+            yield {"type": "token", "text": early_answer["answer"]}
+            yield {"type": "answer", "answer": early_answer}
+            return
+
+        selected_chunks = AnswerService._select_chunks(reranked_chunks, top_k)
+        messages = AnswerService._build_messages(query, selected_chunks, history)
+
+        parts: List[str] = []
+
+        async with gemini_breaker.guard(timeout):
+            async for chunk in gemini_bus.model.astream(messages):
+                text = chunk.content if hasattr(chunk, "content") else chunk
+                if not isinstance(text, str):
+                    text = str(text or "")
+                if not text:
+                    continue
+
+                parts.append(text)
+                yield {"type": "token", "text": text}
+
+        used_chunks = AnswerService._build_used_chunks(selected_chunks)
+
+        yield {
+            "type": "answer",
+            "answer": {
+                "answer": "".join(parts).strip(),
+                "used_chunks": used_chunks,
+                "total_chunks": len(used_chunks),
+            },
+        }
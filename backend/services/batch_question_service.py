@@ -0,0 +1,248 @@
+import asyncio
+from typing import List, Dict, Any, AsyncIterator, Optional
+
+from backend.config import settings
+from backend.services.query_expansion_service import QueryExpansionService
+from backend.services.semantic_retriever import SemanticRetriever
+from backend.services.keyword_retriever import KeywordRetriever
+from backend.services.hybrid_retriever import ElasticHybridRetriever
+from backend.services.fusion_service import FusionService
+from backend.services.chunk_hydration_service import ChunkHydrationService
+from backend.services.mmr_service import MMRService
+from backend.services.reranker_service import RerankerService
+from backend.services.answer_service import AnswerService
+from backend.utils.logging_setup import get_logger
+
+logger = get_logger("batch_questions")
+
+
+semantic_retriever = SemanticRetriever()
+keyword_retriever = KeywordRetriever()
+hybrid_retriever = ElasticHybridRetriever()
+
+
+class BatchQuestionService:
+    """
+    Answers many questions for one user with vectorized retrieval.
+
+    Flow:
+    questions
+    -> query expansion (bounded fan-out)
+    -> one embedding call + one Chroma query for all questions
+       alongside one Elasticsearch _msearch for the keyword side
+       (elastic_hybrid engine: one embedding call + one hybrid _msearch)
+    -> per question fuse -> (MMR) -> hydrate -> rerank -> (context) -> answer
+       (bounded fan-out)
+    -> results yielded as each question completes
+    """
+
+    @staticmethod
+    async def _expand_all(
+        questions: List[str],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Dict[str, Any]]:
+        async def expand(question: str) -> Dict[str, Any]:
+            async with semaphore:
+                expansion = await QueryExpansionService.expand_query(question)
+
+            return {
+                "query": question,
+                "expanded_keywords": expansion.keywords,
+                "expanded_search_terms": expansion.search_terms,
+                "intent_summary": expansion.intent_summary,
+            }
+
+        return list(await asyncio.gather(*(expand(question) for question in questions)))
+
+    @staticmethod
+    async def _answer_one(
+        index: int,
+        expanded: Dict[str, Any],
+        semantic_results: List[Dict[str, Any]],
+        keyword_results: List[Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+        user_id: str,
+        rerank_backend: Optional[str],
+        fused_results: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        query = expanded["query"]
+        stage = "fuse"
+
+        try:
+            if fused_results is None:
+                fused_results = FusionService.fuse(
+                    ranked_lists={
+                        "semantic": semantic_results,
+                        "keyword": keyword_results,
+                    },
+                    weights={
+                        "semantic": settings.FUSION_SEMANTIC_WEIGHT,
+                        "keyword": settings.FUSION_KEYWORD_WEIGHT,
+                    },
+                    method=settings.FUSION_METHOD,
+                    rrf_k=settings.FUSION_RRF_K,
+                    top_k=MMRService.candidate_pool_size(),
+                )
+
+            async with semaphore:
+                if settings.MMR_ENABLED:
+                    stage = "diversify"
+                    fused_results, _ = await MMRService.diversify(
+                        query=query,
+                        candidates=fused_results,
+                        user_id=user_id,
+                        top_k=settings.MMR_TOP_K,
+                        lambda_mult=settings.MMR_LAMBDA,
+                    )
+
+                stage = "hydrate"
+                fused_results = await ChunkHydrationService.hydrate(
+                    chunks=fused_results,
+                    user_id=user_id,
+                )
+
+                stage = "rerank"
+                rerank_outcome = await RerankerService.rerank(
+                    query=query,
+                    candidates=fused_results,
+                    top_k=5,
+                    use_summary=True,
+                    backend=rerank_backend,
+                    user_id=user_id,
+                )
+
+                reranked_results = rerank_outcome["results"]
+                if settings.CONTEXT_EXPANSION_ENABLED:
+                    stage = "expand_context"
+                    reranked_results, _ = await ChunkHydrationService.expand_with_neighbours(
+                        chunks=reranked_results,
+                        window=settings.CONTEXT_EXPANSION_WINDOW,
+                        user_id=user_id,
+                    )
+
+                stage = "answer"
+                final_answer = await AnswerService.generate_answer(
+                    query=query,
+                    reranked_chunks=reranked_results,
+                    top_k=5,
+                )
+
+            return {
+                "index": index,
+                "query": query,
+                "status": "completed",
+                "answer": final_answer,
+                "intent_summary": expanded.get("intent_summary", ""),
+                "rerank_path": rerank_outcome["rerank_path"],
+                "error": None,
+                "error_stage": None,
+            }
+
+        except Exception as e:
+            logger.exception("Batch question failed", extra={"fields": {"index": index, "stage": stage}})
+            return {
+                "index": index,
+                "query": query,
+                "status": "failed",
+                "answer": {},
+                "error": str(e),
+                "error_stage": stage,
+            }
+
+    @staticmethod
+    async def answer_questions(
+        questions: List[str],
+        user_id: str,
+        document_id: Optional[str] = None,
+        source: Optional[str] = None,
+        concurrency: int = 4,
+        expand_queries: bool = True,
+        rerank_backend: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield one result dict per question, in completion order.
+        Each result carries its position in the request as "index".
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        stage = "expand_query"
+
+        try:
+            if expand_queries:
+                expanded = await BatchQuestionService._expand_all(questions, semaphore)
+            else:
+                expanded = [
+                    {
+                        "query": question,
+                        "expanded_keywords": [],
+                        "expanded_search_terms": [],
+                        "intent_summary": question,
+                    }
+                    for question in questions
+                ]
+
+            stage = "retrieve"
+            hybrid_lists: List[Optional[List[Dict[str, Any]]]] = [None] * len(questions)
+
+            if settings.RETRIEVAL_ENGINE == "elastic_hybrid":
+                hybrid_lists = await hybrid_retriever.search_many(
+                    queries=expanded,
+                    user_id=user_id,
+                    document_id=document_id,
+                    source=source,
+                    top_k=MMRService.candidate_pool_size(),
+                )
+                semantic_lists = keyword_lists = [[] for _ in questions]
+            else:
+                semantic_lists, keyword_lists = await asyncio.gather(
+                    semantic_retriever.search_many(
+                        queries=questions,
+                        user_id=user_id,
+                        document_id=document_id,
+                        source=source,
+                        top_k=MMRService.candidate_pool_size(),
+                    ),
+                    keyword_retriever.search_many(
+                        queries=expanded,
+                        user_id=user_id,
+                        document_id=document_id,
+                        source=source,
+                        top_k=MMRService.candidate_pool_size(),
+                    ),
+                )
+
+        except Exception as e:
+            logger.exception("Batch retrieval failed")
+            for index, question in enumerate(questions):
+                yield {
+                    "index": index,
+                    "query": question,
+                    "status": "failed",
+                    "answer": {},
+                    "error": str(e),
+                    "error_stage": stage,
+                }
+            return
+
+        tasks = [
+            asyncio.create_task(
+                BatchQuestionService._answer_one(
+                    index=index,
+                    expanded=expanded[index],
+                    semantic_results=semantic_lists[index],
+                    keyword_results=keyword_lists[index],
+                    semaphore=semaphore,
+                    user_id=user_id,
+                    rerank_backend=rerank_backend,
+                    fused_results=hybrid_lists[index],
+                )
+            )
+            for index in range(len(questions))
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
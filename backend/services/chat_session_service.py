@@ -0,0 +1,186 @@
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+from backend.config import settings
+
+
+# Words that carry no retrieval signal in follow-ups ("what about ...").
+STOPWORDS = {
+    "a", "about", "an", "and", "any", "are", "as", "at", "be", "by", "can",
+    "could", "did", "do", "does", "for", "from", "how", "i", "in", "is", "it",
+    "its", "me", "more", "of", "on", "or", "say", "says", "tell", "that",
+    "the", "them", "then", "there", "this", "those", "to", "was", "what",
+    "when", "where", "which", "who", "why", "with", "you",
+}
+
+
+class ChatSession:
+    def __init__(self, session_id: str, user_id: str) -> None:
+        self.session_id = session_id
+        self.user_id = user_id
+        self.turns: List[Dict[str, str]] = []
+        self.candidate_pool: List[Dict[str, Any]] = []
+        self.document_id: Optional[str] = None
+        self.source: Optional[str] = None
+        self.touched_at = time.monotonic()
+
+
+class ChatSessionStore:
+    """
+    Bounded in-memory session store: LRU eviction past `max_sessions`,
+    expiry after `ttl_seconds` without a turn. Per process, so sessions do
+    not survive restarts or span workers.
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: float) -> None:
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+
+    def _expired(self, session: ChatSession) -> bool:
+        return time.monotonic() - session.touched_at > self.ttl_seconds
+
+    def get(self, session_id: str, user_id: str) -> Optional[ChatSession]:
+        session = self._sessions.get(session_id)
+
+        if session is None:
+            return None
+
+        if self._expired(session):
+            self._sessions.pop(session_id, None)
+            return None
+
+        if session.user_id != user_id:
+            return None
+
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def create(self, user_id: str, session_id: Optional[str] = None) -> ChatSession:
+        session = ChatSession(session_id or str(uuid.uuid4()), user_id)
+        self._sessions[session.session_id] = session
+        self._sessions.move_to_end(session.session_id)
+
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+        return session
+
+    def touch(self, session: ChatSession) -> None:
+        session.touched_at = time.monotonic()
+        if session.session_id in self._sessions:
+            self._sessions.move_to_end(session.session_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+chat_session_store = ChatSessionStore(
+    max_sessions=settings.CHAT_SESSION_MAX_SESSIONS,
+    ttl_seconds=settings.CHAT_SESSION_TTL_SECONDS,
+)
+
+
+class ChatSessionService:
+    """
+    Multi-turn chat state for /chat/ask.
+
+    Each session keeps the last few turns (fed to the answer prompt) and
+    the previous turn's hydrated fused candidates. A follow-up in the same
+    document scope is first scored against that pool; full expansion and
+    retrieval only run when the pool does not cover the follow-up.
+    """
+
+    @staticmethod
+    def get_or_create(session_id: Optional[str], user_id: str) -> ChatSession:
+        if session_id:
+            session = chat_session_store.get(session_id, user_id)
+            if session is not None:
+                return session
+
+        # Unknown or expired ids start a fresh session under a new id.
+        return chat_session_store.create(user_id)
+
+    @staticmethod
+    def reusable_pool(
+        session: ChatSession,
+        document_id: Optional[str],
+        source: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        The cached pool, only if the follow-up keeps the same scope.
+        """
+        if not session.turns or not session.candidate_pool:
+            return []
+
+        if (session.document_id, session.source) != (document_id, source):
+            return []
+
+        return session.candidate_pool
+
+    @staticmethod
+    def history(session: ChatSession) -> List[Dict[str, str]]:
+        return list(session.turns[-settings.CHAT_SESSION_MAX_TURNS:])
+
+    @staticmethod
+    def record_turn(
+        session: ChatSession,
+        query: str,
+        answer: str,
+        candidates: List[Dict[str, Any]],
+        document_id: Optional[str],
+        source: Optional[str],
+    ) -> None:
+        session.turns.append({"query": query, "answer": answer})
+        session.turns = session.turns[-settings.CHAT_SESSION_MAX_TURNS:]
+
+        if candidates:
+            session.candidate_pool = candidates[:settings.CHAT_SESSION_POOL_SIZE]
+            session.document_id = document_id
+            session.source = source
+
+        chat_session_store.touch(session)
+
+    @staticmethod
+    def _terms(text: str) -> List[str]:
+        return [
+            term
+            for term in re.findall(r"[a-z0-9]+", (text or "").lower())
+            if term not in STOPWORDS and (len(term) > 1 or term.isdigit())
+        ]
+
+    @staticmethod
+    def pool_coverage(query: str, pool: List[Dict[str, Any]]) -> float:
+        """
+        Fraction of the follow-up's content terms found anywhere in the
+        pool (chunk text, summary, keywords, "page N" labels). Cheap
+        lexical check deciding whether re-ranking the pool can answer it.
+        """
+        query_terms = set(ChatSessionService._terms(query))
+        if not query_terms or not pool:
+            return 0.0
+
+        pool_terms = set()
+        for item in pool:
+            pool_terms.update(ChatSessionService._terms(" ".join([
+                item.get("content") or "",
+                item.get("summary") or "",
+                " ".join(item.get("keywords") or []),
+                " ".join(item.get("search_terms") or []),
+                f"page {item.get('page')}" if item.get("page") is not None else "",
+            ])))
+
+        return len(query_terms & pool_terms) / len(query_terms)
+
+    @staticmethod
+    def contextual_query(query: str, history: List[Dict[str, str]]) -> str:
+        """
+        Follow-ups are often elliptical; anchor them to the previous
+        question when scoring against the previous turn's pool.
+        """
+        if not history:
+            return query
+        return f"{history[-1]['query']} {query}"
@@ -0,0 +1,329 @@
+import re
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+from backend.config import settings
+from backend.clients.elastic_search_client import elastic_bus
+from backend.services.elastic_routing import ElasticRouting
+from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.utils.bounded_executor import vector_executor
+from backend.utils.logging_setup import get_logger
+
+logger = get_logger("chunk_hydration")
+
+
+CHUNK_ID_RE = re.compile(r"^(?P<document_id>.+)_chunk_(?P<chunk_index>\d+)$")
+
+
+class ChunkCache:
+    """
+    In-process LRU of stored chunk documents keyed by chunk id, bounded at
+    `max_entries`. Entries remember the user they were fetched for and are
+    only served back to that user. Per process, like the session store.
+
+    Re-ingesting a document rewrites its chunks under the same ids:
+    ingestion calls forget_document() in its own process, and entries
+    expire after `ttl_seconds` so other processes catch up too.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float = 0.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Optional[str], Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, chunk_ids: List[str], user_id: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        now = time.monotonic()
+
+        for chunk_id in chunk_ids:
+            entry = self._entries.get(chunk_id)
+
+            if entry is not None and entry[2] <= now:
+                del self._entries[chunk_id]
+                entry = None
+
+            if entry is None or entry[0] != user_id:
+                self.misses += 1
+                continue
+
+            self._entries.move_to_end(chunk_id)
+            found[chunk_id] = entry[1]
+            self.hits += 1
+
+        return found
+
+    def put_many(self, docs: Dict[str, Dict[str, Any]], user_id: Optional[str]) -> None:
+        if self.max_entries <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else float("inf")
+
+        for chunk_id, doc in docs.items():
+            self._entries[chunk_id] = (user_id, doc, expires_at)
+            self._entries.move_to_end(chunk_id)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget_document(self, document_id: str) -> int:
+        """
+        Drop every cached chunk of `document_id`; returns how many.
+        """
+        stale = [
+            chunk_id
+            for chunk_id, (_, doc, _) in self._entries.items()
+            if doc.get("document_id") == document_id or chunk_id.startswith(f"{document_id}_chunk_")
+        ]
+        for chunk_id in stale:
+            del self._entries[chunk_id]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+chunk_cache = ChunkCache(
+    max_entries=settings.CHUNK_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CHUNK_CACHE_TTL_SECONDS,
+)
+
+
+class ChunkHydrationService:
+    """
+    Fills in full chunk text for the few candidates that survive fusion.
+
+    Retrievers return ids, scores and small metadata only; the chunk body
+    is fetched here in one batched lookup by chunk id:
+    - Elasticsearch mget (the ES _id is the chunk id)
+    - Chroma get for any ids Elasticsearch did not have
+    Both sit behind `chunk_cache`, so repeat lookups skip the round trip.
+    """
+
+    @staticmethod
+    def _needs_content(item: Dict[str, Any]) -> bool:
+        return item.get("chunk_id") is not None and not item.get("content")
+
+    @staticmethod
+    async def _fetch_from_elastic(
+        chunk_ids: List[str],
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        # Routed / grouped chunks cannot be located without their user.
+        if not user_id and ElasticRouting.partitioned():
+            return {}
+
+        client = elastic_bus.get_client()
+
+        response = await client.mget(
+            ids=chunk_ids,
+            source_excludes=["embedding"],
+            **ElasticRouting.target(user_id),
+        )
+
+        # Without routing, mget finds a chunk id in any tenant; only the
+        # caller's own chunks may be returned (and cached for them).
+        return {
+            doc["_id"]: doc.get("_source", {})
+            for doc in response.get("docs", [])
+            if doc.get("found") and (not user_id or doc.get("_source", {}).get("user_id") == user_id)
+        }
+
+    @staticmethod
+    def _fetch_from_chroma(user_id: str, chunk_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        collection = EmbeddingService.get_collection(user_id)
+        response = collection.get(
+            ids=chunk_ids,
+            where=EmbeddingService.tenant_where(user_id),
+            include=["documents", "metadatas"],
+        )
+
+        ids = response.get("ids") or []
+        documents = response.get("documents") or []
+        metadatas = response.get("metadatas") or []
+
+        return {
+            chunk_id: {
+                **(metadatas[idx] if idx < len(metadatas) and metadatas[idx] else {}),
+                "id": chunk_id,
+                "content": documents[idx],
+            }
+            for idx, chunk_id in enumerate(ids)
+            if idx < len(documents)
+        }
+
+    @staticmethod
+    async def fetch_chunks(
+        chunk_ids: List[str],
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch stored chunk documents by id, keyed by chunk id.
+        """
+        unique_ids = list(dict.fromkeys(chunk_id for chunk_id in chunk_ids if chunk_id))
+        if not unique_ids:
+            return {}
+
+        fetched = chunk_cache.get_many(unique_ids, user_id)
+        loaded: Dict[str, Dict[str, Any]] = {}
+
+        missing = [chunk_id for chunk_id in unique_ids if chunk_id not in fetched]
+        if not missing:
+            return fetched
+
+        try:
+            loaded.update(await ChunkHydrationService._fetch_from_elastic(missing, user_id))
+        except Exception as e:
+            logger.warning("Chunk hydration from Elasticsearch failed: %s", e)
+
+        missing = [chunk_id for chunk_id in missing if chunk_id not in loaded]
+
+        if missing and user_id:
+            try:
+                loaded.update(await vector_executor.run(
+                    ChunkHydrationService._fetch_from_chroma,
+                    user_id,
+                    missing,
+                ))
+            except Exception as e:
+                logger.warning("Chunk hydration from Chroma failed: %s", e)
+
+        chunk_cache.put_many(loaded, user_id)
+        fetched.update(loaded)
+        return fetched
+
+    @staticmethod
+    async def hydrate(
+        chunks: List[Dict[str, Any]],
+        user_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return chunks with "content" filled in, preserving order.
+        Chunks that already carry content are left untouched.
+        """
+        missing_ids = [
+            item["chunk_id"]
+            for item in chunks
+            if ChunkHydrationService._needs_content(item)
+        ]
+
+        if not missing_ids:
+            return chunks
+
+        fetched = await ChunkHydrationService.fetch_chunks(missing_ids, user_id=user_id)
+
+        hydrated: List[Dict[str, Any]] = []
+
+        for item in chunks:
+            stored = fetched.get(item.get("chunk_id"))
+
+            if stored and ChunkHydrationService._needs_content(item):
+                item = dict(item)
+                item["content"] = stored.get("content") or ""
+
+            hydrated.append(item)
+
+        return hydrated
+
+    @staticmethod
+    def neighbour_ids(chunk: Dict[str, Any], window: int) -> List[str]:
+        """
+        Ids of the chunks within `window` positions of `chunk` in its
+        document. Ingestion names chunks `{document_id}_chunk_{index}`.
+        """
+        document_id = chunk.get("document_id")
+        chunk_index = chunk.get("chunk_index")
+
+        if document_id is None or chunk_index is None:
+            match = CHUNK_ID_RE.match(chunk.get("chunk_id") or "")
+            if not match:
+                return []
+            document_id = match.group("document_id")
+            chunk_index = match.group("chunk_index")
+
+        chunk_index = int(chunk_index)
+
+        return [
+            f"{document_id}_chunk_{chunk_index + offset}"
+            for offset in range(-window, window + 1)
+            if offset != 0 and chunk_index + offset >= 0
+        ]
+
+    @staticmethod
+    async def expand_with_neighbours(
+        chunks: List[Dict[str, Any]],
+        window: int,
+        user_id: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Add the chunks within `window` positions of each input chunk, all
+        fetched in one batched lookup. Each input chunk is followed by its
+        neighbours, tagged with `context_of` (the chunk they widen) and its
+        rerank score. Chunks already present are not repeated.
+
+        Returns the expanded list and how many neighbours were added.
+        """
+        if window <= 0 or not chunks:
+            return chunks, 0
+
+        present = {item.get("chunk_id") for item in chunks}
+        wanted = {
+            item.get("chunk_id"): [
+                chunk_id
+                for chunk_id in ChunkHydrationService.neighbour_ids(item, window)
+                if chunk_id not in present
+            ]
+            for item in chunks
+        }
+
+        fetched = await ChunkHydrationService.fetch_chunks(
+            [chunk_id for ids in wanted.values() for chunk_id in ids],
+            user_id=user_id,
+        )
+
+        expanded: List[Dict[str, Any]] = []
+        added = set()
+
+        for item in chunks:
+            expanded.append(item)
+
+            for chunk_id in wanted.get(item.get("chunk_id"), []):
+                stored = fetched.get(chunk_id)
+                if not stored or chunk_id in added:
+                    continue
+                added.add(chunk_id)
+
+                chunk_index = stored.get("chunk_index")
+                if chunk_index is None:
+                    chunk_index = int(CHUNK_ID_RE.match(chunk_id).group("chunk_index"))
+
+                expanded.append({
+                    "chunk_id": chunk_id,
+                    "document_id": stored.get("document_id") or item.get("document_id"),
+                    "source": stored.get("source") or item.get("source"),
+                    "page": stored.get("page"),
+                    "chunk_index": chunk_index,
+                    "start_index": stored.get("start_index"),
+                    "content": stored.get("content") or "",
+                    "summary": stored.get("summary"),
+                    "rerank_score": item.get("rerank_score", 0.0),
+                    "context_of": item.get("chunk_id"),
+                })
+
+        return expanded, len(added)
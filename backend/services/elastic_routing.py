@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Optional
+
+from backend.config import settings
+from backend.utils.tenant_hash import tenant_bucket
+
+
+class ElasticRouting:
+    """
+    Where a tenant's chunks live in Elasticsearch, decided in one place for
+    ingestion and every read path (search, msearch, mget, hybrid).
+
+    - ELASTIC_ROUTING_ENABLED: chunks are indexed and searched with
+      routing=user_id, so a user's chunks share one shard and a query
+      touches that shard only instead of fanning out to all of them. The
+      user_id term filter stays: other tenants can hash to the same shard.
+    - ELASTIC_TENANT_GROUPS > 0: users are spread over that many indexes
+      (`<ELASTIC_SEARCH_INDEX>-group-NNN`, by a stable hash of user_id),
+      all behind one read alias for admin and cross-tenant tooling.
+    """
+
+    @staticmethod
+    def partitioned() -> bool:
+        """
+        True when a chunk can only be found knowing its user_id.
+        """
+        return settings.ELASTIC_ROUTING_ENABLED or settings.ELASTIC_TENANT_GROUPS > 0
+
+    @staticmethod
+    def routing_key(user_id: Optional[str]) -> Optional[str]:
+        if not settings.ELASTIC_ROUTING_ENABLED or not user_id:
+            return None
+        return str(user_id)
+
+    @staticmethod
+    def group_index(group: int) -> str:
+        return f"{settings.ELASTIC_SEARCH_INDEX}-group-{group:03d}"
+
+    @staticmethod
+    def index_for(user_id: str) -> str:
+        if settings.ELASTIC_TENANT_GROUPS > 0:
+            return ElasticRouting.group_index(tenant_bucket(user_id, settings.ELASTIC_TENANT_GROUPS))
+        return settings.ELASTIC_SEARCH_INDEX
+
+    @staticmethod
+    def all_indices() -> List[str]:
+        if settings.ELASTIC_TENANT_GROUPS > 0:
+            return [ElasticRouting.group_index(group) for group in range(settings.ELASTIC_TENANT_GROUPS)]
+        return [settings.ELASTIC_SEARCH_INDEX]
+
+    @staticmethod
+    def alias_name() -> str:
+        return settings.ELASTIC_TENANT_ALIAS or f"{settings.ELASTIC_SEARCH_INDEX}-all"
+
+    @staticmethod
+    def target(user_id: Optional[str], index: Optional[str] = None) -> Dict[str, Any]:
+        """
+        `index` / `routing` kwargs for search, msearch and mget. A caller
+        pinning `index` (benchmarks, smoke tests) keeps it; routing still applies.
+        """
+        target: Dict[str, Any] = {"index": index or ElasticRouting.index_for(user_id)}
+
+        routing = ElasticRouting.routing_key(user_id)
+        if routing:
+            target["routing"] = routing
+
+        return target
+
+    @staticmethod
+    def bulk_meta(user_id: str, index: Optional[str] = None) -> Dict[str, Any]:
+        """
+        `_index` / `routing` for a bulk action, matching target() for reads.
+        """
+        target = ElasticRouting.target(user_id, index)
+        meta: Dict[str, Any] = {"_index": target["index"]}
+
+        if "routing" in target:
+            meta["routing"] = target["routing"]
+
+        return meta
+
+    @staticmethod
+    def apply_to_mapping(mapping: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Index-creation body for a tenant index: routing made mandatory (a
+        write without it would land on the wrong shard) and group indexes
+        joined to the read alias as they are created.
+        """
+        if settings.ELASTIC_ROUTING_ENABLED:
+            mapping.setdefault("mappings", {})["_routing"] = {"required": True}
+
+        if settings.ELASTIC_TENANT_GROUPS > 0:
+            mapping.setdefault("aliases", {})[ElasticRouting.alias_name()] = {}
+
+        return mapping
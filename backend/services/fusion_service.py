@@ -1,200 +1,285 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+FUSION_METHODS = ("rrf", "minmax", "zscore", "combsum")
+
+BASE_FIELDS = (
+    "document_id",
+    "source",
+    "page",
+    "chunk_index",
+    "start_index",
+    "content",
+    "summary",
+    "keywords",
+    "search_terms",
+)
 
 
 class FusionService:
     """
-    Hybrid retrieval fusion service using Reciprocal Rank Fusion (RRF).
+    Hybrid retrieval fusion over any number of ranked result lists.
 
-    Why RRF:
+    Methods:
+    - rrf: weighted Reciprocal Rank Fusion, sum of w / (rrf_k + rank)
+    - minmax: weighted sum of per-list min-max normalised scores
+    - zscore: weighted sum of per-list z-scored scores
+    - combsum: weighted sum of raw scores (only for comparable scales)
+
+    Why RRF is the default:
     - semantic and keyword scores are on different scales
     - rank positions are more stable than raw score comparison
     - simple and robust baseline for hybrid retrieval
+
+    Candidates are mapped to integer columns once and scored as a
+    (lists x candidates) NumPy matrix; result dicts are only built for
+    the returned top_k.
     """
 
     @staticmethod
-    def reciprocal_rank_fusion(
-        semantic_results: List[Dict[str, Any]],
-        keyword_results: List[Dict[str, Any]],
+    def fuse(
+        ranked_lists: Dict[str, List[Dict[str, Any]]],
+        weights: Optional[Dict[str, float]] = None,
+        method: str = "rrf",
         rrf_k: int = 60,
         top_k: int = 10,
     ) -> List[Dict[str, Any]]:
         """
-        Fuse semantic + keyword retrieval results using chunk_id as the shared identity.
+        Fuse ranked lists keyed by retriever name using chunk_id as identity.
 
         Args:
-            semantic_results: normalized semantic retrieval results
-            keyword_results: normalized keyword retrieval results
-            rrf_k: standard RRF constant, commonly 60
+            ranked_lists: e.g. {"semantic": [...], "keyword": [...]}, each best-first
+            weights: per-retriever weight, missing names default to 1.0
+            method: one of FUSION_METHODS
+            rrf_k: RRF constant, commonly 60
             top_k: number of fused results to return
 
         Returns:
-            List of fused normalized retrieval results sorted by fused_score desc
+            Fused results sorted by fused_score desc. Each carries
+            <name>_score / <name>_match for every input list.
+
+        RRF ranks are positions in the input list, counting items without a
+        chunk_id, and a chunk listed twice earns credit for both positions
+        (as the original two-list RRF did). Score-based methods and the
+        per-list fields use a chunk's first occurrence.
         """
-        fused_scores: Dict[str, float] = {}
-        fused_items: Dict[str, Dict[str, Any]] = {}
-        source_presence: Dict[str, Dict[str, bool]] = {}
-
-        FusionService._accumulate_rrf(
-            results=semantic_results,
-            fused_scores=fused_scores,
-            fused_items=fused_items,
-            source_presence=source_presence,
-            source_name="semantic",
-            rrf_k=rrf_k,
-        )
+        if method not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method '{method}'. Expected one of: {', '.join(FUSION_METHODS)}")
 
-        FusionService._accumulate_rrf(
-            results=keyword_results,
-            fused_scores=fused_scores,
-            fused_items=fused_items,
-            source_presence=source_presence,
-            source_name="keyword",
-            rrf_k=rrf_k,
-        )
+        if top_k <= 0:
+            return []
 
-        fused_results: List[Dict[str, Any]] = []
+        names = list(ranked_lists.keys())
+        weights = weights or {}
 
-        for chunk_id, item in fused_items.items():
-            result = dict(item)
+        column_of: Dict[str, int] = {}
+        per_list_columns: List[np.ndarray] = []
+        per_list_scores: List[np.ndarray] = []
+        per_list_ranked: List[Tuple[np.ndarray, np.ndarray]] = []
+        per_list_items: List[Dict[int, Dict[str, Any]]] = []
 
-            result["fused_score"] = float(round(fused_scores.get(chunk_id, 0.0), 8))
-            result["semantic_match"] = source_presence.get(chunk_id, {}).get("semantic", False)
-            result["keyword_match"] = source_presence.get(chunk_id, {}).get("keyword", False)
-            result["retrieval_type"] = FusionService._build_retrieval_label(
-                semantic_match=result["semantic_match"],
-                keyword_match=result["keyword_match"],
-            )
+        for name in names:
+            columns: List[int] = []
+            scores: List[float] = []
+            ranked_columns: List[int] = []
+            ranks: List[int] = []
+            items: Dict[int, Dict[str, Any]] = {}
 
-            fused_results.append(result)
+            for rank, item in enumerate(ranked_lists[name], start=1):
+                chunk_id = item.get("chunk_id")
+                if not chunk_id:
+                    continue
 
-        fused_results.sort(
-            key=lambda x: (
-                x.get("fused_score", 0.0),
-                1 if x.get("semantic_match") else 0,
-                1 if x.get("keyword_match") else 0,
-            ),
-            reverse=True,
-        )
+                column = column_of.setdefault(chunk_id, len(column_of))
+                ranked_columns.append(column)
+                ranks.append(rank)
+
+                if column in items:
+                    continue
+
+                items[column] = item
+                columns.append(column)
+                scores.append(float(item.get("score") or 0.0))
 
-        print("Fusion top results:", [
-            {
-                "chunk_id": item.get("chunk_id"),
-                "fused_score": item.get("fused_score"),
-                "semantic_match": item.get("semantic_match"),
-                "keyword_match": item.get("keyword_match"),
-            }
-            for item in fused_results[:top_k]
-        ])
+            per_list_columns.append(np.asarray(columns, dtype=np.int64))
+            per_list_scores.append(np.asarray(scores, dtype=np.float64))
+            per_list_ranked.append((
+                np.asarray(ranked_columns, dtype=np.int64),
+                np.asarray(ranks, dtype=np.float64),
+            ))
+            per_list_items.append(items)
 
-        return fused_results[:top_k]
+        n_candidates = len(column_of)
+        if n_candidates == 0:
+            return []
+
+        contributions = np.zeros((len(names), n_candidates), dtype=np.float64)
+        present = np.zeros((len(names), n_candidates), dtype=bool)
+
+        for row, (columns, scores, ranked) in enumerate(zip(per_list_columns, per_list_scores, per_list_ranked)):
+            if columns.size == 0:
+                continue
+
+            present[row, columns] = True
+            contributions[row] = FusionService._list_contributions(
+                columns=columns,
+                scores=scores,
+                ranked=ranked,
+                n_candidates=n_candidates,
+                method=method,
+                rrf_k=rrf_k,
+            )
+
+        weight_vector = np.asarray([float(weights.get(name, 1.0)) for name in names])
+        fused_scores = weight_vector @ contributions
+
+        top_columns = FusionService._top_columns(fused_scores, present, top_k)
+        id_of = list(column_of.keys())
+
+        return [
+            FusionService._build_fused_item(
+                chunk_id=id_of[column],
+                column=column,
+                fused_score=fused_scores[column],
+                names=names,
+                per_list_items=per_list_items,
+            )
+            for column in top_columns
+        ]
 
     @staticmethod
-    def _accumulate_rrf(
-        results: List[Dict[str, Any]],
-        fused_scores: Dict[str, float],
-        fused_items: Dict[str, Dict[str, Any]],
-        source_presence: Dict[str, Dict[str, bool]],
-        source_name: str,
+    def _list_contributions(
+        columns: np.ndarray,
+        scores: np.ndarray,
+        ranked: Tuple[np.ndarray, np.ndarray],
+        n_candidates: int,
+        method: str,
         rrf_k: int,
-    ) -> None:
+    ) -> np.ndarray:
         """
-        Add RRF contribution from one ranked result list.
+        One list's contribution to every candidate column.
+        Candidates missing from the list get the list's floor value.
+        `ranked` holds every occurrence's column and list position (RRF);
+        `columns` / `scores` hold first occurrences only.
         """
-        for rank, item in enumerate(results, start=1):
-            chunk_id = item.get("chunk_id")
-            if not chunk_id:
-                continue
-
-            rrf_score = 1.0 / (rrf_k + rank)
-            fused_scores[chunk_id] = fused_scores.get(chunk_id, 0.0) + rrf_score
+        row = np.zeros(n_candidates, dtype=np.float64)
 
-            if chunk_id not in fused_items:
-                fused_items[chunk_id] = FusionService._build_base_fused_item(item)
-            else:
-                fused_items[chunk_id] = FusionService._merge_items(
-                    existing=fused_items[chunk_id],
-                    incoming=item,
-                )
+        if method == "rrf":
+            ranked_columns, ranks = ranked
+            # add.at, not assignment: a repeated chunk sums its credits.
+            np.add.at(row, ranked_columns, 1.0 / (rrf_k + ranks))
+            return row
 
-            if chunk_id not in source_presence:
-                source_presence[chunk_id] = {
-                    "semantic": False,
-                    "keyword": False,
-                }
+        if method == "minmax":
+            low, high = scores.min(), scores.max()
+            spread = high - low
+            row[columns] = (scores - low) / spread if spread > 0 else 1.0
+            return row
 
-            source_presence[chunk_id][source_name] = True
+        if method == "zscore":
+            std = scores.std()
+            normalized = (scores - scores.mean()) / std if std > 0 else np.zeros_like(scores)
+            row.fill(normalized.min())
+            row[columns] = normalized
+            return row
 
-            if source_name == "semantic":
-                fused_items[chunk_id]["semantic_score"] = item.get("score", 0.0)
-                fused_items[chunk_id]["semantic_distance"] = item.get("distance")
-            elif source_name == "keyword":
-                fused_items[chunk_id]["keyword_score"] = item.get("score", 0.0)
+        row[columns] = scores
+        return row
 
     @staticmethod
-    def _build_base_fused_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    def _top_columns(fused_scores: np.ndarray, present: np.ndarray, top_k: int) -> np.ndarray:
         """
-        Build the base normalized fused item from the first occurrence of a chunk.
+        Columns of the best top_k candidates, ties broken by presence in
+        earlier lists (semantic before keyword in the default setup).
         """
-        return {
-            "chunk_id": item.get("chunk_id"),
-            "document_id": item.get("document_id"),
-            "source": item.get("source"),
-            "page": item.get("page"),
-            "chunk_index": item.get("chunk_index"),
-            "content": item.get("content", ""),
-            "summary": item.get("summary"),
-            "keywords": item.get("keywords", []),
-            "search_terms": item.get("search_terms", []),
-            "semantic_score": None,
-            "semantic_distance": None,
-            "keyword_score": None,
-        }
+        n_candidates = fused_scores.size
+        candidates = np.arange(n_candidates)
+
+        if top_k < n_candidates:
+            # Partition first so the full sort only touches the survivors.
+            # Anything tied with the cut-off score is kept for tie-breaking.
+            cutoff = np.partition(fused_scores, n_candidates - top_k)[n_candidates - top_k]
+            candidates = np.flatnonzero(fused_scores >= cutoff)
+
+        sort_keys = [-present[row, candidates].astype(np.int8) for row in reversed(range(present.shape[0]))]
+        sort_keys.append(-fused_scores[candidates])
+
+        order = np.lexsort(sort_keys)
+        return candidates[order][:top_k]
 
     @staticmethod
-    def _merge_items(existing: Dict[str, Any], incoming: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_fused_item(
+        chunk_id: str,
+        column: int,
+        fused_score: float,
+        names: List[str],
+        per_list_items: List[Dict[int, Dict[str, Any]]],
+    ) -> Dict[str, Any]:
         """
-        Merge fields when the same chunk appears in multiple retrieval lists.
-        Prefer non-empty richer fields.
+        Build one fused result, preferring the first non-empty value of
+        each field across the lists the chunk appeared in.
         """
-        merged = dict(existing)
-
-        for field in [
-            "document_id",
-            "source",
-            "page",
-            "chunk_index",
-            "content",
-            "summary",
-            "keywords",
-            "search_terms",
-        ]:
-            existing_value = merged.get(field)
-            incoming_value = incoming.get(field)
-
-            if FusionService._is_better_value(existing_value, incoming_value):
-                merged[field] = incoming_value
-
-        return merged
+        sources = [items[column] for items in per_list_items if column in items]
+        result: Dict[str, Any] = {"chunk_id": chunk_id}
+
+        for field in BASE_FIELDS:
+            values = [item.get(field) for item in sources]
+            result[field] = next(
+                (value for value in values if not FusionService._is_empty(value)),
+                values[0] if values else None,
+            )
+
+        matched: List[str] = []
+
+        for name, items in zip(names, per_list_items):
+            item = items.get(column)
+            result[f"{name}_score"] = item.get("score", 0.0) if item is not None else None
+            result[f"{name}_match"] = item is not None
+
+            if name == "semantic" or (item is not None and "distance" in item):
+                result[f"{name}_distance"] = item.get("distance") if item is not None else None
+
+            if item is not None:
+                matched.append(name)
+
+        result["fused_score"] = float(round(float(fused_score), 8))
+        result["retrieval_type"] = FusionService._build_retrieval_label(matched)
+
+        return result
 
     @staticmethod
-    def _is_better_value(existing: Any, incoming: Any) -> bool:
-        """
-        Decide whether incoming field is better than existing one.
-        """
-        if existing in (None, "", [], {}):
-            return incoming not in (None, "", [], {})
-        return False
+    def _is_empty(value: Any) -> bool:
+        return value in (None, "", [], {})
 
     @staticmethod
-    def _build_retrieval_label(semantic_match: bool, keyword_match: bool) -> str:
+    def _build_retrieval_label(matched: List[str]) -> str:
         """
         Label fused result origin.
         """
-        if semantic_match and keyword_match:
+        if len(matched) > 1:
             return "hybrid"
-        if semantic_match:
-            return "semantic"
-        if keyword_match:
-            return "keyword"
+        if matched:
+            return matched[0]
         return "unknown"
-    
\ No newline at end of file
+
+    @staticmethod
+    def reciprocal_rank_fusion(
+        semantic_results: List[Dict[str, Any]],
+        keyword_results: List[Dict[str, Any]],
+        rrf_k: int = 60,
+        top_k: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Two-list RRF, kept for existing callers. See fuse().
+        """
+        return FusionService.fuse(
+            ranked_lists={
+                "semantic": semantic_results,
+                "keyword": keyword_results,
+            },
+            method="rrf",
+            rrf_k=rrf_k,
+            top_k=top_k,
+        )
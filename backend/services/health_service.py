@@ -0,0 +1,134 @@
+import asyncio
+import time
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from backend.config import settings
+from backend.clients.supabase_client import supabase_bus
+from backend.clients.elastic_search_client import elastic_bus
+from backend.clients.chroma_client import chroma_bus
+from backend.services.warmup_service import warmup_state
+from backend.utils.bounded_executor import vector_executor
+from backend.utils.circuit_breaker import LLM_BREAKERS
+
+
+# Any of these down and the instance cannot answer a chat request.
+CRITICAL_DEPENDENCIES = ("supabase", "elasticsearch", "chromadb", "embedding_model")
+
+
+async def _probe_supabase() -> None:
+    await supabase_bus.get_client().table("users").select("id").limit(1).execute()
+
+
+async def _probe_elastic() -> None:
+    if not await elastic_bus.get_client().ping():
+        raise RuntimeError("ping returned false")
+
+
+async def _probe_chroma() -> None:
+    if chroma_bus.client is None:
+        raise RuntimeError("client not initialized")
+    # Default thread pool, not vector_executor: a probe must neither wait
+    # behind request work nor take a request's slot while Chroma hangs.
+    await asyncio.to_thread(chroma_bus.client.heartbeat)
+
+
+def _embedding_status() -> Dict[str, Any]:
+    """
+    Embedding readiness without running the model: warm-up has finished
+    and vector_executor, where every embedding runs, still admits work.
+    """
+    if not warmup_state.ready:
+        return {"status": "down", "latency_ms": None, "error": f"warm-up {warmup_state.status}"}
+
+    stats = vector_executor.stats()
+    return {
+        "status": "up",
+        "latency_ms": None,
+        "model_loaded": "embedding_model" in warmup_state.steps,
+        "saturated": stats["running"] >= stats["max_workers"] and stats["queued"] >= stats["max_queue"],
+        "executor": {key: stats[key] for key in ("running", "queued", "max_workers", "max_queue")},
+    }
+
+
+class HealthService:
+    """
+    Active dependency probes behind /ready and /health.
+
+    Each probe gets HEALTH_PROBE_TIMEOUT_SECONDS and reports its latency;
+    the embedding model is judged from warm-up and executor state instead.
+    A full report is cached for HEALTH_CACHE_TTL_SECONDS and concurrent
+    callers share one in-flight check, so probe traffic stays flat no
+    matter how often the load balancer polls.
+    """
+
+    PROBES: Dict[str, Callable[[], Awaitable[None]]] = {
+        "supabase": _probe_supabase,
+        "elasticsearch": _probe_elastic,
+        "chromadb": _probe_chroma,
+    }
+
+    def __init__(self) -> None:
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def _run_probe(name: str, probe: Callable[[], Awaitable[None]]) -> Dict[str, Any]:
+        started = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(probe(), timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS)
+            result = {"status": "up"}
+        except asyncio.TimeoutError:
+            result = {"status": "down", "error": "timeout"}
+        except Exception as e:
+            result = {"status": "down", "error": f"{type(e).__name__}: {e}"}
+
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    async def _check(self) -> Dict[str, Any]:
+        names = list(self.PROBES)
+        results = await asyncio.gather(*(self._run_probe(name, self.PROBES[name]) for name in names))
+        dependencies = dict(zip(names, results))
+        dependencies["embedding_model"] = _embedding_status()
+
+        circuits = {breaker.name: breaker.snapshot() for breaker in LLM_BREAKERS}
+        critical_up = all(dependencies[name]["status"] == "up" for name in CRITICAL_DEPENDENCIES)
+        circuits_closed = all(circuit["state"] == "closed" for circuit in circuits.values())
+
+        if not critical_up:
+            overall = "down"
+        elif not circuits_closed or dependencies["embedding_model"].get("saturated"):
+            # LLM outages degrade answers (extractive fallback) and a full
+            # executor sheds vector work, but the instance still serves.
+            overall = "degraded"
+        else:
+            overall = "ok"
+
+        return {
+            "status": overall,
+            "ready": warmup_state.ready and critical_up,
+            "checked_at": time.time(),
+            "dependencies": dependencies,
+            "llm_circuits": circuits,
+            "warmup": warmup_state.snapshot(),
+        }
+
+    async def report(self, force: bool = False) -> Dict[str, Any]:
+        fresh = time.monotonic() - self._checked_at < settings.HEALTH_CACHE_TTL_SECONDS
+
+        if self.last_report is not None and fresh and not force:
+            return self.last_report
+
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._check())
+
+        # Shielded: a caller timing out must not cancel the shared check.
+        report = await asyncio.shield(self._inflight)
+        self.last_report = report
+        self._checked_at = time.monotonic()
+        return report
+
+
+health_service = HealthService()
@@ -0,0 +1,169 @@
+from typing import Optional, List, Dict, Any, Callable
+
+from backend.config import settings
+from backend.clients.elastic_search_client import elastic_bus
+from backend.services.keyword_retriever import KeywordRetriever
+from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.utils.bounded_executor import vector_executor
+
+
+class ElasticHybridRetriever(KeywordRetriever):
+    """
+    Single-round-trip hybrid retrieval inside Elasticsearch.
+
+    Sends one request with an `rrf` retriever combining:
+    - the same BM25 multi_match clauses as KeywordRetriever
+    - a kNN search over the chunk `embedding` dense_vector field
+    and lets Elasticsearch fuse the two rankings, so neither the Chroma hop
+    nor the Python fusion step is needed.
+
+    Requires chunks indexed with embeddings (ELASTIC_STORE_EMBEDDINGS or
+    RETRIEVAL_ENGINE=elastic_hybrid at ingestion time) and an
+    Elasticsearch version with the retriever API (8.14+).
+    """
+
+    def __init__(self, embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None) -> None:
+        super().__init__()
+        self.embed_fn = embed_fn or EmbeddingService.embed_texts
+
+    def _build_hybrid_body(
+        self,
+        query: str,
+        query_vector: List[float],
+        user_id: str,
+        document_id: Optional[str] = None,
+        source: Optional[str] = None,
+        top_k: int = 10,
+        expanded_keywords: Optional[List[str]] = None,
+        expanded_search_terms: Optional[List[str]] = None,
+        include_content: bool = False,
+    ) -> Dict[str, Any]:
+        lexical_body = self._build_search_body(
+            query=query,
+            user_id=user_id,
+            document_id=document_id,
+            source=source,
+            top_k=top_k,
+            expanded_keywords=expanded_keywords,
+            expanded_search_terms=expanded_search_terms,
+            include_content=include_content,
+        )
+        filters = lexical_body["query"]["bool"]["filter"]
+        window = max(top_k, settings.ELASTIC_KNN_NUM_CANDIDATES // 2)
+
+        return {
+            "size": top_k,
+            "_source": lexical_body["_source"],
+            "retriever": {
+                "rrf": {
+                    "retrievers": [
+                        {"standard": {"query": lexical_body["query"]}},
+                        {
+                            "knn": {
+                                "field": "embedding",
+                                "query_vector": query_vector,
+                                "k": window,
+                                "num_candidates": max(window, settings.ELASTIC_KNN_NUM_CANDIDATES),
+                                "filter": filters,
+                            }
+                        },
+                    ],
+                    "rank_constant": settings.FUSION_RRF_K,
+                    "rank_window_size": window,
+                }
+            },
+        }
+
+    @staticmethod
+    def _normalize_hybrid_hit(hit: Dict[str, Any]) -> Dict[str, Any]:
+        result = KeywordRetriever._normalize_hit(hit)
+        result["fused_score"] = result.pop("score")
+        result["retrieval_type"] = "elastic_hybrid"
+        return result
+
+    async def search(
+        self,
+        query: str,
+        user_id: str,
+        document_id: Optional[str] = None,
+        source: Optional[str] = None,
+        top_k: int = 10,
+        expanded_keywords: Optional[List[str]] = None,
+        expanded_search_terms: Optional[List[str]] = None,
+        include_content: bool = False,
+        query_vector: Optional[List[float]] = None,
+    ) -> List[Dict[str, Any]]:
+        if not query or not query.strip():
+            return []
+
+        if query_vector is None:
+            query_vector = (await vector_executor.run(self.embed_fn, [query.strip()]))[0]
+
+        body = self._build_hybrid_body(
+            query=query,
+            query_vector=query_vector,
+            user_id=user_id,
+            document_id=document_id,
+            source=source,
+            top_k=top_k,
+            expanded_keywords=expanded_keywords,
+            expanded_search_terms=expanded_search_terms,
+            include_content=include_content,
+        )
+
+        client = elastic_bus.get_client()
+        response = await client.search(body=body, **self._target(user_id))
+        hits = response.get("hits", {}).get("hits", [])
+
+        return [self._normalize_hybrid_hit(hit) for hit in hits]
+
+    async def search_many(
+        self,
+        queries: List[Dict[str, Any]],
+        user_id: str,
+        document_id: Optional[str] = None,
+        source: Optional[str] = None,
+        top_k: int = 10,
+        include_content: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Batched hybrid search: one embedding call and one _msearch.
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        active = [idx for idx, item in enumerate(queries) if (item.get("query") or "").strip()]
+
+        if not active:
+            return results
+
+        vectors = await vector_executor.run(
+            self.embed_fn,
+            [queries[idx]["query"].strip() for idx in active],
+        )
+
+        searches: List[Dict[str, Any]] = []
+        for idx, vector in zip(active, vectors):
+            item = queries[idx]
+            searches.append({})
+            searches.append(self._build_hybrid_body(
+                query=item["query"],
+                query_vector=vector,
+                user_id=user_id,
+                document_id=document_id,
+                source=source,
+                top_k=top_k,
+                expanded_keywords=item.get("expanded_keywords"),
+                expanded_search_terms=item.get("expanded_search_terms"),
+                include_content=include_content,
+            ))
+
+        client = elastic_bus.get_client()
+        response = await client.msearch(searches=searches, **self._target(user_id))
+
+        for idx, item_response in zip(active, response.get("responses", [])):
+            if "error" in item_response:
+                raise RuntimeError(f"Hybrid msearch failed for query {idx}: {item_response['error']}")
+
+            hits = item_response.get("hits", {}).get("hits", [])
+            results[idx] = [self._normalize_hybrid_hit(hit) for hit in hits]
+
+        return results
@@ -1,14 +1,16 @@
 import os
 import re
-import torch
-from chromadb.utils import embedding_functions
-from typing import List, Dict, Any
-from langsmith import traceable
+from functools import lru_cache
+
+from typing import List, Dict, Any, Optional
 
 # UPDATED: Using our Bus Singletons
 from backend.clients.supabase_client import supabase_bus
 from backend.clients.chroma_client import chroma_bus
 from backend.config import settings
+from backend.utils.bounded_executor import vector_executor
+from backend.utils.tenant_hash import tenant_bucket
+from backend.utils.tracing import traced
 
 class EmbeddingServiceError(Exception): pass
 class InvalidJobStateError(EmbeddingServiceError): pass
@@ -21,33 +23,171 @@ class EmbeddingService:
         return f"user_collection_{clean_name}"[:63]
 
     @staticmethod
-    @traceable(name="Chroma: Get or Create Collection", run_type="tool")
+    def shard_for(user_id: str, shard_count: Optional[int] = None) -> int:
+        """
+        Chroma shard of a user under the sharded layout (see tenant_bucket).
+        """
+        return tenant_bucket(user_id, shard_count or settings.CHROMA_SHARD_COUNT)
+
+    @staticmethod
+    def collection_name(user_id: str, layout: Optional[str] = None) -> str:
+        """
+        Collection holding `user_id`'s vectors under CHROMA_LAYOUT (or `layout`).
+        """
+        layout = layout or settings.CHROMA_LAYOUT
+
+        if layout == "sharded":
+            return f"{settings.CHROMA_SHARD_PREFIX}_{EmbeddingService.shard_for(user_id):03d}"
+
+        return EmbeddingService._sanitize_collection_name(user_id)
+
+    @staticmethod
+    def tenant_where(
+        user_id: str,
+        where: Optional[Dict[str, Any]] = None,
+        layout: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Add the user_id filter a shared collection needs to `where`.
+        Every query / get on a sharded collection must go through this;
+        per-user collections are already isolated and pass `where` through.
+        """
+        layout = layout or settings.CHROMA_LAYOUT
+        if layout != "sharded":
+            return where
+
+        tenant = {"user_id": str(user_id)}
+        if not where:
+            return tenant
+        if "$and" in where:
+            return {"$and": [tenant, *where["$and"]]}
+        return {"$and": [tenant, where]}
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_embedding_function():
+        """
+        Loads the sentence-transformer once per process.
+        Building it per call reloaded the model weights on every request.
+        torch is imported here, not at module level, to keep startup fast;
+        the lifespan warm-up calls this before the app reports ready.
+        """
+        import torch
+        from chromadb.utils import embedding_functions
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+
+        return embedding_functions.SentenceTransformerEmbeddingFunction(
+            model_name=settings.HF_EMBEDDING_MODEL,
+            device=device,
+        )
+
+    @staticmethod
+    def embed_texts(texts: List[str]) -> List[List[float]]:
+        """
+        Embeds all texts in a single model call.
+        Blocking: call it through vector_executor from async code.
+        """
+        if not texts:
+            return []
+
+        embeddings = EmbeddingService.get_embedding_function()(texts)
+        return [list(map(float, vector)) for vector in embeddings]
+
+    @staticmethod
+    # Also on the chat path: traced only inside an already sampled trace.
+    @traced(
+        name="Chroma: Get or Create Collection",
+        run_type="tool",
+        route="ingestion.embedding",
+        nested_only=True,
+    )
     def get_collection(user_id: str):
         """
-        Uses the warm Chroma client from chroma_bus to fetch/create a collection.
+        Uses the warm Chroma client from chroma_bus to fetch/create the
+        collection holding this user's vectors (see CHROMA_LAYOUT).
+        Blocking: call it through vector_executor from async code.
         """
         # Get the persistent client that was warmed up in main.py
         client = chroma_bus.client 
         if not client:
              raise RuntimeError("Chroma client not initialized. Check your lifespan.")
 
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        
-        local_ef = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name=settings.HF_EMBEDDING_MODEL,
-            device=device,
-        )
+        local_ef = EmbeddingService.get_embedding_function()
 
-        collection_name = EmbeddingService._sanitize_collection_name(user_id)
+        collection_name = EmbeddingService.collection_name(user_id)
 
-        return client.get_or_create_collection(
-            name=collection_name,
+        # Handle is cached by chroma_bus; only the first call per collection
+        # pays the get_or_create round trip.
+        return chroma_bus.get_collection(
+            collection_name,
             embedding_function=local_ef,
             metadata={"hnsw:space": "cosine"},
         )
 
+    @staticmethod
+    def stored_embeddings(user_id: Optional[str], chunk_ids: List[str]) -> Dict[str, List[float]]:
+        """
+        Vectors Chroma already holds for `chunk_ids`, keyed by chunk id;
+        ids without a stored vector are absent.
+        Blocking: call it through vector_executor from async code.
+        """
+        if not user_id or not chunk_ids:
+            return {}
+
+        collection = EmbeddingService.get_collection(user_id)
+        response = collection.get(
+            ids=chunk_ids,
+            where=EmbeddingService.tenant_where(user_id),
+            include=["embeddings"],
+        )
+
+        ids = response.get("ids") or []
+        embeddings = response.get("embeddings")
+        if embeddings is None:
+            return {}
+
+        return {chunk_id: embeddings[idx] for idx, chunk_id in enumerate(ids)}
+
+    @staticmethod
+    def embeddings_for_chunks(
+        user_id: str,
+        chunk_ids: List[str],
+        texts: List[str],
+    ) -> List[List[float]]:
+        """
+        One vector per chunk, reusing what Chroma stores and embedding only
+        the chunks it does not have.
+        Blocking: call it through vector_executor from async code.
+        """
+        stored = EmbeddingService.stored_embeddings(user_id, chunk_ids)
+
+        missing = [idx for idx, chunk_id in enumerate(chunk_ids) if chunk_id not in stored]
+        fresh = dict(zip(missing, EmbeddingService.embed_texts([texts[idx] for idx in missing])))
+
+        return [
+            list(map(float, stored[chunk_id])) if chunk_id in stored else fresh[idx]
+            for idx, chunk_id in enumerate(chunk_ids)
+        ]
+
     # ... _clean_text, _build_chroma_metadata, _build_semantic_document remain identical ...
 
+    @staticmethod
+    def _upsert_vectors(
+        user_id: str,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        collection = EmbeddingService.get_collection(user_id)
+        # Stamped in both layouts: sharded collections filter on it, and a
+        # per-user collection carrying it migrates without Supabase lookups.
+        collection.upsert(
+            ids=ids,
+            documents=documents,
+            metadatas=[{**metadata, "user_id": str(user_id)} for metadata in metadatas],
+        )
+
     @staticmethod
     async def _get_job(user_id: str, job_id: str) -> Dict[str, Any]:
         # UPDATED: Use the bus singleton
@@ -68,7 +208,7 @@ class EmbeddingService:
         return job_result.data[0]
 
     @classmethod
-    @traceable(name="Chroma: Embed and Upsert", run_type="chain")
+    @traced(name="Chroma: Embed and Upsert", run_type="chain", route="ingestion.embedding")
     async def embed_and_store(
         cls,
         enriched_chunks: List[Dict[str, Any]],
@@ -90,14 +230,13 @@ class EmbeddingService:
                 {"status": "embedded"}
             ).eq("id", job_id).execute()
 
-            # 2. Get collection via our bus-integrated method
-            collection = cls.get_collection(user_id)
-
-            # 3. Perform the vector storage
-            collection.upsert(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
+            # 2. Get collection and embed + store off the event loop
+            await vector_executor.run(
+                cls._upsert_vectors,
+                user_id,
+                ids,
+                documents,
+                metadatas,
             )
 
             # 4. Update status to 'vectors_inserted'
@@ -2,12 +2,15 @@ from datetime import datetime, timezone
 from typing import List, Dict, Any
 
 from elasticsearch import helpers
-from langsmith import traceable
 
 # UPDATED: Using our Bus Singletons
 from backend.clients.elastic_search_client import elastic_bus
 from backend.clients.supabase_client import supabase_bus
 from backend.config import settings
+from backend.services.elastic_routing import ElasticRouting
+from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.utils.bounded_executor import vector_executor
+from backend.utils.tracing import traced
 
 class ElasticServiceError(Exception): pass
 class InvalidJobStateError(ElasticServiceError): pass
@@ -34,7 +37,7 @@ class ElasticService:
         return job_result.data[0]
 
     @staticmethod
-    @traceable(name="Elastic: Ensure Index", run_type="tool")
+    @traced(name="Elastic: Ensure Index", run_type="tool", route="ingestion.elastic")
     async def ensure_index(index_name: str) -> None:
         """
         Ensures the Elasticsearch index exists with correct mappings for RAG.
@@ -47,10 +50,35 @@ class ElasticService:
             return
 
         # ... mapping definition remains identical ...
-        await client.indices.create(index=index_name, body=mapping)
+        await client.indices.create(index=index_name, body=ElasticRouting.apply_to_mapping(mapping))
+
+    @staticmethod
+    def stores_embeddings() -> bool:
+        return settings.ELASTIC_STORE_EMBEDDINGS or settings.RETRIEVAL_ENGINE == "elastic_hybrid"
+
+    @staticmethod
+    @traced(name="Elastic: Ensure Embedding Mapping", run_type="tool", route="ingestion.elastic")
+    async def ensure_embedding_mapping(index_name: str) -> None:
+        """
+        Adds the dense_vector field used by the elastic_hybrid engine.
+        Safe to repeat: re-putting an identical mapping is a no-op.
+        """
+        client = elastic_bus.get_client()
+
+        await client.indices.put_mapping(
+            index=index_name,
+            properties={
+                "embedding": {
+                    "type": "dense_vector",
+                    "dims": settings.ELASTIC_EMBEDDING_DIMS,
+                    "index": True,
+                    "similarity": "cosine",
+                }
+            },
+        )
 
     @classmethod
-    @traceable(name="Elastic: Bulk Insert Chunks", run_type="chain")
+    @traced(name="Elastic: Bulk Insert Chunks", run_type="chain", route="ingestion.elastic")
     async def bulk_insert_chunks(
         cls,
         enriched_chunks: List[Dict[str, Any]],
@@ -69,21 +97,40 @@ class ElasticService:
             raise InvalidJobStateError(f"Cannot index keywords for job status: {job['status']}")
 
         client = elastic_bus.get_client()
-        index_name = settings.ELASTIC_SEARCH_INDEX
+        # The user's index (tenant group) and shard routing, same as the retrievers use.
+        bulk_meta = ElasticRouting.bulk_meta(user_id)
+        index_name = bulk_meta["_index"]
 
         try:
             await cls.ensure_index(index_name)
             now_iso = datetime.now(timezone.utc).isoformat()
+
+            # Optional: store chunk vectors for single-request hybrid search.
+            # embed_and_store has just written these chunks to Chroma, so its
+            # vectors are reused instead of running the model a second time.
+            embeddings = None
+            if cls.stores_embeddings():
+                await cls.ensure_embedding_mapping(index_name)
+                embeddings = await vector_executor.run(
+                    EmbeddingService.embeddings_for_chunks,
+                    user_id,
+                    [item["id"] for item in enriched_chunks],
+                    [item["content"] for item in enriched_chunks],
+                )
             
             # 2. Build the bulk actions list
             actions = []
-            for item in enriched_chunks:
+            for idx, item in enumerate(enriched_chunks):
                 # Validation checks...
+                doc = cls._build_elastic_doc(item, now_iso)
+                if embeddings is not None:
+                    doc["embedding"] = embeddings[idx]
+
                 actions.append({
                     "_op_type": "index",
-                    "_index": index_name,
+                    **bulk_meta,
                     "_id": item["id"],
-                    "_source": cls._build_elastic_doc(item, now_iso),
+                    "_source": doc,
                 })
 
             # 3. Perform Bulk Operation
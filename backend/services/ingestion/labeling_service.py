@@ -1,14 +1,16 @@
 import asyncio
 from typing import List, Dict, Any
 
-from langsmith import traceable
-
 from backend.clients.groq_client import groq_clients
 # UPDATED: Using our Bus Singleton
 from backend.clients.supabase_client import supabase_bus
 from backend.config import settings
 from backend.schemas.chunkings_model import ChunkMetadata, BatchMetadata
 from backend.utils.prompt_loader import load_prompt
+from backend.utils.tracing import traced
+from backend.utils.logging_setup import get_logger
+
+logger = get_logger("labeling")
 
 
 class LabelingServiceError(Exception): pass
@@ -18,7 +20,7 @@ class JobNotFoundError(LabelingServiceError): pass
 
 class LabelingService:
     @staticmethod
-    @traceable(name="Labeling: LLM Batch Processing", run_type="llm")
+    @traced(name="Labeling: LLM Batch Processing", run_type="llm", route="ingestion.labeling")
     async def label_batch(chunks: List[str]) -> List[ChunkMetadata]:
         """
         Processes one batch of chunk texts and returns structured metadata.
@@ -36,7 +38,7 @@ class LabelingService:
                 chunks=chunks
             )
         except Exception as e:
-            print(f"Prompt Loading Failed: {e}")
+            logger.error("Labeling prompt loading failed: %s", e)
             raise
 
         try:
@@ -67,7 +69,7 @@ class LabelingService:
             return metadata_list
 
         except Exception as e:
-            print(f"Batch Processing Failed: {e}")
+            logger.warning("Labeling batch failed, storing empty labels: %s", e)
             return [
                 ChunkMetadata(keywords=[], search_terms=[], one_line_summary="Processing Error")
                 for _ in chunks
@@ -93,7 +95,7 @@ class LabelingService:
         return job_result.data[0]
 
     @classmethod
-    @traceable(name="Labeling: Process and Link", run_type="chain")
+    @traced(name="Labeling: Process and Link", run_type="chain", route="ingestion.labeling")
     async def process_and_link(
         cls,
         chunk_records: List[Dict[str, Any]],
@@ -3,14 +3,13 @@ import io
 import re
 from typing import List, Dict, Any
 
-import pdfplumber
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langsmith import traceable
 
 # UPDATED: Using our Bus Singleton
 from backend.clients.supabase_client import supabase_bus
 from backend.config import get_settings
+from backend.utils.tracing import traced
 
 cfg = get_settings()
 
@@ -21,8 +20,11 @@ class JobNotFoundError(PDFServiceError): pass
 
 class PDFService:
     @staticmethod
-    @traceable(name="PDFService: Extract Pages", run_type="tool")
+    @traced(name="PDFService: Extract Pages", run_type="tool", route="ingestion.pdf")
     def extract_pages(filename: str, raw_bytes: bytes) -> List[Dict[str, Any]]:
+        # pdfminer (under pdfplumber) is slow to import; only ingestion needs it.
+        import pdfplumber
+
         try:
             extracted_pages: List[Dict[str, Any]] = []
 
@@ -55,7 +57,7 @@ class PDFService:
             raise PDFServiceError(f"Extraction failed: {exc}") from exc
 
     @staticmethod
-    @traceable(name="PDFService: Chunk Pages", run_type="tool")
+    @traced(name="PDFService: Chunk Pages", run_type="tool", route="ingestion.pdf")
     def chunk_pages(
         pages: List[Dict[str, Any]],
         user_id: str,
@@ -140,7 +142,7 @@ class PDFService:
         return document_result.data[0]
 
     @staticmethod
-    @traceable(name="PDFService: Run Extraction For Job", run_type="chain")
+    @traced(name="PDFService: Run Extraction For Job", run_type="chain", route="ingestion.pdf")
     async def run_pdf_extraction_for_job(user_id: str, job_id: str) -> Dict[str, Any]:
         # UPDATED: Use the bus singleton
         supabase = supabase_bus.get_client()
@@ -173,7 +175,7 @@ class PDFService:
             raise
 
     @staticmethod
-    @traceable(name="PDFService: Run Chunking For Job", run_type="chain")
+    @traced(name="PDFService: Run Chunking For Job", run_type="chain", route="ingestion.pdf")
     async def run_pdf_chunking_for_job(user_id: str, job_id: str) -> Dict[str, Any]:
         # UPDATED: Use the bus singleton
         supabase = supabase_bus.get_client()
@@ -1,12 +1,19 @@
 from typing import Optional, List, Dict, Any
 
-from backend.config import settings
 from backend.clients.elastic_search_client import elastic_bus
+from backend.services.elastic_routing import ElasticRouting
+from backend.utils.logging_setup import get_logger, debug_enabled
+
+logger = get_logger("keyword_retriever")
 
 
 class KeywordRetriever:
     def __init__(self) -> None:
-        self.index_name = settings.ELASTIC_SEARCH_INDEX
+        # None: ElasticRouting picks the user's index. Set to pin one index.
+        self.index_name: Optional[str] = None
+
+    def _target(self, user_id: str) -> Dict[str, Any]:
+        return ElasticRouting.target(user_id, self.index_name)
 
     @staticmethod
     def _normalize_terms(values: Optional[List[str]]) -> List[str]:
@@ -25,7 +32,7 @@ class KeywordRetriever:
 
         return cleaned
 
-    async def search(
+    def _build_search_body(
         self,
         query: str,
         user_id: str,
@@ -34,12 +41,8 @@ class KeywordRetriever:
         top_k: int = 10,
         expanded_keywords: Optional[List[str]] = None,
         expanded_search_terms: Optional[List[str]] = None,
-    ) -> List[Dict[str, Any]]:
-        if not query or not query.strip():
-            return []
-
-        client = elastic_bus.get_client()
-
+        include_content: bool = False,
+    ) -> Dict[str, Any]:
         filters = [{"term": {"user_id": user_id}}]
 
         if document_id:
@@ -121,21 +124,106 @@ class KeywordRetriever:
             ]
         }
 
-        print("KeywordRetriever query body:", body)
+        # Lean by default: chunk bodies are hydrated later, only for survivors.
+        # Stored embeddings (elastic_hybrid) are never returned.
+        body["_source"] = {"excludes": ["embedding"] if include_content else ["content", "embedding"]}
+
+        return body
+
+    async def search(
+        self,
+        query: str,
+        user_id: str,
+        document_id: Optional[str] = None,
+        source: Optional[str] = None,
+        top_k: int = 10,
+        expanded_keywords: Optional[List[str]] = None,
+        expanded_search_terms: Optional[List[str]] = None,
+        include_content: bool = False,
+    ) -> List[Dict[str, Any]]:
+        if not query or not query.strip():
+            return []
+
+        client = elastic_bus.get_client()
 
-        response = await client.search(index=self.index_name, body=body)
+        body = self._build_search_body(
+            query=query,
+            user_id=user_id,
+            document_id=document_id,
+            source=source,
+            top_k=top_k,
+            expanded_keywords=expanded_keywords,
+            expanded_search_terms=expanded_search_terms,
+            include_content=include_content,
+        )
+
+        response = await client.search(body=body, **self._target(user_id))
         hits = response.get("hits", {}).get("hits", [])
 
-        print("KeywordRetriever top hits:", [
-            {
-                "id": hit.get("_source", {}).get("id"),
-                "score": hit.get("_score")
-            }
-            for hit in hits[:5]
-        ])
+        if debug_enabled(logger):
+            logger.debug("Keyword search", extra={"fields": {
+                "query_body": body,
+                "top_hits": [
+                    {"id": hit.get("_source", {}).get("id"), "score": hit.get("_score")}
+                    for hit in hits[:5]
+                ],
+            }})
 
         return [self._normalize_hit(hit) for hit in hits]
 
+    async def search_many(
+        self,
+        queries: List[Dict[str, Any]],
+        user_id: str,
+        document_id: Optional[str] = None,
+        source: Optional[str] = None,
+        top_k: int = 10,
+        include_content: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run many keyword searches in a single _msearch round trip.
+
+        Each entry in queries is {"query", "expanded_keywords", "expanded_search_terms"}.
+        Returns one result list per query, same order.
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+
+        searches: List[Dict[str, Any]] = []
+        active: List[int] = []
+
+        for idx, item in enumerate(queries):
+            query = (item.get("query") or "").strip()
+            if not query:
+                continue
+
+            active.append(idx)
+            searches.append({})
+            searches.append(self._build_search_body(
+                query=query,
+                user_id=user_id,
+                document_id=document_id,
+                source=source,
+                top_k=top_k,
+                expanded_keywords=item.get("expanded_keywords"),
+                expanded_search_terms=item.get("expanded_search_terms"),
+                include_content=include_content,
+            ))
+
+        if not active:
+            return results
+
+        client = elastic_bus.get_client()
+        response = await client.msearch(searches=searches, **self._target(user_id))
+
+        for idx, item_response in zip(active, response.get("responses", [])):
+            if "error" in item_response:
+                raise RuntimeError(f"Keyword msearch failed for query {idx}: {item_response['error']}")
+
+            hits = item_response.get("hits", {}).get("hits", [])
+            results[idx] = [self._normalize_hit(hit) for hit in hits]
+
+        return results
+
     @staticmethod
     def _normalize_hit(hit: Dict[str, Any]) -> Dict[str, Any]:
         source = hit.get("_source", {})
@@ -146,7 +234,8 @@ class KeywordRetriever:
             "source": source.get("source"),
             "page": source.get("page"),
             "chunk_index": source.get("chunk_index"),
-            "content": source.get("content", ""),
+            "start_index": source.get("start_index"),
+            "content": source.get("content"),
             "summary": source.get("summary"),
             "keywords": source.get("keywords"),
             "search_terms": source.get("search_terms"),
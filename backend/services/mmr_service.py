@@ -0,0 +1,135 @@
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from backend.config import settings
+from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.utils.bounded_executor import vector_executor
+
+
+class MMRService:
+    """
+    Maximal marginal relevance over fused candidates, before reranking.
+
+    Uses the chunk vectors Chroma already stores (one batched get) plus the
+    query embedding retrieval already computed (embedded here only when it
+    is not passed in); all pairwise similarities come from a single matrix
+    product. Each pick maximises
+
+        lambda * sim(query, d) - (1 - lambda) * max sim(d, picked)
+
+    so near-duplicate chunks stop taking several rerank slots. Candidates
+    without a stored vector keep their fused order after the MMR picks.
+    """
+
+    @staticmethod
+    def candidate_pool_size(default: int = 10) -> int:
+        """
+        Candidates each retriever / fusion should return. With MMR on, a
+        wider pool is retrieved and MMR narrows it to MMR_TOP_K.
+        """
+        if settings.MMR_ENABLED:
+            return max(settings.MMR_CANDIDATE_POOL, settings.MMR_TOP_K)
+        return default
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    @staticmethod
+    def select(
+        query_vector: np.ndarray,
+        doc_vectors: np.ndarray,
+        top_k: int,
+        lambda_mult: float,
+    ) -> List[int]:
+        """
+        Greedy MMR: row indices of `doc_vectors`, in pick order.
+        """
+        count = doc_vectors.shape[0]
+        if count == 0 or top_k <= 0:
+            return []
+
+        docs = MMRService._normalize(doc_vectors.astype(np.float32, copy=False))
+        query = MMRService._normalize(query_vector.astype(np.float32, copy=False))
+
+        relevance = docs @ query
+        similarity = docs @ docs.T
+
+        picked: List[int] = [int(np.argmax(relevance))]
+        available = np.ones(count, dtype=bool)
+        available[picked[0]] = False
+        # Highest similarity of every candidate to anything picked so far.
+        redundancy = similarity[picked[0]].copy()
+
+        while len(picked) < min(top_k, count):
+            scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+            scores[~available] = -np.inf
+
+            best = int(np.argmax(scores))
+            picked.append(best)
+            available[best] = False
+            np.maximum(redundancy, similarity[best], out=redundancy)
+
+        return picked
+
+    @staticmethod
+    def _diversify_blocking(
+        query: str,
+        candidates: List[Dict[str, Any]],
+        user_id: str,
+        top_k: int,
+        lambda_mult: float,
+        query_vector: Optional[List[float]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        chunk_ids = [item.get("chunk_id") for item in candidates]
+        stored = EmbeddingService.stored_embeddings(
+            user_id,
+            [chunk_id for chunk_id in chunk_ids if chunk_id],
+        )
+
+        with_vectors = [idx for idx, chunk_id in enumerate(chunk_ids) if chunk_id in stored]
+        if len(with_vectors) < 2:
+            return candidates[:top_k], 0
+
+        if query_vector is None:
+            query_vector = EmbeddingService.embed_texts([query])[0]
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        doc_vectors = np.asarray([stored[chunk_ids[idx]] for idx in with_vectors], dtype=np.float32)
+
+        order = [with_vectors[row] for row in MMRService.select(query_vector, doc_vectors, top_k, lambda_mult)]
+        picked = set(order)
+        order += [idx for idx in range(len(candidates)) if idx not in picked][: top_k - len(order)]
+
+        # How many of the fused top_k MMR swapped out.
+        displaced = len(set(range(min(top_k, len(candidates)))) - set(order))
+
+        return [candidates[idx] for idx in order], displaced
+
+    @staticmethod
+    async def diversify(
+        query: str,
+        candidates: List[Dict[str, Any]],
+        user_id: Optional[str],
+        top_k: int,
+        lambda_mult: float,
+        query_vector: Optional[List[float]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return up to `top_k` diverse candidates (MMR pick order) and how
+        many of the fused top_k they displaced.
+        """
+        if not query or not user_id or len(candidates) <= top_k:
+            return candidates[:top_k], 0
+
+        return await vector_executor.run(
+            MMRService._diversify_blocking,
+            query,
+            candidates,
+            user_id,
+            top_k,
+            lambda_mult,
+            query_vector,
+        )
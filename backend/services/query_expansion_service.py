@@ -1,10 +1,13 @@
-import instructor
-from groq import AsyncGroq
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
 from backend.config import settings
+from backend.clients.groq_client import groq_clients
+from backend.utils.circuit_breaker import groq_breaker
 from backend.utils.prompt_loader import load_prompt
+from backend.utils.logging_setup import get_logger
+
+logger = get_logger("query_expansion")
 
 
 class QueryExpansionResult(BaseModel):
@@ -18,10 +21,9 @@ class QueryExpansionResult(BaseModel):
 class QueryExpansionService:
     @staticmethod
     def _get_instructor_client():
-        return instructor.from_groq(
-            AsyncGroq(api_key=settings.GROQ_API_KEY),
-            mode=instructor.Mode.JSON
-        )
+        # Shared client: building one per query opened a new pool and TLS
+        # handshake on every request.
+        return groq_clients.instructor_async_client
 
     @staticmethod
     def _normalize_terms(values: List[str]) -> List[str]:
@@ -45,7 +47,7 @@ class QueryExpansionService:
         return cleaned
 
     @staticmethod
-    async def expand_query(query: str) -> QueryExpansionResult:
+    async def expand_query(query: str, timeout: Optional[float] = None) -> QueryExpansionResult:
         if not query or not query.strip():
             return QueryExpansionResult()
 
@@ -62,19 +64,22 @@ class QueryExpansionService:
                 query=query.strip()
             )
         except Exception as e:
-            print(f"Query Expansion Prompt Loading Failed: {e}")
+            logger.error("Query expansion prompt loading failed: %s", e)
             raise
 
         try:
-            result = await client.chat.completions.create(
-                model=settings.GROQ_MODEL,
-                response_model=QueryExpansionResult,
-                messages=[
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": user_msg}
-                ],
-                max_retries=2,
-            )
+            # An open circuit raises CircuitOpenError into the fallback below;
+            # running past `timeout` counts against the breaker and is re-raised.
+            async with groq_breaker.guard(timeout):
+                result = await client.chat.completions.create(
+                    model=settings.GROQ_MODEL,
+                    response_model=QueryExpansionResult,
+                    messages=[
+                        {"role": "system", "content": system_msg},
+                        {"role": "user", "content": user_msg}
+                    ],
+                    max_retries=2,
+                )
 
             result.keywords = QueryExpansionService._normalize_terms(result.keywords)
             result.search_terms = QueryExpansionService._normalize_terms(result.search_terms)
@@ -84,8 +89,11 @@ class QueryExpansionService:
 
             return result
 
+        except TimeoutError:
+            raise
+
         except Exception as e:
-            print(f"Query Expansion Failed: {e}")
+            logger.warning("Query expansion failed, using the raw query: %s", e)
 
             # better fallback than empty arrays
             return QueryExpansionResult(
@@ -0,0 +1,206 @@
+import asyncio
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from backend.config import settings
+from backend.clients.cohere_client import co_bus
+from backend.utils.circuit_breaker import cohere_breaker
+from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.utils.bounded_executor import vector_executor
+
+
+class RerankBackend(ABC):
+    """
+    Scores rerank documents against a query.
+
+    Implementations return (candidate_index, relevance_score) pairs for the
+    best `top_n` documents, highest score first, and raise TimeoutError
+    when scoring takes longer than `timeout` seconds.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    async def score(
+        self,
+        query: str,
+        documents: List[str],
+        candidates: List[Dict[str, Any]],
+        top_n: int,
+        user_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _top_n(scores: np.ndarray, top_n: int) -> List[Tuple[int, float]]:
+        order = np.argsort(-scores, kind="stable")[:top_n]
+        return [(int(idx), float(scores[idx])) for idx in order]
+
+
+class CohereRerankBackend(RerankBackend):
+    """
+    Cohere hosted rerank model.
+    """
+
+    name = "cohere"
+
+    async def score(
+        self,
+        query: str,
+        documents: List[str],
+        candidates: List[Dict[str, Any]],
+        top_n: int,
+        user_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        # Bounded inside the breaker so a stalled Cohere counts as a failure.
+        async with cohere_breaker.guard(timeout):
+            response = await co_bus.async_client.rerank(
+                model=settings.COHERE_RERANK_MODEL,
+                query=query,
+                documents=documents,
+                top_n=top_n,
+            )
+
+        return [(item.index, float(item.relevance_score)) for item in response.results]
+
+
+class CrossEncoderRerankBackend(RerankBackend):
+    """
+    Local CPU cross-encoder (sentence-transformers), scored in batches on
+    vector_executor so inference never blocks the event loop.
+    """
+
+    name = "cross_encoder"
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_model():
+        from sentence_transformers import CrossEncoder
+
+        return CrossEncoder(settings.LOCAL_RERANK_MODEL, device="cpu")
+
+    @staticmethod
+    def loaded() -> bool:
+        return CrossEncoderRerankBackend._get_model.cache_info().currsize > 0
+
+    @staticmethod
+    def _predict(query: str, documents: List[str]) -> np.ndarray:
+        model = CrossEncoderRerankBackend._get_model()
+        pairs = [(query, document) for document in documents]
+
+        scores = model.predict(
+            pairs,
+            batch_size=settings.LOCAL_RERANK_BATCH_SIZE,
+            show_progress_bar=False,
+        )
+        return np.asarray(scores, dtype=np.float32)
+
+    async def score(
+        self,
+        query: str,
+        documents: List[str],
+        candidates: List[Dict[str, Any]],
+        top_n: int,
+        user_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        async with asyncio.timeout(timeout):
+            scores = await vector_executor.run(self._predict, query, documents)
+        return self._top_n(scores, top_n)
+
+
+class EmbeddingRerankBackend(RerankBackend):
+    """
+    Cosine similarity between the query embedding and the chunk embeddings
+    Chroma already holds. Candidates without a stored vector (or calls
+    without a user_id) are embedded on the fly in the same batch, from
+    their raw chunk content like at ingestion: the rerank document's
+    Source/Page/Summary prefixes would make those scores incomparable.
+    """
+
+    name = "embedding"
+
+    @staticmethod
+    def _cosine_scores(
+        query: str,
+        documents: List[str],
+        candidates: List[Dict[str, Any]],
+        user_id: Optional[str],
+    ) -> np.ndarray:
+        embed = EmbeddingService.get_embedding_function()
+
+        chunk_ids = [item.get("chunk_id") for item in candidates]
+        stored = EmbeddingService.stored_embeddings(
+            user_id,
+            [chunk_id for chunk_id in chunk_ids if chunk_id],
+        )
+
+        missing = [idx for idx, chunk_id in enumerate(chunk_ids) if chunk_id not in stored]
+        fresh = embed([query] + [
+            candidates[idx].get("content") or candidates[idx].get("summary") or ""
+            for idx in missing
+        ])
+
+        query_vector = np.asarray(fresh[0], dtype=np.float32)
+        dim = query_vector.shape[0]
+
+        matrix = np.zeros((len(candidates), dim), dtype=np.float32)
+        for idx, chunk_id in enumerate(chunk_ids):
+            if chunk_id in stored:
+                matrix[idx] = stored[chunk_id]
+        for offset, idx in enumerate(missing, start=1):
+            matrix[idx] = fresh[offset]
+
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query_vector) or 1.0)
+        norms[norms == 0] = 1.0
+
+        return (matrix @ query_vector) / norms
+
+    async def score(
+        self,
+        query: str,
+        documents: List[str],
+        candidates: List[Dict[str, Any]],
+        top_n: int,
+        user_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        async with asyncio.timeout(timeout):
+            scores = await vector_executor.run(
+                self._cosine_scores,
+                query,
+                documents,
+                candidates,
+                user_id,
+            )
+        return self._top_n(scores, top_n)
+
+
+RERANK_BACKENDS: Dict[str, RerankBackend] = {
+    backend.name: backend
+    for backend in (
+        CohereRerankBackend(),
+        CrossEncoderRerankBackend(),
+        EmbeddingRerankBackend(),
+    )
+}
+
+
+def get_rerank_backend(name: Optional[str] = None) -> RerankBackend:
+    """
+    Resolve a backend by name, defaulting to settings.RERANK_BACKEND.
+    """
+    backend_name = name or settings.RERANK_BACKEND
+
+    if backend_name not in RERANK_BACKENDS:
+        raise ValueError(
+            f"Unknown rerank backend '{backend_name}'. "
+            f"Expected one of: {', '.join(RERANK_BACKENDS)}"
+        )
+
+    return RERANK_BACKENDS[backend_name]
@@ -1,13 +1,18 @@
+import asyncio
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from backend.config import settings
-from backend.clients.cohere_client import co_bus
+from backend.services.rerank_backends import get_rerank_backend
+from backend.utils.logging_setup import get_logger, debug_enabled
+
+logger = get_logger("reranker")
 
 
 class RerankerService:
     """
-    Reranks fused retrieval candidates using Cohere.
+    Reranks fused retrieval candidates using a pluggable backend
+    (Cohere by default, see rerank_backends for the local ones).
 
     Intended flow:
     query
@@ -66,66 +71,107 @@ class RerankerService:
         return documents
 
     @staticmethod
-    def rerank(
+    def _fallback(
+        candidates: List[Dict[str, Any]],
+        top_k: int,
+        rerank_path: str,
+    ) -> Dict[str, Any]:
+        """
+        Keep the fused ordering when the reranker is unavailable or too slow.
+        """
+        fallback = []
+        for item in candidates[:top_k]:
+            copy_item = dict(item)
+            copy_item["rerank_score"] = 0.0
+            fallback.append(copy_item)
+
+        return {
+            "results": fallback,
+            "rerank_path": rerank_path,
+        }
+
+    @staticmethod
+    async def rerank(
         query: str,
         candidates: List[Dict[str, Any]],
         top_k: int = 5,
         use_summary: bool = True,
-    ) -> List[Dict[str, Any]]:
-        if not query or not query.strip():
-            return []
+        timeout: Optional[float] = None,
+        backend: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Rerank candidates with the selected backend within a latency budget.
+
+        Returns {"results": [...], "rerank_path": ...} where rerank_path is:
+        - the backend name ("cohere", "cross_encoder", "embedding"): the
+          backend answered within the budget
+        - "timeout_fallback": budget exceeded, fused ordering returned
+        - "error_fallback": backend failed, fused ordering returned
+        - "deadline_skipped": no budget left, fused ordering returned
+        - "skipped": nothing to rerank
+        """
+        if not query or not query.strip() or not candidates:
+            return {
+                "results": [],
+                "rerank_path": "skipped",
+            }
 
-        if not candidates:
-            return []
+        if timeout is not None and timeout <= 0:
+            logger.warning("No latency budget left for reranking, keeping fused order")
+            return RerankerService._fallback(candidates, top_k, "deadline_skipped")
 
         documents = RerankerService._build_rerank_documents(
             candidates=candidates,
             use_summary=use_summary,
         )
 
-        print("Reranker input chunk_ids:", [c.get("chunk_id") for c in candidates[:10]])
+        rerank_backend = get_rerank_backend(backend)
+        budget = settings.RERANK_TIMEOUT_SECONDS if timeout is None else timeout
 
         try:
-            response = co_bus.client.rerank(
-                model=settings.COHERE_RERANK_MODEL,
+            scored = await rerank_backend.score(
                 query=query.strip(),
                 documents=documents,
+                candidates=candidates,
                 top_n=min(top_k, len(documents)),
+                user_id=user_id,
+                timeout=budget,
             )
 
-            reranked_results: List[Dict[str, Any]] = []
-
-            for item in response.results:
-                original_idx = item.index
-                original_candidate = candidates[original_idx]
+        except asyncio.TimeoutError:
+            logger.warning("Reranking exceeded %ss budget, keeping fused order", budget)
+            return RerankerService._fallback(candidates, top_k, "timeout_fallback")
 
-                reranked_item = dict(original_candidate)
-                reranked_item["rerank_score"] = float(item.relevance_score)
+        except Exception as e:
+            logger.warning("Reranking failed, keeping fused order: %s", e)
+            return RerankerService._fallback(candidates, top_k, "error_fallback")
 
-                reranked_results.append(reranked_item)
+        reranked_results: List[Dict[str, Any]] = []
 
-            reranked_results.sort(
-                key=lambda x: x.get("rerank_score", 0.0),
-                reverse=True
-            )
+        for original_idx, relevance_score in scored:
+            original_candidate = candidates[original_idx]
 
-            print("Reranker top results:", [
-                {
-                    "chunk_id": r.get("chunk_id"),
-                    "rerank_score": r.get("rerank_score")
-                }
-                for r in reranked_results
-            ])
+            reranked_item = dict(original_candidate)
+            reranked_item["rerank_score"] = float(relevance_score)
 
-            return reranked_results
+            reranked_results.append(reranked_item)
 
-        except Exception as e:
-            print(f"Reranking Failed: {e}")
-
-            fallback = []
-            for item in candidates[:top_k]:
-                copy_item = dict(item)
-                copy_item["rerank_score"] = 0.0
-                fallback.append(copy_item)
+        reranked_results.sort(
+            key=lambda x: x.get("rerank_score", 0.0),
+            reverse=True
+        )
 
-            return fallback
\ No newline at end of file
+        if debug_enabled(logger):
+            logger.debug("Reranked", extra={"fields": {
+                "input_chunk_ids": [c.get("chunk_id") for c in candidates[:10]],
+                "top_results": [
+                    {"chunk_id": r.get("chunk_id"), "rerank_score": r.get("rerank_score")}
+                    for r in reranked_results
+                ],
+            }})
+
+        return {
+            "results": reranked_results,
+            "rerank_path": rerank_backend.name,
+        }
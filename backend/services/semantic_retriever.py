@@ -1,18 +1,102 @@
 from typing import Optional, List, Dict, Any
 
 from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.utils.bounded_executor import vector_executor
+from backend.utils.logging_setup import get_logger, debug_enabled
+
+logger = get_logger("semantic_retriever")
 
 
 class SemanticRetriever:
     """
     Chroma semantic retriever.
 
-    Temporary simplified behavior:
-    - collection is already scoped per user_id
-    - no metadata filtering for now
-    - original user query only for embeddings
+    Behavior:
+    - collection is scoped per user_id, or shared and filtered on user_id
+      under the sharded CHROMA_LAYOUT (EmbeddingService.tenant_where)
+    - document_id / source are applied as a Chroma `where` prefilter, so a
+      scoped query only searches that document's vectors
+    - original user query only for embeddings; a caller that already has
+      its vector (embed_query) passes it in, so a request embeds it once
+
+    Collection lookup, query embedding and the HNSW search are all blocking,
+    so they run together on vector_executor rather than on the event loop.
     """
 
+    @staticmethod
+    def _include_fields(include_content: bool) -> List[str]:
+        # Lean by default: chunk bodies are hydrated later, only for survivors.
+        if include_content:
+            return ["documents", "metadatas", "distances"]
+        return ["metadatas", "distances"]
+
+    @staticmethod
+    def _build_where(
+        document_id: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        conditions: List[Dict[str, Any]] = []
+
+        if document_id:
+            conditions.append({"document_id": document_id})
+
+        if source:
+            conditions.append({"source": source})
+
+        if not conditions:
+            return None
+
+        if len(conditions) == 1:
+            return conditions[0]
+
+        return {"$and": conditions}
+
+    @staticmethod
+    def _query_collection(
+        user_id: str,
+        query: str,
+        top_k: int,
+        include_content: bool = False,
+        where: Optional[Dict[str, Any]] = None,
+        query_vector: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        collection = EmbeddingService.get_collection(user_id)
+
+        return collection.query(
+            query_embeddings=[query_vector if query_vector is not None else EmbeddingService.embed_texts([query])[0]],
+            n_results=top_k,
+            where=EmbeddingService.tenant_where(user_id, where),
+            include=SemanticRetriever._include_fields(include_content),
+        )
+
+    @staticmethod
+    def _query_collection_many(
+        user_id: str,
+        queries: List[str],
+        top_k: int,
+        include_content: bool = False,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Embed every query in one model call and search them in one Chroma call.
+        """
+        collection = EmbeddingService.get_collection(user_id)
+        query_embeddings = EmbeddingService.embed_texts(queries)
+
+        return collection.query(
+            query_embeddings=query_embeddings,
+            n_results=top_k,
+            where=EmbeddingService.tenant_where(user_id, where),
+            include=SemanticRetriever._include_fields(include_content),
+        )
+
+    @staticmethod
+    async def embed_query(query: str) -> List[float]:
+        """
+        The query's embedding, computed on vector_executor.
+        """
+        return (await vector_executor.run(EmbeddingService.embed_texts, [query.strip()]))[0]
+
     async def search(
         self,
         query: str,
@@ -20,51 +104,95 @@ class SemanticRetriever:
         document_id: Optional[str] = None,
         source: Optional[str] = None,
         top_k: int = 10,
+        include_content: bool = False,
+        query_vector: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         if not query or not query.strip():
             return []
 
-        collection = EmbeddingService.get_collection(user_id)
-
         try:
-            response = collection.query(
-                query_texts=[query.strip()],
-                n_results=top_k,
-                include=["documents", "metadatas", "distances"],
+            response = await vector_executor.run(
+                self._query_collection,
+                user_id,
+                query.strip(),
+                top_k,
+                include_content,
+                self._build_where(document_id, source),
+                query_vector,
             )
 
             results = self._normalize_response(response)
 
-            print("Semantic returned chunk ids:", [r["chunk_id"] for r in results[:10]])
-            print("Semantic distances:", [r.get("distance") for r in results[:10]])
-            print("Semantic pages:", [r.get("page") for r in results[:10]])
+            if debug_enabled(logger):
+                logger.debug("Semantic search", extra={"fields": {
+                    "chunk_ids": [r["chunk_id"] for r in results[:10]],
+                    "distances": [r.get("distance") for r in results[:10]],
+                    "pages": [r.get("page") for r in results[:10]],
+                }})
+
+            return results
+
+        except Exception:
+            logger.exception("Semantic retrieval failed")
+            raise
 
+    async def search_many(
+        self,
+        queries: List[str],
+        user_id: str,
+        document_id: Optional[str] = None,
+        source: Optional[str] = None,
+        top_k: int = 10,
+        include_content: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Batched variant of search: one result list per query, same order.
+        """
+        cleaned = [(query or "").strip() for query in queries]
+        active = [idx for idx, query in enumerate(cleaned) if query]
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in cleaned]
+        if not active:
             return results
 
-        except Exception as e:
-            print(f"Semantic Retriever Error: {e}")
+        try:
+            response = await vector_executor.run(
+                self._query_collection_many,
+                user_id,
+                [cleaned[idx] for idx in active],
+                top_k,
+                include_content,
+                self._build_where(document_id, source),
+            )
+        except Exception:
+            logger.exception("Semantic batch retrieval failed")
             raise
 
+        for row, idx in enumerate(active):
+            results[idx] = self._normalize_response(response, row=row)
+
+        return results
+
     @staticmethod
-    def _normalize_response(response: Dict[str, Any]) -> List[Dict[str, Any]]:
-        ids = response.get("ids", [[]])
-        documents = response.get("documents", [[]])
-        metadatas = response.get("metadatas", [[]])
-        distances = response.get("distances", [[]])
+    def _normalize_response(response: Dict[str, Any], row: int = 0) -> List[Dict[str, Any]]:
+        ids = response.get("ids") or []
+        documents = response.get("documents") or []
+        metadatas = response.get("metadatas") or []
+        distances = response.get("distances") or []
 
-        if not ids or not ids[0]:
+        if len(ids) <= row or not ids[row]:
             return []
 
-        result_ids = ids[0]
-        result_docs = documents[0] if documents else []
-        result_metas = metadatas[0] if metadatas else []
-        result_distances = distances[0] if distances else []
+        result_ids = ids[row]
+        result_docs = documents[row] if len(documents) > row else []
+        result_metas = metadatas[row] if len(metadatas) > row else []
+        result_distances = distances[row] if len(distances) > row else []
 
         results: List[Dict[str, Any]] = []
 
         for idx, chunk_id in enumerate(result_ids):
             metadata = result_metas[idx] if idx < len(result_metas) else {}
-            content = result_docs[idx] if idx < len(result_docs) else ""
+            content = result_docs[idx] if idx < len(result_docs) else None
             distance = result_distances[idx] if idx < len(result_distances) else None
 
             results.append({
@@ -74,6 +202,7 @@ class SemanticRetriever:
                 "source_name": metadata.get("source_name"),
                 "page": metadata.get("page"),
                 "chunk_index": metadata.get("chunk_index"),
+                "start_index": metadata.get("start_index"),
                 "content": content,
                 "summary": metadata.get("summary"),
                 "keywords": SemanticRetriever._split_csv_field(metadata.get("keywords")),
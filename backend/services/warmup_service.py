@@ -0,0 +1,112 @@
+import time
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+from backend.config import settings
+from backend.utils.bounded_executor import vector_executor
+from backend.utils.metrics import record_stage
+from backend.utils.prompt_loader import warm_prompts
+from backend.utils.logging_setup import get_logger
+
+logger = get_logger("warmup")
+
+
+class WarmupState:
+    """
+    Progress of the startup warm-up, read by /ready.
+    status: pending -> running -> ready | failed
+    """
+
+    def __init__(self) -> None:
+        self.status = "pending"
+        self.steps: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.total_ms: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def mark_ready(self) -> None:
+        self.status = "ready"
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "steps_ms": dict(self.steps),
+            "total_ms": self.total_ms,
+            "error": self.error,
+        }
+
+
+warmup_state = WarmupState()
+
+
+def _build_llm_clients() -> None:
+    from backend.clients.gemini_client import gemini_bus
+    from backend.clients.groq_client import groq_clients
+    from backend.clients.cohere_client import co_bus
+
+    gemini_bus.model
+    groq_clients.instructor_async_client
+    co_bus.async_client
+
+
+def _load_embedding_model() -> None:
+    from backend.services.ingestion.embedding_service import EmbeddingService
+
+    # One real forward pass, so the first request does not pay for lazy init.
+    EmbeddingService.embed_texts(["warm-up"])
+
+
+def _load_rerank_model() -> None:
+    from backend.services.rerank_backends import CrossEncoderRerankBackend
+
+    CrossEncoderRerankBackend._get_model()
+
+
+class WarmupService:
+    """
+    Loads what imports no longer load eagerly: compiled prompts, provider
+    SDK clients, the embedding model and (if configured) the cross-encoder.
+    Runs as a background task from the lifespan; each step is timed into
+    the `startup` pipeline metrics and /ready turns green once all pass.
+    """
+
+    @staticmethod
+    def steps() -> List[Tuple[str, Callable[[], Any]]]:
+        steps: List[Tuple[str, Callable[[], Any]]] = [("prompts", warm_prompts)]
+
+        if settings.WARMUP_LLM_CLIENTS:
+            steps.append(("llm_clients", _build_llm_clients))
+
+        if settings.WARMUP_EMBEDDING_MODEL:
+            steps.append(("embedding_model", _load_embedding_model))
+
+        if settings.RERANK_BACKEND == "cross_encoder" or settings.WARMUP_RERANK_MODEL:
+            steps.append(("rerank_model", _load_rerank_model))
+
+        return steps
+
+    @staticmethod
+    async def run(state: WarmupState = warmup_state) -> WarmupState:
+        state.status = "running"
+        started = time.perf_counter()
+
+        for name, step in WarmupService.steps():
+            step_started = time.perf_counter()
+
+            try:
+                # Blocking (imports, model weights): keep it off the event loop.
+                await vector_executor.run(step)
+            except Exception as e:
+                logger.exception("Warm-up step '%s' failed", name)
+                state.status = "failed"
+                state.error = f"{name}: {e}"
+                return state
+
+            state.steps[name] = record_stage("startup", name, time.perf_counter() - step_started)
+
+        state.total_ms = record_stage("startup", "warmup", time.perf_counter() - started)
+        state.mark_ready()
+        logger.info("Warm-up complete in %.0f ms", state.total_ms, extra={"fields": {"steps_ms": state.steps}})
+        return state
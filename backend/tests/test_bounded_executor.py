@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from backend.utils.bounded_executor import BoundedExecutor, ExecutorSaturatedError
+
+
+def test_cancelled_callers_keep_slots_until_their_jobs_finish():
+    async def scenario():
+        executor = BoundedExecutor("test", max_workers=1, max_queue=1, queue_timeout=0.0)
+        try:
+            results = await asyncio.gather(
+                *(asyncio.wait_for(executor.run(time.sleep, 0.3), 0.01) for _ in range(10)),
+                return_exceptions=True,
+            )
+
+            timed_out = sum(isinstance(result, asyncio.TimeoutError) for result in results)
+            rejected = sum(isinstance(result, ExecutorSaturatedError) for result in results)
+            assert (timed_out, rejected) == (2, 8)
+
+            # The running job keeps its slot after its caller gave up; only
+            # the cancelled queued job's slot is free again.
+            assert executor.stats()["running"] == 1
+            refill = asyncio.ensure_future(executor.run(time.sleep, 0))
+            await asyncio.sleep(0)
+            try:
+                await executor.run(time.sleep, 0)
+            except ExecutorSaturatedError:
+                pass
+            else:
+                raise AssertionError("admitted more jobs than workers + queue")
+            await refill
+
+            stats = executor.stats()
+            assert (stats["running"], stats["queued"], stats["completed"], stats["cancelled"]) == (0, 0, 2, 1)
+
+            await executor.run(time.sleep, 0)
+        finally:
+            executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_job_cancelled_before_start_releases_its_queue_slot():
+    async def scenario():
+        executor = BoundedExecutor("test", max_workers=1, max_queue=1, queue_timeout=0.0)
+        try:
+            running = asyncio.ensure_future(executor.run(time.sleep, 0.3))
+            await asyncio.sleep(0.05)
+
+            queued = asyncio.ensure_future(executor.run(time.sleep, 0.3))
+            await asyncio.sleep(0)
+            assert executor.stats()["queued"] == 1
+
+            queued.cancel()
+            await asyncio.gather(queued, return_exceptions=True)
+            await asyncio.sleep(0)
+
+            stats = executor.stats()
+            assert (stats["queued"], stats["cancelled"]) == (0, 1)
+
+            # The freed queue slot admits a new job while the first still runs.
+            await asyncio.wait_for(executor.run(time.sleep, 0), 1.0)
+            await running
+        finally:
+            executor.shutdown()
+
+    asyncio.run(scenario())
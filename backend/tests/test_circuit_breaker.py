@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+def test_calls_past_their_timeout_open_the_breaker():
+    async def scenario():
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=60.0)
+
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                async with breaker.guard(0.01):
+                    await asyncio.sleep(1)
+
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            async with breaker.guard(0.01):
+                pass
+
+    asyncio.run(scenario())
+
+
+def test_outside_cancellation_is_not_counted():
+    async def scenario():
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=60.0)
+
+        async def stalled():
+            async with breaker.guard():
+                await asyncio.sleep(1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(stalled(), 0.01)
+
+        assert (breaker.state, breaker.consecutive_failures) == ("closed", 0)
+
+    asyncio.run(scenario())
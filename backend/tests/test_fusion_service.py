@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from backend.services.fusion_service import FusionService
+
+
+def baseline_rrf(semantic_results, keyword_results, rrf_k=60, top_k=10):
+    """
+    The two-list RRF fuse() replaced, reduced to what ranking depends on.
+    """
+    fused_scores, presence, order = {}, {}, []
+
+    for source_name, results in (("semantic", semantic_results), ("keyword", keyword_results)):
+        for rank, item in enumerate(results, start=1):
+            chunk_id = item.get("chunk_id")
+            if not chunk_id:
+                continue
+
+            if chunk_id not in fused_scores:
+                order.append(chunk_id)
+            fused_scores[chunk_id] = fused_scores.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank)
+            presence.setdefault(chunk_id, {"semantic": False, "keyword": False})[source_name] = True
+
+    fused = [
+        {
+            "chunk_id": chunk_id,
+            "fused_score": float(round(fused_scores[chunk_id], 8)),
+            "semantic_match": presence[chunk_id]["semantic"],
+            "keyword_match": presence[chunk_id]["keyword"],
+        }
+        for chunk_id in order
+    ]
+    fused.sort(
+        key=lambda x: (x["fused_score"], 1 if x["semantic_match"] else 0, 1 if x["keyword_match"] else 0),
+        reverse=True,
+    )
+    return fused[:top_k]
+
+
+def ranking(results):
+    return [
+        (item["chunk_id"], item["fused_score"], item["semantic_match"], item["keyword_match"])
+        for item in results
+    ]
+
+
+def fuse_rrf(semantic_results, keyword_results, top_k=10):
+    return FusionService.fuse(
+        ranked_lists={"semantic": semantic_results, "keyword": keyword_results},
+        method="rrf",
+        rrf_k=60,
+        top_k=top_k,
+    )
+
+
+def hits(*chunk_ids):
+    return [{"chunk_id": chunk_id, "score": 1.0} for chunk_id in chunk_ids]
+
+
+@pytest.mark.parametrize("semantic, keyword", [
+    (hits("a", "b", "c", "d"), hits("c", "a", "e")),
+    # Ties: every candidate appears once at the same rank in one list.
+    (hits("a", "b"), hits("c", "d")),
+    # Items without a chunk_id still take up a rank.
+    (hits(None, "a", "", "b"), hits("b", None, "c")),
+    # A repeated chunk earns credit for every position.
+    (hits("a", "b", "a", "c"), hits("c", "c", "d")),
+    ([], hits("a", "b")),
+    ([], []),
+])
+def test_rrf_matches_the_baseline_two_list_fusion(semantic, keyword):
+    for top_k in (1, 2, 3, 10):
+        assert ranking(fuse_rrf(semantic, keyword, top_k)) == ranking(baseline_rrf(semantic, keyword, top_k=top_k))
+
+
+def test_rrf_matches_the_baseline_on_random_lists():
+    rng = random.Random(7)
+    pool = [f"chunk_{idx}" for idx in range(40)] + [None]
+
+    for _ in range(200):
+        semantic = hits(*rng.choices(pool, k=rng.randint(0, 20)))
+        keyword = hits(*rng.choices(pool, k=rng.randint(0, 20)))
+        top_k = rng.randint(1, 25)
+
+        assert ranking(fuse_rrf(semantic, keyword, top_k)) == ranking(baseline_rrf(semantic, keyword, top_k=top_k))
+
+
+@pytest.mark.parametrize("top_k", [0, -1])
+def test_non_positive_top_k_returns_nothing(top_k):
+    assert fuse_rrf(hits("a", "b", "c"), hits("c", "d"), top_k) == []
+    assert FusionService.reciprocal_rank_fusion(hits("a", "b", "c"), hits("c", "d"), top_k=top_k) == []
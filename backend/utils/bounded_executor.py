@@ -0,0 +1,199 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from backend.config import settings
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    pass
+
+
+class BoundedExecutor:
+    """
+    Dedicated thread pool with a cap on how much work may wait for it.
+
+    Blocking calls (Chroma queries, sentence-transformer encoding) are
+    dispatched here so they overlap with async I/O instead of stalling the
+    event loop. At most `max_workers` calls run at once and at most
+    `max_queue` more may wait in the pool; further callers wait up to
+    `queue_timeout` seconds for a slot, then get ExecutorSaturatedError.
+
+    A slot is held by the job, not by the awaiting caller: a caller
+    cancelled by a wait_for budget leaves its job queued or running, and
+    the slot frees only when that job finishes or is cancelled unstarted.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        queue_timeout: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+        self._running = 0
+        self._queued = 0
+        self._waiting = 0
+        self._max_queued_seen = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"coeus-{self.name}",
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        return self._slots
+
+    async def _acquire_slot(self) -> None:
+        slots = self._get_slots()
+
+        if not slots.locked():
+            await slots.acquire()
+            return
+
+        if self.queue_timeout <= 0:
+            self._rejected += 1
+            raise ExecutorSaturatedError(
+                f"Executor '{self.name}' is saturated "
+                f"({self.max_workers} running, {self.max_queue} queued)."
+            )
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise ExecutorSaturatedError(
+                f"Timed out after {self.queue_timeout}s waiting for executor '{self.name}'."
+            )
+        finally:
+            self._waiting -= 1
+
+    def _run_tracked(self, fn: Callable[..., T], args: tuple, kwargs: Dict[str, Any]) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        slots: asyncio.Semaphore,
+        future: concurrent.futures.Future,
+    ) -> None:
+        """
+        Runs when the job finishes, or is cancelled before it started (its
+        caller gave up while it was still queued). Called from a worker
+        thread, so the slot is released on the loop.
+        """
+        with self._lock:
+            if future.cancelled():
+                # _run_tracked never ran, so the job is still counted as queued.
+                self._queued -= 1
+                self._cancelled += 1
+            elif future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+        try:
+            loop.call_soon_threadsafe(slots.release)
+        except RuntimeError:
+            # Loop already closed (shutdown): nothing left to admit.
+            pass
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on the pool and await its result.
+        """
+        await self._acquire_slot()
+        slots = self._get_slots()
+
+        with self._lock:
+            self._submitted += 1
+            self._queued += 1
+            self._max_queued_seen = max(self._max_queued_seen, self._queued)
+
+        loop = asyncio.get_running_loop()
+        # Carry the request context (request id for logs) into the worker.
+        context = contextvars.copy_context()
+
+        try:
+            future = self._get_executor().submit(context.run, self._run_tracked, fn, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            slots.release()
+            raise
+
+        future.add_done_callback(functools.partial(self._on_done, loop, slots))
+
+        # Cancelling the caller cancels the job only if it has not started.
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of pool utilisation and queue depth.
+        """
+        with self._lock:
+            running = self._running
+            queued = self._queued
+
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": queued,
+            "waiting_for_slot": self._waiting,
+            "max_queued_seen": self._max_queued_seen,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "cancelled": self._cancelled,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton Instance: Chroma queries and embedding model calls
+vector_executor = BoundedExecutor(
+    name="vector",
+    max_workers=settings.VECTOR_EXECUTOR_WORKERS,
+    max_queue=settings.VECTOR_EXECUTOR_MAX_QUEUE,
+    queue_timeout=settings.VECTOR_EXECUTOR_QUEUE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from backend.config import settings
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker around one upstream provider.
+
+    closed: calls pass; `failure_threshold` failures in a row open it.
+    open: calls fail fast with CircuitOpenError for `reset_seconds`.
+    half_open: one trial call passes; success closes, failure re-opens.
+
+    A call that runs past the `timeout` given to guard() counts as a
+    failure, so a provider that stalls instead of erroring still opens the
+    breaker. Callers with a deadline pass it there rather than wrapping the
+    call in wait_for: outside cancellation (client disconnect) is not
+    counted either way. Single event loop, so no locking.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.total_failures = 0
+        self.total_rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+
+        if state == "closed":
+            return True
+
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+
+        self.total_rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self.total_failures += 1
+
+        if self.trial_in_flight or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    @asynccontextmanager
+    async def guard(self, timeout: Optional[float] = None):
+        """
+        Wrap one upstream call (or a whole stream) in the breaker, bounded
+        by `timeout` seconds (TimeoutError) when given.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        try:
+            async with asyncio.timeout(timeout):
+                yield
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.trial_in_flight = False
+            raise
+        else:
+            self.record_success()
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        async with self.guard():
+            return await fn(*args, **kwargs)
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "retry_in_seconds": (
+                round(self.reset_seconds - (time.monotonic() - self.opened_at), 2)
+                if state == "open" else None
+            ),
+        }
+
+
+def _breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds=settings.CIRCUIT_RESET_SECONDS,
+    )
+
+
+groq_breaker = _breaker("groq")
+gemini_breaker = _breaker("gemini")
+cohere_breaker = _breaker("cohere")
+
+LLM_BREAKERS = (groq_breaker, gemini_breaker, cohere_breaker)
@@ -0,0 +1,58 @@
+import time
+from typing import Any, List, Mapping, Optional
+
+
+class Deadline:
+    """
+    Absolute request deadline on the monotonic clock.
+
+    The chat router creates one per request and stores `expires_at` in the
+    graph state as `deadline_at`; every node rebuilds it with from_state()
+    and asks for its own slice of whatever time is left.
+    """
+
+    def __init__(self, expires_at: float) -> None:
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + max(0.0, seconds))
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> Optional["Deadline"]:
+        expires_at = state.get("deadline_at")
+        return cls(expires_at) if expires_at is not None else None
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def budget(self, cap: float, reserve: float = 0.0) -> float:
+        """
+        Seconds a stage may spend: its own cap, shrunk so that `reserve`
+        seconds stay available for later stages.
+        """
+        return max(0.0, min(cap, self.remaining() - reserve))
+
+
+def stage_budget(state: Mapping[str, Any], cap: float, reserve: float = 0.0) -> float:
+    """
+    Budget for one stage, or just `cap` when the request has no deadline.
+    """
+    deadline = Deadline.from_state(state)
+    if deadline is None:
+        return cap
+    return deadline.budget(cap, reserve)
+
+
+def add_degraded(state: Mapping[str, Any], flag: str) -> List[str]:
+    """
+    Return the state's degradation flags with `flag` appended once.
+    """
+    flags: List[str] = list(state.get("degraded") or [])
+    if flag not in flags:
+        flags.append(flag)
+    return flags
+
@@ -0,0 +1,182 @@
+import copy
+import json
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from backend.config import settings
+from backend.utils.request_context import current_request_id, debug_sampled
+
+LOGGER_ROOT = "coeus_ai"
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Module logger under the `coeus_ai` namespace, so LOG_LEVELS can tune
+    one module (`coeus_ai.keyword_retriever=DEBUG`) or all of them.
+    """
+    return logging.getLogger(f"{LOGGER_ROOT}.{name}")
+
+
+def debug_enabled(logger: logging.Logger) -> bool:
+    """
+    Guard for verbose diagnostics: True only when `logger` emits DEBUG and
+    the current request is sampled. Check it before building the payload,
+    so disabled diagnostics cost one level check.
+    """
+    return logger.isEnabledFor(logging.DEBUG) and debug_sampled()
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps each record with the current request id. Runs in the calling
+    thread (on the queue handler), where the request context is visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_request_id()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line. Structured fields go in `extra={"fields": {...}}`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Human-readable lines for local runs; fields are appended as key=value.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.created))
+        line = f"{timestamp} {record.levelname:<7} {record.name} [{getattr(record, 'request_id', None) or '-'}] {record.getMessage()}"
+
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+
+        if record.exc_text:
+            line += "\n" + record.exc_text
+
+        return line
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without waiting: the request path
+    only merges the message arguments; formatting and the stdout write
+    happen on the listener. When the queue is full the record is dropped
+    and counted rather than blocking the event loop.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingManager:
+    """
+    Owns the queue handler / listener pair installed on the root logger.
+    """
+
+    def __init__(self) -> None:
+        self.handler: Optional[NonBlockingQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+
+    @staticmethod
+    def _parse_levels(spec: str) -> Dict[str, str]:
+        """
+        "coeus_ai.keyword_retriever=DEBUG,elastic_transport=WARNING"
+        """
+        levels: Dict[str, str] = {}
+
+        for item in spec.split(","):
+            if "=" not in item:
+                continue
+            name, level = item.split("=", 1)
+            if name.strip():
+                levels[name.strip()] = level.strip().upper()
+
+        return levels
+
+    def configure(self) -> None:
+        if self.listener is not None:
+            return
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        self.handler = NonBlockingQueueHandler(log_queue)
+        self.handler.addFilter(RequestIdFilter())
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(self.handler)
+        root.setLevel(settings.LOG_LEVEL.upper())
+
+        for name, level in self._parse_levels(settings.LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        self.listener = QueueListener(log_queue, stream_handler)
+        self.listener.start()
+
+    def shutdown(self) -> None:
+        """
+        Flush what is queued and stop the listener thread.
+        """
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self) -> Dict[str, Any]:
+        if self.handler is None:
+            return {"queued": 0, "dropped": 0}
+        return {"queued": self.handler.queue.qsize(), "dropped": self.handler.dropped}
+
+
+logging_manager = LoggingManager()
@@ -0,0 +1,337 @@
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Seconds. Covers sub-millisecond fusion up to slow LLM / ingestion stages.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+class Histogram:
+    """
+    Minimal thread-safe Prometheus histogram with labels.
+
+    Only what /metrics needs: cumulative buckets, _sum and _count per label
+    set, rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        bucket_idx = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+                self._series[key] = series
+
+            series["counts"][bucket_idx] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def _format_labels(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.label_names, key))
+        if extra is not None:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+
+        rendered = ",".join(
+            f'{name}="{_escape_label(value)}"'
+            for name, value in pairs
+        )
+        return "{" + rendered + "}"
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        with self._lock:
+            snapshot = {
+                key: (list(series["counts"]), series["sum"], series["count"])
+                for key, series in self._series.items()
+            }
+
+        for key in sorted(snapshot):
+            counts, total, count = snapshot[key]
+            cumulative = 0
+
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = self._format_labels(key, ("le", _format_float(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+            labels = self._format_labels(key, ("le", "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_format_float(total)}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+
+        return lines
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _render_samples(
+    name: str,
+    documentation: str,
+    kind: str,
+    samples: Dict[Tuple[Tuple[str, str], ...], float],
+) -> List[str]:
+    lines = [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} {kind}",
+    ]
+
+    for labels, value in samples.items():
+        rendered = ",".join(f'{label}="{_escape_label(str(v))}"' for label, v in labels)
+        rendered = "{" + rendered + "}" if rendered else ""
+        lines.append(f"{name}{rendered} {_format_float(value)}")
+
+    return lines
+
+
+def render_gauges(name: str, documentation: str, samples: Dict[Tuple[Tuple[str, str], ...], float]) -> List[str]:
+    """
+    Render one gauge family from {((label, value), ...): sample}.
+    """
+    return _render_samples(name, documentation, "gauge", samples)
+
+
+def render_counters(name: str, documentation: str, samples: Dict[Tuple[Tuple[str, str], ...], float]) -> List[str]:
+    """
+    Render one counter family from {((label, value), ...): sample}.
+    `name` must carry the `_total` suffix.
+    """
+    return _render_samples(name, documentation, "counter", samples)
+
+
+def _stats_families(
+    prefix: str,
+    documentation: str,
+    snapshots: Dict[Tuple[Tuple[str, str], ...], Dict[str, Any]],
+    counters: Dict[str, str],
+) -> List[str]:
+    """
+    Split stats() snapshots (keyed by their identifying labels) into one
+    `<prefix>_<field>_total` counter family per monotonic field in
+    `counters` ({field: help}) and one gauge family, labelled by `field`,
+    for the point-in-time rest.
+    """
+    def numeric(value: Any) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    lines: List[str] = []
+    for field, help_text in counters.items():
+        samples = {
+            labels: float(stats[field])
+            for labels, stats in snapshots.items()
+            if numeric(stats.get(field))
+        }
+        lines.extend(render_counters(f"{prefix}_{field}_total", help_text, samples))
+
+    gauges = {
+        labels + (("field", field),): float(value)
+        for labels, stats in snapshots.items()
+        for field, value in stats.items()
+        if field not in counters and numeric(value)
+    }
+    return lines + render_gauges(prefix, documentation, gauges)
+
+
+def executor_gauges(stats: Dict[str, Any]) -> List[str]:
+    """
+    Expose a BoundedExecutor.stats() snapshot: lifetime task counts as
+    counters, utilisation and queue depth as gauges.
+    """
+    return _stats_families(
+        "coeus_executor",
+        "BoundedExecutor utilisation and queue depth.",
+        {(("executor", stats.get("name", "")),): stats},
+        {
+            "submitted": "Tasks submitted to the executor.",
+            "completed": "Tasks that finished successfully.",
+            "failed": "Tasks that raised.",
+            "cancelled": "Tasks cancelled before finishing.",
+            "rejected": "Submissions rejected because the queue was full.",
+        },
+    )
+
+
+def http_pool_gauges(pools: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Expose HttpPools.stats(): request and error counts as counters,
+    connection usage and saturation as gauges, one sample per pool.
+    """
+    return _stats_families(
+        "coeus_http_pool",
+        "Outbound HTTP pool usage and saturation.",
+        {(("pool", pool),): stats for pool, stats in pools.items()},
+        {
+            "requests": "Requests sent through the pool.",
+            "queued_requests": "Requests that waited for a free connection.",
+            "errors": "Requests that failed at the transport.",
+        },
+    )
+
+
+def chunk_cache_gauges(stats: Dict[str, Any]) -> List[str]:
+    """
+    Expose ChunkCache.stats(): lookups as counters, size and hit rate as gauges.
+    """
+    return _stats_families(
+        "coeus_chunk_cache",
+        "Chunk document LRU size and hit rate.",
+        {(): stats},
+        {
+            "hits": "Chunk lookups served from the cache.",
+            "misses": "Chunk lookups that went to the stores.",
+        },
+    )
+
+
+def dependency_gauges(report: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Expose the last cached health report (never triggers a probe).
+    """
+    if not report:
+        return []
+
+    dependencies = report.get("dependencies", {})
+    up = {
+        (("dependency", name),): 1.0 if result.get("status") == "up" else 0.0
+        for name, result in dependencies.items()
+    }
+    latency = {
+        (("dependency", name),): result["latency_ms"] / 1000
+        for name, result in dependencies.items()
+        if result.get("latency_ms") is not None
+    }
+    circuits = {
+        (("provider", name),): {"closed": 0.0, "half_open": 1.0, "open": 2.0}[circuit["state"]]
+        for name, circuit in report.get("llm_circuits", {}).items()
+    }
+
+    return (
+        render_gauges("coeus_dependency_up", "1 if the last health probe succeeded.", up)
+        + render_gauges("coeus_dependency_probe_seconds", "Latency of the last health probe.", latency)
+        + render_gauges("coeus_llm_circuit_state", "0 closed, 1 half open, 2 open.", circuits)
+    )
+
+
+# -----------------------------
+# Registered metrics
+# -----------------------------
+
+stage_duration = Histogram(
+    "coeus_stage_duration_seconds",
+    "Duration of one pipeline stage.",
+    label_names=("pipeline", "stage"),
+)
+
+request_duration = Histogram(
+    "coeus_request_duration_seconds",
+    "End-to-end duration of one pipeline run.",
+    label_names=("pipeline", "status"),
+)
+
+HISTOGRAMS = (stage_duration, request_duration)
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# Stage timing helpers
+# -----------------------------
+
+def record_stage(pipeline: str, stage: str, seconds: float) -> float:
+    """
+    Observe one stage duration and return it in milliseconds
+    (the unit used in API `timings` payloads).
+    """
+    stage_duration.observe(seconds, pipeline=pipeline, stage=stage)
+    return round(seconds * 1000, 3)
+
+
+async def timed(
+    pipeline: str,
+    stage: str,
+    awaitable: Awaitable[T],
+    timings: Dict[str, float],
+) -> T:
+    """
+    Await `awaitable`, recording its duration under `stage` in `timings`.
+    Used for sub-stages inside a node, e.g. the two retrievers.
+    """
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = record_stage(pipeline, stage, time.perf_counter() - started)
+
+
+def timed_node(pipeline: str, stage: str) -> Callable:
+    """
+    Decorate a LangGraph node so its duration lands in the stage histogram
+    and in the state's `timings` dict (merged with any sub-stage timings
+    the node returned itself). Nodes skipped after a failure are not timed.
+    """
+    def decorator(fn: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]):
+        @functools.wraps(fn)
+        async def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+            if state.get("status") == "failed":
+                return await fn(state)
+
+            started = time.perf_counter()
+            result = await fn(state)
+            elapsed_ms = record_stage(pipeline, stage, time.perf_counter() - started)
+
+            timings = dict(result.get("timings") or {})
+            timings[stage] = elapsed_ms
+            return {**result, "timings": timings}
+
+        return wrapper
+
+    return decorator
+
+
+def merge_timings(left: Optional[Dict[str, float]], right: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """
+    LangGraph reducer: every node adds its own stage keys.
+    """
+    merged = dict(left or {})
+    merged.update(right or {})
+    return merged
@@ -1,7 +1,28 @@
 import yaml
 import os
+from functools import lru_cache
 from jinja2 import Template
 from pathlib import Path
+from typing import Dict, List
+
+PROMPTS_DIR = "backend/prompts"
+
+
+@lru_cache(maxsize=None)
+def _load_templates(full_path: Path) -> Dict[str, Template]:
+    """
+    Parses the YAML and compiles every prompt in it once per process.
+    Edits to prompt files need a restart to take effect.
+    """
+    with open(full_path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+
+    return {
+        key: Template(value)
+        for key, value in data.items()
+        if isinstance(value, str) and value
+    }
+
 
 def load_prompt(file_path: str, prompt_key: str, **kwargs) -> str:
     """
@@ -18,12 +39,20 @@ def load_prompt(file_path: str, prompt_key: str, **kwargs) -> str:
     if not full_path.exists():
         raise FileNotFoundError(f"Prompt file not found at: {full_path}")
 
-    with open(full_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    
-    raw_template = data.get(prompt_key)
-    if not raw_template:
+    template = _load_templates(full_path).get(prompt_key)
+    if template is None:
         raise ValueError(f"Key '{prompt_key}' not found in {full_path}")
     
-    template = Template(raw_template)
-    return template.render(**kwargs)
\ No newline at end of file
+    return template.render(**kwargs)
+
+
+def warm_prompts(prompts_dir: str = PROMPTS_DIR) -> List[str]:
+    """
+    Compiles every prompt file up front (startup warm-up).
+    Returns the files loaded.
+    """
+    loaded = []
+    for path in sorted((Path.cwd() / prompts_dir).glob("**/*.yaml")):
+        _load_templates(path)
+        loaded.append(str(path.relative_to(Path.cwd())))
+    return loaded
@@ -0,0 +1,70 @@
+import random
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from backend.config import settings
+
+
+# Set per request by RequestContextMiddleware; copied into vector_executor
+# threads, so log records from blocking work carry it too.
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+# Whether this request's debug payloads are logged (LOG_DEBUG_SAMPLE_RATE).
+debug_sampled_var: ContextVar[Optional[bool]] = ContextVar("debug_sampled", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    return request_id_var.get()
+
+
+def debug_sampled() -> bool:
+    """
+    Sampling decision for the current request, made once per request.
+    Outside a request (background jobs) every call samples afresh.
+    """
+    sampled = debug_sampled_var.get()
+    if sampled is None:
+        return random.random() < settings.LOG_DEBUG_SAMPLE_RATE
+    return sampled
+
+
+class RequestContextMiddleware:
+    """
+    Plain ASGI middleware: takes the request id from REQUEST_ID_HEADER (or
+    generates one), exposes it through request_id_var for the duration of
+    the request, including streamed bodies, and echoes it on the response.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.header = settings.REQUEST_ID_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == self.header:
+                # Client-supplied ids are echoed back, so keep them short.
+                request_id = value.decode("latin-1")[:64] or None
+                break
+
+        request_id = request_id or uuid.uuid4().hex
+
+        id_token = request_id_var.set(request_id)
+        sampled_token = debug_sampled_var.set(random.random() < settings.LOG_DEBUG_SAMPLE_RATE)
+
+        async def send_with_request_id(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self.header, request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(id_token)
+            debug_sampled_var.reset(sampled_token)
@@ -0,0 +1,11 @@
+import hashlib
+
+
+def tenant_bucket(user_id: str, buckets: int) -> int:
+    """
+    Stable bucket of a user in [0, buckets): the same across processes and
+    restarts, unlike hash(). Chroma shards and Elasticsearch tenant groups
+    both place users with it, so a user's data is always found again.
+    """
+    digest = hashlib.blake2b(str(user_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % buckets
@@ -0,0 +1,307 @@
+import functools
+import inspect
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from langsmith import traceable
+from langsmith.run_helpers import tracing_context
+
+from backend.config import settings
+from backend.utils.metrics import record_stage
+
+
+# Sampling decision of the enclosing traced root; nested traced calls
+# follow it so a sampled request is traced end to end and an unsampled
+# one not at all. None outside any traced root.
+_trace_sampled_var: ContextVar[Optional[bool]] = ContextVar("trace_sampled", default=None)
+# Collects the wrapped function's own duration for overhead accounting.
+_inner_seconds_var: ContextVar[Optional[List[float]]] = ContextVar("trace_inner_seconds", default=None)
+
+TRUNCATED = "...[truncated]"
+REDACTED = "[redacted]"
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_rates(spec: str) -> Dict[str, float]:
+    """
+    "api.chat=0.01,ingestion=1.0" -> {"api.chat": 0.01, "ingestion": 1.0}
+    """
+    rates: Dict[str, float] = {}
+
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        route, rate = item.split("=", 1)
+        try:
+            rates[route.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+
+    return rates
+
+
+class TracingStats:
+    """
+    Counters for the tracing layer itself, so its cost is visible: how
+    many root calls were sampled, and the time traced calls spent outside
+    the wrapped function (payload processing and LangSmith run handling).
+    """
+
+    def __init__(self) -> None:
+        self.roots = 0
+        self.sampled_roots = 0
+        self.traced_calls = 0
+        self.truncated_values = 0
+        self.redacted_values = 0
+        self.overhead_seconds = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.LANGSMITH_TRACING,
+            "roots": self.roots,
+            "sampled_roots": self.sampled_roots,
+            "traced_calls": self.traced_calls,
+            "truncated_values": self.truncated_values,
+            "redacted_values": self.redacted_values,
+            "overhead_ms_total": round(self.overhead_seconds * 1000, 3),
+            "overhead_ms_per_traced_call": (
+                round(self.overhead_seconds * 1000 / self.traced_calls, 3) if self.traced_calls else 0.0
+            ),
+        }
+
+
+tracing_stats = TracingStats()
+
+
+class PayloadLimiter:
+    """
+    Shrinks trace inputs / outputs before LangSmith serializes them:
+    redacts sensitive keys, cuts long strings and lists, summarizes bytes
+    and stops at a maximum depth, so page lists and chunk arrays cost a
+    bounded amount of memory and upload per run.
+    """
+
+    def __init__(self) -> None:
+        self.max_string = settings.TRACE_MAX_STRING_CHARS
+        self.max_items = settings.TRACE_MAX_LIST_ITEMS
+        self.max_depth = settings.TRACE_MAX_DEPTH
+        self.redact_keys = {
+            key.strip().lower()
+            for key in settings.TRACE_REDACT_KEYS.split(",")
+            if key.strip()
+        }
+
+    def limit(self, value: Any, depth: int = 0) -> Any:
+        if isinstance(value, str):
+            if len(value) > self.max_string:
+                tracing_stats.truncated_values += 1
+                return value[:self.max_string] + TRUNCATED
+            return value
+
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+
+        if isinstance(value, (bytes, bytearray)):
+            return f"<{len(value)} bytes>"
+
+        if depth >= self.max_depth:
+            tracing_stats.truncated_values += 1
+            return f"<{type(value).__name__}>"
+
+        if hasattr(value, "model_dump"):
+            value = value.model_dump()
+
+        if isinstance(value, dict):
+            limited = {}
+            for idx, (key, item) in enumerate(value.items()):
+                if idx >= self.max_items:
+                    tracing_stats.truncated_values += 1
+                    limited[TRUNCATED] = f"{len(value) - self.max_items} more keys"
+                    break
+                if str(key).lower() in self.redact_keys:
+                    tracing_stats.redacted_values += 1
+                    limited[key] = REDACTED
+                else:
+                    limited[key] = self.limit(item, depth + 1)
+            return limited
+
+        if isinstance(value, (list, tuple, set)):
+            items = list(value)
+            limited_items = [self.limit(item, depth + 1) for item in items[:self.max_items]]
+            if len(items) > self.max_items:
+                tracing_stats.truncated_values += 1
+                limited_items.append(f"{TRUNCATED} {len(items) - self.max_items} more items")
+            return limited_items
+
+        return self.limit(repr(value), depth + 1)
+
+    def __call__(self, payload: Any) -> Any:
+        limited = self.limit(payload)
+        return limited if isinstance(limited, dict) else {"output": limited}
+
+
+def sample_rate(route: str) -> float:
+    """
+    Rate for `route` from TRACE_SAMPLE_RATES (exact route, then its first
+    dotted segment, e.g. "ingestion"), else TRACE_SAMPLE_RATE.
+    """
+    rates = _parse_rates(settings.TRACE_SAMPLE_RATES)
+
+    if route in rates:
+        return rates[route]
+
+    prefix = route.split(".", 1)[0]
+    if prefix in rates:
+        return rates[prefix]
+
+    return settings.TRACE_SAMPLE_RATE
+
+
+def _export_langsmith_env() -> None:
+    # Credentials for the LangSmith client. LANGSMITH_TRACING itself is not
+    # exported: tracing is switched on per sampled root, not process-wide.
+    os.environ.setdefault("LANGSMITH_ENDPOINT", settings.LANGSMITH_ENDPOINT)
+    os.environ.setdefault("LANGSMITH_API_KEY", settings.LANGSMITH_API_KEY)
+    os.environ.setdefault("LANGSMITH_PROJECT", settings.LANGSMITH_PROJECT)
+
+
+if settings.LANGSMITH_TRACING:
+    _export_langsmith_env()
+
+
+def traced(
+    name: str,
+    run_type: str = "chain",
+    route: Optional[str] = None,
+    nested_only: bool = False,
+) -> Callable:
+    """
+    LangSmith tracing with sampling and bounded payloads.
+
+    The outermost traced call (the root) samples at the route's rate and
+    every traced call beneath it, LangChain / LangGraph runs included,
+    follows that decision. Inputs and outputs pass through PayloadLimiter.
+    `nested_only` helpers (hot-path lookups) never start a trace of their
+    own. With LANGSMITH_TRACING off the function is called directly.
+    """
+    def decorator(fn: Callable) -> Callable:
+        route_name = route or name
+        limiter = PayloadLimiter()
+        is_async = inspect.iscoroutinefunction(fn)
+
+        if is_async:
+            @functools.wraps(fn)
+            async def timed_inner(*args: Any, **kwargs: Any) -> Any:
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    inner_seconds = _inner_seconds_var.get()
+                    if inner_seconds is not None:
+                        inner_seconds.append(time.perf_counter() - started)
+        else:
+            @functools.wraps(fn)
+            def timed_inner(*args: Any, **kwargs: Any) -> Any:
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    inner_seconds = _inner_seconds_var.get()
+                    if inner_seconds is not None:
+                        inner_seconds.append(time.perf_counter() - started)
+
+        traced_fn = traceable(
+            name=name,
+            run_type=run_type,
+            process_inputs=limiter,
+            process_outputs=limiter,
+        )(timed_inner)
+
+        def decide() -> Optional[bool]:
+            """
+            Returns the decision to set for a new root, or None when an
+            enclosing root already decided.
+            """
+            if _trace_sampled_var.get() is not None or nested_only:
+                return None
+
+            tracing_stats.roots += 1
+            sampled = random.random() < sample_rate(route_name)
+            if sampled:
+                tracing_stats.sampled_roots += 1
+            return sampled
+
+        def record_overhead(total: float, inner_seconds: List[float]) -> None:
+            overhead = max(total - sum(inner_seconds), 0.0)
+            tracing_stats.traced_calls += 1
+            tracing_stats.overhead_seconds += overhead
+            record_stage("tracing", route_name, overhead)
+
+        if is_async:
+            async def run_traced(*args: Any, **kwargs: Any) -> Any:
+                inner_seconds: List[float] = []
+                token = _inner_seconds_var.set(inner_seconds)
+                started = time.perf_counter()
+                try:
+                    return await traced_fn(*args, **kwargs)
+                finally:
+                    _inner_seconds_var.reset(token)
+                    record_overhead(time.perf_counter() - started, inner_seconds)
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not settings.LANGSMITH_TRACING:
+                    return await fn(*args, **kwargs)
+
+                decision = decide()
+                if decision is None:
+                    if _trace_sampled_var.get():
+                        return await run_traced(*args, **kwargs)
+                    return await fn(*args, **kwargs)
+
+                token = _trace_sampled_var.set(decision)
+                try:
+                    # Also switches LangChain / LangGraph tracing for the root.
+                    with tracing_context(enabled=decision):
+                        if decision:
+                            return await run_traced(*args, **kwargs)
+                        return await fn(*args, **kwargs)
+                finally:
+                    _trace_sampled_var.reset(token)
+        else:
+            def run_traced(*args: Any, **kwargs: Any) -> Any:
+                inner_seconds: List[float] = []
+                token = _inner_seconds_var.set(inner_seconds)
+                started = time.perf_counter()
+                try:
+                    return traced_fn(*args, **kwargs)
+                finally:
+                    _inner_seconds_var.reset(token)
+                    record_overhead(time.perf_counter() - started, inner_seconds)
+
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not settings.LANGSMITH_TRACING:
+                    return fn(*args, **kwargs)
+
+                decision = decide()
+                if decision is None:
+                    if _trace_sampled_var.get():
+                        return run_traced(*args, **kwargs)
+                    return fn(*args, **kwargs)
+
+                token = _trace_sampled_var.set(decision)
+                try:
+                    with tracing_context(enabled=decision):
+                        if decision:
+                            return run_traced(*args, **kwargs)
+                        return fn(*args, **kwargs)
+                finally:
+                    _trace_sampled_var.reset(token)
+
+        return wrapper
+
+    return decorator